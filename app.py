@@ -5,14 +5,24 @@
 ╚═══════════════════════════════════════════════╝
 """
 import streamlit as st
-from config import POPULAR_CITIES
-from modules.api_handler import fetch_current_weather, fetch_forecast
+from config import (
+    POPULAR_CITIES, WATCHLIST, GRID_PAGE_SIZE, GRID_MAX_PAGES, DEFAULT_UNIT_SYSTEM,
+    SNAPSHOT_PATH, SNAPSHOT_INTERVAL, LIVE_SEARCH, SEARCH_DEBOUNCE_MS,
+    SEARCH_MIN_CHARS, SEARCH_SUGGESTIONS, SEARCH_WAIT, HISTORY_SIZE,
+)
+# Only what the shell needs is imported up front; the network stack and the
+# data-side modules follow once it is painted (see "Deferred Imports").
 from modules.ui_components import (
     _html, inject_custom_css,
     render_header, render_welcome, render_current_weather,
     render_weather_tip, render_metric_cards, render_sun_card,
-    render_forecast, render_error, render_footer,
+    render_forecast, render_error, render_footer, render_city_grid,
+    render_alerts, live_search_input, render_searching,
+    render_air_quality, render_uv_index,
 )
+from modules import payload, profiler
+from modules.units import UNIT_SYSTEMS, LABELS, convert_record
+from modules.utils import grid_window
 
 # ── Page Config ──
 st.set_page_config(
@@ -22,6 +32,11 @@ st.set_page_config(
     initial_sidebar_state="collapsed",
 )
 
+# ── Profiling (only when requested; nothing runs otherwise) ──
+_profile = profiler.start("rerun") if profiler.requested(st.query_params) else None
+
+payload.begin_rerun()
+
 # ── Inject CSS ──
 inject_custom_css()
 
@@ -32,15 +47,27 @@ render_header()
 _html('<div style="height:1px;background:rgba(255,255,255,0.05);margin-bottom:1.2rem;"></div>')
 
 # ── Search Bar ──
-col_input, col_btn = st.columns([5, 1])
+col_input, col_btn, col_units = st.columns([5, 1, 1])
 with col_input:
-    city_input = st.text_input(
-        "Search",
-        placeholder="> query city name...",
-        label_visibility="collapsed",
-    )
+    if LIVE_SEARCH:
+        city_input = live_search_input("live_query", SEARCH_DEBOUNCE_MS)
+    else:
+        city_input = st.text_input(
+            "Search",
+            placeholder="> query city name...",
+            label_visibility="collapsed",
+        )
 with col_btn:
     search_clicked = st.button("[ QUERY ]", use_container_width=True)
+with col_units:
+    # Per-session display units; records are cached canonical, so a switch
+    # only reconverts what is already held and never refetches.
+    units = st.radio(
+        "Units", UNIT_SYSTEMS,
+        index=UNIT_SYSTEMS.index(DEFAULT_UNIT_SYSTEM),
+        format_func=lambda u: LABELS[u]["short"],
+        horizontal=True, label_visibility="collapsed", key="units",
+    )
 
 # ── Quick City Chips ──
 chip_cols = st.columns(len(POPULAR_CITIES))
@@ -50,30 +77,192 @@ for i, c in enumerate(POPULAR_CITIES):
         if st.button(c, key=f"chip_{c}", use_container_width=True):
             chip_city = c
 
-city = chip_city or city_input.strip()
+# ── Recent Cities ──
+# Filled in after the main content, so it includes the city just shown.
+recent_slot = st.container()
+
+# ── Deferred Imports ──
+# requests, numpy and the caches load here, after the first paint of a cold
+# process; on every later rerun these are dictionary lookups.
+from modules.api_handler import fetch_city, fetch_many
+from modules.alerts import engine as alert_engine
+from modules import latency, live, logs, memory
+from modules.admin import (
+    render_drift_panel, render_live_panel, render_logs_panel, render_memory_panel,
+    render_payload_panel, render_profiles_panel, render_upstream_panel,
+)
+from modules.history import History
+from modules.layers import LayerSet
+from modules.search import LiveSearch, index as city_index, peek
+from modules.snapshot import enable_persistence
+
+
+# ── Warm Start (once per process) ──
+@st.cache_resource
+def _warm_start() -> None:
+    logs.setup()
+    if SNAPSHOT_PATH:
+        enable_persistence(SNAPSHOT_PATH, SNAPSHOT_INTERVAL)
+    memory.start_monitor()
+
+
+_warm_start()
+
+# ?city= is the deep link used by the static pages (modules/static_pages).
+chip_city = chip_city or st.session_state.pop("recent_pick", None)
+city = chip_city or city_input.strip() or st.query_params.get("city", "").strip()
+
+# ── Live Suggestions ──
+# Partial input is answered from the local index; short queries that match
+# nothing known never go upstream.
+if LIVE_SEARCH and city and not chip_city:
+    known = city_index.exact(city)
+    suggestions = [s for s in city_index.prefix(city, SEARCH_SUGGESTIONS) if s != known]
+    if suggestions:
+        sugg_cols = st.columns(SEARCH_SUGGESTIONS)
+        for i, s in enumerate(suggestions):
+            with sugg_cols[i]:
+                if st.button(f"> {s}", key=f"suggest_{s}", use_container_width=True):
+                    chip_city = s
+    if chip_city:
+        city = chip_city
+    elif known:
+        city = known
+    elif len(city) < SEARCH_MIN_CHARS:
+        city = ""
 
 # ── Spacer ──
 _html('<div style="height:0.5rem;"></div>')
 
+# ── Watch List Window ──
+st.session_state.setdefault("grid_offset", 0)
+st.session_state.setdefault("grid_pages", 1)
+
+
+def _grid_load_more() -> None:
+    if st.session_state.grid_pages < GRID_MAX_PAGES:
+        st.session_state.grid_pages += 1
+    else:
+        st.session_state.grid_offset += GRID_PAGE_SIZE
+
+
+def _grid_reset() -> None:
+    st.session_state.grid_offset = 0
+    st.session_state.grid_pages = 1
+
+
+def _recent_pick(name: str) -> None:
+    st.session_state.recent_pick = name
+
+
+LAYER_RENDERERS = {"air": render_air_quality, "uv": render_uv_index}
+
 # ── Main Content ──
+# Read through session_state: a script-level alias would outlive the session
+# in the globals that cached functions keep.
+if "history" not in st.session_state:
+    st.session_state.history = History()
+current_id = None
+latency.begin_page()
 if city:
-    with st.spinner(""):
-        weather = fetch_current_weather(city)
+    layers = None
+    hit = peek(city)
+    if hit is None and LIVE_SEARCH:
+        # Newest query wins: a newer keystroke interrupts this rerun at the
+        # next status update, and the superseded lookup's result is dropped.
+        searcher = st.session_state.setdefault("searcher", LiveSearch())
+        generation = searcher.submit(city)
+        status = st.empty()
+        ticks = iter(range(10**6))
+        hit = searcher.wait(
+            generation, SEARCH_WAIT,
+            tick=lambda: render_searching(status, city, next(ticks)),
+        )
+        status.empty()
+        weather, forecast = hit or (None, None)
+        # Only the query that won gets its layers: partial input never
+        # reaches the geocoder or the layer endpoints.
+        if weather:
+            layers = LayerSet(city, list(LAYER_RENDERERS))
+    else:
+        # A submitted query: optional layers start first so they are in
+        # flight with the core fetch.
+        layers = LayerSet(city, list(LAYER_RENDERERS))
+        if hit is None:
+            with st.spinner(""):
+                weather, forecast = fetch_city(city)
+        else:
+            weather, forecast = hit
 
     if weather:
-        render_current_weather(weather)
+        st.session_state.history.push(weather, forecast)
+        current_id = weather["id"]
+    if weather and live.enabled(st.query_params):
+        live.render(city, units, layers)
+    elif weather:
+        render_current_weather(weather, units)
         render_weather_tip(weather["condition"])
-        render_metric_cards(weather)
+        render_alerts(alert_engine.alerts_for(weather))
+        render_metric_cards(weather, units)
+        # Placeholders keep layout order; each layer fills in as it arrives.
+        slots = {name: st.empty() for name in LAYER_RENDERERS}
         render_sun_card(weather)
 
-        with st.spinner(""):
-            forecast = fetch_forecast(city)
         if forecast:
-            render_forecast(forecast)
+            render_forecast(forecast, units, weather)
+
+        for name, value in layers.results():
+            if value is not None:
+                with slots[name].container():
+                    LAYER_RENDERERS[name](value)
     else:
         render_error("City not found")
 else:
     render_welcome()
+    if WATCHLIST:
+        start, end = grid_window(
+            len(WATCHLIST), st.session_state.grid_offset,
+            st.session_state.grid_pages, GRID_PAGE_SIZE, GRID_MAX_PAGES,
+        )
+        visible = WATCHLIST[start:end]
+        with st.spinner(""):
+            records = fetch_many(visible)
+        shown = [records[c] for c in visible if c in records]
+        alerting = frozenset(r["id"] for r in shown if alert_engine.alerts_for(r))
+        render_city_grid(shown, start, len(WATCHLIST), units, alerting)
+        col_more, col_top = st.columns([5, 1])
+        with col_more:
+            st.button("[ LOAD MORE ]", on_click=_grid_load_more,
+                      disabled=end >= len(WATCHLIST), use_container_width=True)
+        with col_top:
+            st.button("[ TOP ]", on_click=_grid_reset,
+                      disabled=start == 0 and st.session_state.grid_pages == 1,
+                      use_container_width=True)
+
+# ── Recent Cities (strip) ──
+recent = st.session_state.history.recent(exclude=current_id)
+if recent:
+    with recent_slot:
+        recent_cols = st.columns(HISTORY_SIZE)
+        for i, (w, _) in enumerate(recent):
+            with recent_cols[i]:
+                temp = convert_record(w, units)["temp"]
+                st.button(f"↺ {w['city']} {temp}{LABELS[units]['short']}",
+                          key=f"recent_{w['id']}", on_click=_recent_pick, args=(w["city"],),
+                          use_container_width=True)
 
 # ── Footer ──
 render_footer()
+payload.end_rerun()
+
+if _profile is not None:
+    _profile.label = city or "home"
+    _profile.stop()
+if profiler.is_admin(st.query_params):
+    render_profiles_panel(st.query_params["admin"])
+    render_memory_panel()
+    render_payload_panel()
+    render_upstream_panel()
+    render_drift_panel()
+    render_live_panel()
+    render_logs_panel()
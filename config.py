@@ -1,12 +1,31 @@
 """
 Configuration — Storm Weather Terminal
 """
+import logging
 import os
 
 API_KEY: str = os.environ.get("OPENWEATHER_API_KEY", "")
-BASE_URL: str = "https://api.openweathermap.org/data/2.5/weather"
-FORECAST_URL: str = "https://api.openweathermap.org/data/2.5/forecast"
-UNITS: str = "metric"
+OWM_HOST: str = os.environ.get("STORM_OWM_HOST", "https://api.openweathermap.org")
+BASE_URL: str = f"{OWM_HOST}/data/2.5/weather"
+FORECAST_URL: str = f"{OWM_HOST}/data/2.5/forecast"
+GEO_URL: str = f"{OWM_HOST}/geo/1.0/direct"
+ONECALL_URL: str = f"{OWM_HOST}/data/3.0/onecall"
+AIR_URL: str = f"{OWM_HOST}/data/2.5/air_pollution"
+# "consolidated": geocode once, then One Call (or 2 coordinate calls) per view.
+# "split": the classic name-based /weather + /forecast pair.
+FETCH_MODE: str = os.environ.get("STORM_FETCH_MODE", "consolidated")
+# After One Call is refused (401/403: not on this plan), use the two-call
+# path for this many seconds before trying One Call again.
+ONECALL_RETRY: int = int(os.environ.get("STORM_ONECALL_RETRY", "3600"))
+# Threads fetching the forecast half of the two-call path, shared by sessions.
+FALLBACK_WORKERS: int = 8
+UNITS: str = "metric"  # upstream/canonical units — display units live in modules.units
+DEFAULT_UNIT_SYSTEM: str = os.environ.get("STORM_UNITS", "metric").strip().lower()
+if DEFAULT_UNIT_SYSTEM not in ("metric", "imperial"):
+    logging.getLogger(__name__).warning(
+        "STORM_UNITS=%r is not 'metric' or 'imperial'; using metric", DEFAULT_UNIT_SYSTEM
+    )
+    DEFAULT_UNIT_SYSTEM = "metric"
 
 WEATHER_EMOJIS: dict = {
     "Clear": "☀️", "Clouds": "☁️", "Rain": "🌧️",
@@ -31,3 +50,137 @@ POPULAR_CITIES: list = [
     "Chennai", "Tokyo", "London", "New York",
     "Berlin", "Sydney", "Dubai", "Mumbai",
 ]
+
+# ── Caching ──
+WEATHER_TTL: int = int(os.environ.get("STORM_WEATHER_TTL", "600"))
+FORECAST_TTL: int = int(os.environ.get("STORM_FORECAST_TTL", "1800"))
+GEO_TTL: int = int(os.environ.get("STORM_GEO_TTL", "604800"))
+CACHE_MAXSIZE: int = int(os.environ.get("STORM_CACHE_MAXSIZE", "512"))
+# Names that upstream reported as unknown (404 / no geocoding hit) are not
+# retried for this long; timeouts and 5xx are never cached.
+NOT_FOUND_TTL: int = int(os.environ.get("STORM_NOT_FOUND_TTL", "120"))
+SNAPSHOT_PATH: str = os.environ.get("STORM_CACHE_SNAPSHOT", "")
+SNAPSHOT_INTERVAL: int = int(os.environ.get("STORM_SNAPSHOT_INTERVAL", "300"))
+
+# ── Latency Budget ──
+# Seconds one page view may spend on upstream calls, shared by every call it
+# makes; a single attempt never waits longer than REQUEST_TIMEOUT.
+PAGE_BUDGET: float = float(os.environ.get("STORM_PAGE_BUDGET", "4.0"))
+REQUEST_TIMEOUT: float = 10.0
+# A duplicate request is sent once the first runs past this quantile of the
+# endpoint's recent latency, for at most HEDGE_MAX_RATE of requests.
+HEDGE_QUANTILE: float = 0.95
+HEDGE_MAX_RATE: float = float(os.environ.get("STORM_HEDGE_MAX_RATE", "0.05"))
+HEDGE_DEFAULT_DELAY: float = 1.0     # until LATENCY_MIN_SAMPLES are seen
+HEDGE_MIN_DELAY: float = 0.05
+LATENCY_WINDOW: int = 500
+LATENCY_MIN_SAMPLES: int = 20
+HEDGE_WORKERS: int = 32             # racing threads; when all are busy, calls run unhedged
+
+# ── Admin / Profiling ──
+# Admin panels and per-request profiling need ?admin=<token>; unset disables both.
+ADMIN_TOKEN: str = os.environ.get("STORM_ADMIN_TOKEN", "")
+PROFILE: bool = os.environ.get("STORM_PROFILE", "") == "1"   # profile every rerun
+PROFILE_DIR: str = os.environ.get("STORM_PROFILE_DIR", "profiles")
+PROFILE_INTERVAL: float = 0.005
+PROFILE_KEEP: int = 20
+PROFILE_MAX_SECONDS: float = 60.0
+
+# ── Memory Diagnostics ──
+MEMORY_INTERVAL: int = int(os.environ.get("STORM_MEMORY_INTERVAL", "300"))   # 0 disables
+MEMORY_SAMPLES: int = 288                  # 24 h at the default interval
+MEMORY_TRACE: bool = os.environ.get("STORM_MEMORY_TRACE", "") == "1"   # top growing sites
+MEMORY_TOP: int = 10
+SESSION_BYTES_BUDGET: int = 256 * 1024
+
+# ── Data Layers ──
+# Optional sections fetched alongside the core request (see modules.layers).
+AIR_TTL: int = int(os.environ.get("STORM_AIR_TTL", "1800"))
+# Keep UV at least as long-lived as WEATHER_TTL: in One Call mode it is
+# primed by the core response and never fetched on its own.
+UV_TTL: int = int(os.environ.get("STORM_UV_TTL", "1800"))
+# Seconds a page waits for each layer before leaving its section out.
+LAYER_DEADLINES: dict = {"air": 2.5, "uv": 2.5}
+LAYER_WORKERS: int = 8
+
+# ── Watch List Grid ──
+WATCHLIST: list = [
+    c.strip() for c in os.environ.get("STORM_WATCHLIST", "").split(",") if c.strip()
+]
+GRID_PAGE_SIZE: int = 12
+GRID_MAX_PAGES: int = 3
+GRID_FETCH_WORKERS: int = 8
+
+# ── Alerts ──
+# (city id or "*", field, op, value, severity, message). City ids are
+# utils.city_id(lat, lon), e.g. "51.51,-0.13". Fields are the derived
+# observation features in modules.alerts; "at_least" compares band order.
+ALERT_RULES: list = [
+    ("*", "wind_severity", "at_least", "STORM", "warning", "wind at storm force"),
+    ("*", "feels_band", "in", ("EXTREME_WARM", "CRITICAL_HOT"), "warning", "extreme heat"),
+    ("*", "feels_band", "eq", "FREEZING", "advisory", "freezing conditions"),
+    ("*", "condition", "eq", "Thunderstorm", "warning", "electrical storm active"),
+]
+
+# ── Payload Budgets ──
+# Serialized bytes per rerun, by render section (see modules.payload).
+PAYLOAD_BUDGETS: dict = {
+    "css": 26_000,
+    "hero": 1_500,
+    "metrics": 2_500,
+    "air": 1_800,
+    "uv": 1_000,
+    "forecast": 3_000,
+    "grid": 20_000,
+    "total": 50_000,
+}
+PAYLOAD_STRICT: bool = os.environ.get("STORM_PAYLOAD_STRICT", "") == "1"
+PAYLOAD_WINDOW: int = 500
+
+# ── Live Search ──
+LIVE_SEARCH: bool = os.environ.get("STORM_LIVE_SEARCH", "") == "1"
+SEARCH_DEBOUNCE_MS: int = 300
+SEARCH_MIN_CHARS: int = 3
+SEARCH_SUGGESTIONS: int = 5
+SEARCH_WORKERS: int = 4
+SEARCH_POLL: float = 0.1
+SEARCH_WAIT: float = 10.0
+
+# ── Live Mode ──
+# Always-on displays (?live=1, or STORM_LIVE=1 for every session): the city
+# view re-checks every LIVE_POLL seconds in place and only goes upstream once
+# the shown record has expired from the cache.
+LIVE_MODE: bool = os.environ.get("STORM_LIVE", "") == "1"
+LIVE_POLL: float = float(os.environ.get("STORM_LIVE_POLL", "30"))
+
+# ── Static Pages ──
+# Pre-rendered pages for the hottest cities (python -m modules.static_pages),
+# refreshed on the weather TTL and served as plain files with ETags.
+STATIC_CITIES: list = [
+    c.strip() for c in os.environ.get("STORM_STATIC_CITIES", "").split(",") if c.strip()
+] or POPULAR_CITIES
+STATIC_PAGES_DIR: str = os.environ.get("STORM_STATIC_PAGES_DIR", "static_pages")
+STATIC_REFRESH: int = int(os.environ.get("STORM_STATIC_REFRESH", str(WEATHER_TTL)))
+STATIC_PORT: int = int(os.environ.get("STORM_STATIC_PORT", "8502"))
+# Where "open in app" links point; pages are linked as ?city=<name>.
+APP_URL: str = os.environ.get("STORM_APP_URL", "http://localhost:8501")
+
+# ── Logging ──
+# Records go through a queue to a background writer (modules/logs.py);
+# repeated warnings/errors are sampled per message template.
+LOG_LEVEL: str = os.environ.get("STORM_LOG_LEVEL", "INFO").upper()
+LOG_FORMAT: str = os.environ.get("STORM_LOG_FORMAT", "json")     # json | text
+LOG_QUEUE_SIZE: int = 10_000
+LOG_ERROR_BURST: int = 5
+LOG_ERROR_WINDOW: float = 60.0
+
+# ── Recent Cities ──
+# Per-session strip of recently viewed cities; sessions hold only city ids,
+# the records are shared (modules/history.py).
+HISTORY_SIZE: int = int(os.environ.get("STORM_HISTORY_SIZE", "6"))
+
+# ── Startup ──
+# Import cost of app.py's shell (everything it imports before "Deferred
+# Imports"), excluding Streamlit itself; python -m tools.importtime fails
+# above this.
+IMPORT_BUDGET_MS: float = float(os.environ.get("STORM_IMPORT_BUDGET_MS", "50"))
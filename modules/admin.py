@@ -0,0 +1,126 @@
+"""
+Admin — operator panels (profiles, memory, payload, upstream latency, schema
+drift, live mode, logging), rendered only for ``?admin=<STORM_ADMIN_TOKEN>``.
+
+Panels use plain Streamlit widgets and are drawn after the payload
+accounting for the rerun is closed, so they never count against budgets.
+"""
+from pathlib import Path
+
+import streamlit as st
+
+from config import LOG_QUEUE_SIZE
+from modules import decode, latency, live, logs, memory, payload, profiler
+
+
+def render_profiles_panel(token: str) -> None:
+    """Most recent rerun profiles, newest first, with speedscope downloads."""
+    with st.expander(f"admin · profiles ({len(profiler.recent)})", expanded=True):
+        st.markdown(f"[profile the next rerun](?admin={token}&profile=1)")
+        if not profiler.recent:
+            st.caption("No profiles yet.")
+            return
+        for i, p in enumerate(reversed(profiler.recent)):
+            shares = " · ".join(f"{k} {v:.0%}" for k, v in list(p["breakdown"].items())[:4])
+            st.markdown(
+                f"**{p['label']}** — {p['duration_ms']:.0f} ms, {p['samples']} samples, "
+                f"peak {p['peak_kb']:.0f} KB  \n{shares}"
+            )
+            if p["allocations"]:
+                st.dataframe(p["allocations"][:5], use_container_width=True, hide_index=True)
+            path = Path(p["speedscope"])
+            if path.exists():
+                st.download_button(
+                    "speedscope.json", path.read_bytes(), file_name=path.name,
+                    mime="application/json", key=f"prof_{i}_{path.name}",
+                )
+
+
+def render_memory_panel() -> None:
+    """Footprint by cache and session, RSS trend and top growing allocation sites."""
+    with st.expander("admin · memory", expanded=True):
+        if st.button("sample now", key="mem_sample"):
+            memory.sample()
+        rep = memory.report()
+        latest = rep["latest"]
+        if latest is None:
+            st.caption("No samples yet.")
+            return
+        trend = rep["trend"]
+        st.markdown(
+            f"**RSS {latest['rss_mb']} MB** · caches {latest['caches_kb']:.0f} KB · "
+            f"{latest['sessions']['count']} sessions, {latest['sessions']['total_kb']:.0f} KB "
+            f"(max {latest['sessions']['max_kb']:.0f} KB)"
+            + (f"  \ntrend {trend['rss_mb_per_hour']:+.2f} MB/h over {trend['hours']} h"
+               if trend else "")
+        )
+        for v in rep["violations"]:
+            st.warning(v)
+        if len(rep["history"]) > 1:
+            st.line_chart({"rss MB": [h["rss_mb"] for h in rep["history"]]})
+        st.dataframe(
+            [{"cache": name, **c} for name, c in latest["caches"].items()],
+            use_container_width=True, hide_index=True,
+        )
+        if latest["top_growth"]:
+            st.dataframe(latest["top_growth"], use_container_width=True, hide_index=True)
+        else:
+            st.caption("Top growing sites need STORM_MEMORY_TRACE=1 and two samples.")
+
+
+def render_payload_panel() -> None:
+    """Websocket bytes per section over recent reruns, against their budgets."""
+    summary = payload.stats.summary()
+    with st.expander(f"admin · payload ({payload.stats.reruns} reruns)", expanded=True):
+        if not summary:
+            st.caption("No reruns measured yet.")
+            return
+        st.dataframe(
+            [{"section": name, **s} for name, s in summary.items()],
+            use_container_width=True, hide_index=True,
+        )
+
+
+def render_upstream_panel() -> None:
+    """Upstream latency percentiles (ms), requests, hedges and hedge wins per endpoint."""
+    summary = latency.stats.summary()
+    with st.expander("admin · upstream", expanded=True):
+        if not summary:
+            st.caption("No upstream calls yet.")
+            return
+        st.dataframe(
+            [{"endpoint": name, **s} for name, s in summary.items()],
+            use_container_width=True, hide_index=True,
+        )
+
+
+def render_drift_panel() -> None:
+    """Upstream payloads that no longer matched their schema, most frequent first."""
+    report = decode.drift_report()
+    with st.expander(f"admin · schema drift ({len(report)})", expanded=True):
+        if not report:
+            st.caption(f"No drift since start (parser: {decode.PARSER}).")
+            return
+        st.dataframe(report, use_container_width=True, hide_index=True)
+
+
+def render_live_panel() -> None:
+    """Live-mode ticks, sections rebuilt versus re-sent, and upstream fetches."""
+    stats = dict(live.stats)
+    with st.expander(f"admin · live ({stats.get('ticks', 0)} ticks)", expanded=True):
+        if not stats:
+            st.caption("No live-mode ticks yet.")
+            return
+        sent = stats.get("rebuilt", 0) + stats.get("reused", 0)
+        st.markdown(
+            f"rebuilt {stats.get('rebuilt', 0)} · reused {stats.get('reused', 0)}"
+            + (f" ({stats.get('reused', 0) / sent:.0%})" if sent else "")
+            + f" · upstream fetches {stats.get('fetches', 0)}"
+        )
+
+
+def render_logs_panel() -> None:
+    """Log records dropped because the background queue was full."""
+    n = logs.dropped()
+    with st.expander(f"admin · logs ({n} dropped)", expanded=True):
+        st.markdown(f"{n} records dropped since start · queue holds {LOG_QUEUE_SIZE}")
@@ -0,0 +1,206 @@
+"""
+Alerts — incremental threshold rules over fetched observations.
+
+Rules are indexed by city ID (``utils.city_id``; ``"*"`` for every city)
+and by the feature they read, so two places sharing a name never share
+state. Each new observation is reduced to a small feature dict, diffed
+against the previous one for that city, and only rules on changed features are
+evaluated. Alerts are edge-triggered: callbacks fire when a rule starts
+matching, and the alert clears when it stops.
+"""
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+from config import ALERT_RULES
+from modules.api_handler import add_observer
+from modules.utils import get_feels_description, get_wind_severity
+
+logger = logging.getLogger(__name__)
+
+ANY_CITY = "*"
+
+# Band order for "at_least" / "at_most" comparisons.
+BANDS: dict = {
+    "wind_severity": ["CALM", "LIGHT", "MODERATE", "STRONG", "STORM", "HURRICANE"],
+    "feels_band": ["FREEZING", "COLD", "CHILLY", "COOL", "PLEASANT",
+                   "COMFORTABLE", "WARM", "EXTREME_WARM", "CRITICAL_HOT"],
+}
+
+_OPS: dict = {
+    "gt": lambda v, t: v > t,
+    "ge": lambda v, t: v >= t,
+    "lt": lambda v, t: v < t,
+    "le": lambda v, t: v <= t,
+    "eq": lambda v, t: v == t,
+    "in": lambda v, t: v in t,
+}
+
+
+def observation_features(record: dict) -> dict:
+    """Reduce a canonical weather record to the features rules can read."""
+    wind_kmh = record["wind_speed"] * 3.6
+    return {
+        "temp": record["temp"],
+        "feels_like": record["feels_like"],
+        "feels_band": get_feels_description(record["feels_like"]),
+        "humidity": record["humidity"],
+        "wind_kmh": wind_kmh,
+        "wind_severity": get_wind_severity(wind_kmh),
+        "condition": record["condition"],
+    }
+
+
+class Rule:
+    """One threshold on one feature of one city's observations.
+
+    ``city_id`` is the place's ``utils.city_id``, or ``"*"`` for every city.
+    """
+
+    __slots__ = ("rule_id", "city_id", "field", "op", "value", "severity", "message", "_test")
+
+    def __init__(self, city_id: str, field: str, op: str, value,
+                 severity: str = "advisory", message: str = "",
+                 rule_id: Optional[str] = None) -> None:
+        self.city_id = city_id
+        self.field = field
+        self.op = op
+        self.value = value
+        self.severity = severity
+        self.message = message or f"{field} {op} {value}"
+        self.rule_id = rule_id
+        if op in ("at_least", "at_most"):
+            order = BANDS[field]
+            rank = order.index(value)
+            self._test = (
+                (lambda v: order.index(v) >= rank) if op == "at_least"
+                else (lambda v: order.index(v) <= rank)
+            )
+        else:
+            test = _OPS[op]
+            self._test = lambda v: test(v, value)
+
+    def matches(self, features: dict) -> bool:
+        return self._test(features[self.field])
+
+
+class AlertEngine:
+    """Rule index plus per-city last-seen features and active alerts."""
+
+    def __init__(self) -> None:
+        self._index: dict = {}      # city id -> field -> {rule_id: Rule}
+        self._rules: dict = {}      # rule_id -> Rule
+        self._last: dict = {}       # city id -> features
+        self._names: dict = {}      # city id -> display name, for messages
+        self._seen: dict = {}       # city id -> dt of the last observation
+        self._active: dict = {}     # city id -> {rule_id: alert}
+        self._callbacks: list = []
+        self._ids = itertools.count(1)
+        self._lock = threading.RLock()
+
+    def add_rule(self, rule: Rule) -> str:
+        """Index ``rule`` and evaluate it against cities already observed."""
+        with self._lock:
+            if rule.rule_id is None:
+                rule.rule_id = f"r{next(self._ids)}"
+            self._rules[rule.rule_id] = rule
+            self._index.setdefault(rule.city_id, {}).setdefault(rule.field, {})[rule.rule_id] = rule
+            cities = list(self._last) if rule.city_id == ANY_CITY else [rule.city_id]
+            fired = []
+            for cid in cities:
+                if cid in self._last:
+                    fired += self._evaluate(cid, [rule], self._last[cid])
+        self._dispatch(fired)
+        return rule.rule_id
+
+    def remove_rule(self, rule_id: str) -> None:
+        with self._lock:
+            rule = self._rules.pop(rule_id, None)
+            if rule is None:
+                return
+            self._index[rule.city_id][rule.field].pop(rule_id, None)
+            for active in self._active.values():
+                active.pop(rule_id, None)
+
+    def subscribe(self, callback: Callable[[dict], None]) -> None:
+        """Call ``callback(alert)`` whenever a rule starts matching."""
+        self._callbacks.append(callback)
+
+    def observe(self, record: dict) -> list:
+        """Ingest an observation; return alerts that newly triggered."""
+        cid = record["id"]
+        features = observation_features(record)
+        with self._lock:
+            if self._seen.get(cid) == record["dt"]:
+                return []
+            self._seen[cid] = record["dt"]
+            self._names[cid] = record["city"]
+            prev = self._last.get(cid)
+            changed = (
+                features.keys() if prev is None
+                else [f for f, v in features.items() if prev.get(f) != v]
+            )
+            self._last[cid] = features
+            rules = []
+            for scope in (cid, ANY_CITY):
+                by_field = self._index.get(scope)
+                if by_field:
+                    for f in changed:
+                        rules.extend(by_field.get(f, {}).values())
+            fired = self._evaluate(cid, rules, features) if rules else []
+        self._dispatch(fired)
+        return fired
+
+    def alerts_for(self, record: dict) -> list:
+        """Active alerts for a record's city, ingesting it first if unseen.
+
+        Records restored from a snapshot never passed through the fetch
+        path, so the UI calls this rather than ``active``.
+        """
+        self.observe(record)
+        return self.active(record["id"])
+
+    def active(self, city_id: str) -> list:
+        """Currently matching alerts for ``city_id``, most severe first."""
+        with self._lock:
+            alerts = list(self._active.get(city_id, {}).values())
+        return sorted(alerts, key=lambda a: a["severity"] != "warning")
+
+    def _evaluate(self, cid: str, rules: list, features: dict) -> list:
+        active = self._active.setdefault(cid, {})
+        fired = []
+        for rule in rules:
+            if rule.matches(features):
+                if rule.rule_id not in active:
+                    alert = {
+                        "rule_id": rule.rule_id, "city_id": cid, "city": self._names[cid],
+                        "field": rule.field, "value": features[rule.field],
+                        "severity": rule.severity, "message": rule.message,
+                        "since": time.time(),
+                    }
+                    active[rule.rule_id] = alert
+                    fired.append(alert)
+                elif active[rule.rule_id]["value"] != features[rule.field]:
+                    # Still matching: keep the alert, show the current reading.
+                    # A new dict, so alerts already handed out stay as fired.
+                    active[rule.rule_id] = {**active[rule.rule_id], "value": features[rule.field]}
+            else:
+                active.pop(rule.rule_id, None)
+        return fired
+
+    def _dispatch(self, alerts: list) -> None:
+        for alert in alerts:
+            logger.warning("Alert %s: %s (%s)", alert["city"], alert["message"], alert["value"])
+            for cb in self._callbacks:
+                try:
+                    cb(alert)
+                except Exception as exc:
+                    logger.error("Alert callback error: %s", exc)
+
+
+engine = AlertEngine()
+for _spec in ALERT_RULES:
+    engine.add_rule(Rule(*_spec))
+add_observer(engine.observe)
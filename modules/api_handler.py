@@ -1,100 +1,594 @@
 """
 API Handler — OpenWeatherMap requests.
+
+Records are canonical (°C, m/s, metres, hPa) and unrounded; display units
+are applied by ``modules.units`` so one cache entry serves every unit system.
+
+Records are cached under the resolved city ID (see ``utils.city_id``); typed
+queries are canonicalized and mapped to that ID through ``alias_cache``, so
+"london", " London " and "ＬＯＮＤＯＮ" share one entry. Queries upstream
+reported as unknown are remembered briefly in ``not_found_cache``; transient
+failures (timeouts, connection errors, 5xx) are never cached.
+
+Every upstream call is logged once (INFO) with ``city``, ``endpoint``,
+``latency_ms``, ``cache`` and ``status`` fields; cache hits and negative
+hits are logged at DEBUG. Logging setup lives in ``modules.logs``.
+
+Payloads are decoded against the schemas declared below (``modules.decode``):
+only the listed fields are read, and a payload that no longer matches is
+logged as "Schema drift" with the schema and path instead of surfacing as a
+KeyError.
 """
 import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from typing import Optional
 import requests
-from config import API_KEY, BASE_URL, FORECAST_URL, UNITS
+from config import (
+    API_KEY, BASE_URL, FORECAST_URL, GEO_URL, ONECALL_URL, AIR_URL, UNITS, FETCH_MODE,
+    WEATHER_TTL, FORECAST_TTL, GEO_TTL, AIR_TTL, UV_TTL, CACHE_MAXSIZE, NOT_FOUND_TTL,
+    GRID_FETCH_WORKERS, ONECALL_RETRY, FALLBACK_WORKERS,
+)
+from modules.cache import TTLCache
+from modules.decode import Field, Schema, SchemaDrift, loads
+from modules.latency import hedged_get, in_context
+from modules.utils import canonical_query, city_id
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-)
-_TIMEOUT = 10
+
+weather_cache = TTLCache(WEATHER_TTL, CACHE_MAXSIZE)          # city id -> record
+forecast_cache = TTLCache(FORECAST_TTL, CACHE_MAXSIZE)        # city id -> daily records
+geo_cache = TTLCache(GEO_TTL, CACHE_MAXSIZE * 4)              # query -> place
+alias_cache = TTLCache(GEO_TTL, CACHE_MAXSIZE * 4)            # query -> city id
+not_found_cache = TTLCache(NOT_FOUND_TTL, CACHE_MAXSIZE * 4)  # query -> True
+air_cache = TTLCache(AIR_TTL, CACHE_MAXSIZE)                  # city id -> air quality
+uv_cache = TTLCache(UV_TTL, CACHE_MAXSIZE)                    # city id -> UV index
+_onecall_refused: Optional[float] = None     # monotonic time of the last 401/403
+_fallback_pool = ThreadPoolExecutor(max_workers=FALLBACK_WORKERS, thread_name_prefix="storm-fallback")
+_observers: list = []
+_flights: dict = {}
+_flights_lock = threading.Lock()
+
+
+def add_observer(callback) -> None:
+    """Call ``callback(record)`` for every freshly fetched current-weather record."""
+    _observers.append(callback)
+
+
+def _notify(record: dict) -> None:
+    for cb in _observers:
+        try:
+            cb(record)
+        except Exception as exc:
+            logger.error("Observer error: %s", exc)
+
+
+def _single_flight(key, fn):
+    """Run ``fn()`` once for all concurrent callers sharing ``key``."""
+    with _flights_lock:
+        fut = _flights.get(key)
+        owner = fut is None
+        if owner:
+            fut = _flights[key] = Future()
+    if not owner:
+        return fut.result()
+    try:
+        result = fn()
+        fut.set_result(result)
+        return result
+    except BaseException as exc:
+        fut.set_exception(exc)
+        raise
+    finally:
+        with _flights_lock:
+            del _flights[key]
+
+
+def _get(url: str, params: dict, city: str) -> requests.Response:
+    """``hedged_get`` plus one structured log record for the call."""
+    endpoint = url.rsplit("/", 1)[-1]
+    start = time.perf_counter()
+    status = None
+    try:
+        resp = hedged_get(url, params, endpoint)
+        status = resp.status_code
+        return resp
+    finally:
+        logger.info("upstream %s", endpoint, extra={
+            "city": city, "endpoint": endpoint, "cache": "miss", "status": status,
+            "latency_ms": round((time.perf_counter() - start) * 1000, 1),
+        })
+
+
+def _place_name(place: dict) -> str:
+    # Resolved places carry "name"; current records passed as places, "city".
+    return place.get("name") or place.get("city", "")
+
+
+def _cache_event(endpoint: str, city: str, cache: str) -> None:
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("cache %s %s", cache, endpoint,
+                     extra={"city": city, "endpoint": endpoint, "cache": cache})
+
+
+def _lookup(cache: TTLCache, key: str):
+    cid = alias_cache.get(key)
+    return None if cid is None else cache.get(cid)
+
+
+def cached(cache: TTLCache, city: str):
+    """Entry of a record cache for a typed city name, without any network call."""
+    return _lookup(cache, canonical_query(city))
+
+
+def _store(cache: TTLCache, key: str, cid: str, value) -> None:
+    alias_cache.set(key, cid)
+    cache.set(cid, value)
+
+
+def _not_found(key: str, city: str) -> None:
+    logger.warning("City not found: %s", city, extra={"city": city, "status": 404})
+    not_found_cache.set(key, True)
+
+
+# ── Upstream schemas ──
+# Only these fields are read from OWM payloads; see modules.decode.
+
+_WX = ("weather", 0)
+
+CURRENT = Schema("weather", {
+    "city": Field(("name",), str),
+    "country": Field(("sys", "country"), str, ""),
+    "lat": Field(("coord", "lat"), float),
+    "lon": Field(("coord", "lon"), float),
+    "temp": Field(("main", "temp"), float),
+    "feels_like": Field(("main", "feels_like"), float),
+    "temp_min": Field(("main", "temp_min"), float),
+    "temp_max": Field(("main", "temp_max"), float),
+    "humidity": Field(("main", "humidity"), float),
+    "pressure": Field(("main", "pressure"), float),
+    "wind_speed": Field(("wind", "speed"), float),
+    "wind_deg": Field(("wind", "deg"), float, 0),
+    "visibility": Field(("visibility",), float, 0),
+    "clouds": Field(("clouds", "all"), float),
+    "condition": Field(_WX + ("main",), str),
+    "description": Field(_WX + ("description",), str),
+    "icon_code": Field(_WX + ("icon",), str),
+    "sunrise": Field(("sys", "sunrise"), int),
+    "sunset": Field(("sys", "sunset"), int),
+    "timezone": Field(("timezone",), int),
+    "dt": Field(("dt",), int),
+})
+
+FORECAST_STEP = Schema("forecast.list[]", {
+    "dt": Field(("dt",), int),
+    "temp": Field(("main", "temp"), float),
+    "humidity": Field(("main", "humidity"), float),
+    "wind": Field(("wind", "speed"), float),
+    "condition": Field(_WX + ("main",), str),
+    "description": Field(_WX + ("description",), str),
+    "icon": Field(_WX + ("icon",), str),
+})
+
+FORECAST = Schema("forecast", {
+    "lat": Field(("city", "coord", "lat"), float),
+    "lon": Field(("city", "coord", "lon"), float),
+    "steps": Field(("list",), FORECAST_STEP),
+})
+
+ONECALL_DAY = Schema("onecall.daily[]", {
+    "dt": Field(("dt",), int),
+    "temp_min": Field(("temp", "min"), float),
+    "temp_max": Field(("temp", "max"), float),
+    "humidity": Field(("humidity",), float),
+    "wind_speed": Field(("wind_speed",), float),
+    "condition": Field(_WX + ("main",), str),
+    "description": Field(_WX + ("description",), str),
+    "icon": Field(_WX + ("icon",), str),
+    "uvi": Field(("uvi",), float, 0),
+})
+
+ONECALL = Schema("onecall", {
+    "timezone": Field(("timezone_offset",), int),
+    "temp": Field(("current", "temp"), float),
+    "feels_like": Field(("current", "feels_like"), float),
+    "humidity": Field(("current", "humidity"), float),
+    "pressure": Field(("current", "pressure"), float),
+    "wind_speed": Field(("current", "wind_speed"), float),
+    "wind_deg": Field(("current", "wind_deg"), float, 0),
+    "visibility": Field(("current", "visibility"), float, 0),
+    "clouds": Field(("current", "clouds"), float),
+    "condition": Field(("current",) + _WX + ("main",), str),
+    "description": Field(("current",) + _WX + ("description",), str),
+    "icon_code": Field(("current",) + _WX + ("icon",), str),
+    "sunrise": Field(("current", "sunrise"), int),
+    "sunset": Field(("current", "sunset"), int),
+    "dt": Field(("current", "dt"), int),
+    "uvi": Field(("current", "uvi"), float, 0),
+    "daily": Field(("daily",), ONECALL_DAY),
+})
+
+GEO_HIT = Schema("direct[]", {
+    "name": Field(("name",), str),
+    "country": Field(("country",), str, ""),
+    "lat": Field(("lat",), float),
+    "lon": Field(("lon",), float),
+})
+
+AIR = Schema("air_pollution", {
+    "aqi": Field(("list", 0, "main", "aqi"), int),
+    "pm2_5": Field(("list", 0, "components", "pm2_5"), float, 0),
+    "pm10": Field(("list", 0, "components", "pm10"), float, 0),
+    "o3": Field(("list", 0, "components", "o3"), float, 0),
+    "no2": Field(("list", 0, "components", "no2"), float, 0),
+    "dt": Field(("list", 0, "dt"), int),
+})
+
+
+def _parse_current(raw: bytes) -> dict:
+    """Decode a /weather payload into a canonical current-weather record."""
+    rec = CURRENT.decode(raw)
+    rec["description"] = rec["description"].title()
+    return {"id": city_id(rec["lat"], rec["lon"]), **rec}
+
+
+def _day_record(do: datetime, temps: list, conditions: list, descriptions: list,
+                icons: list, humidity: float, wind: float) -> dict:
+    cond = max(set(conditions), key=conditions.count)
+    desc = max(set(descriptions), key=descriptions.count)
+    # Daily cards always use the day variant of the dominant icon.
+    icon = max(set(icons), key=icons.count)[:2] + "d"
+    return {
+        "date": do,
+        "day_name": do.strftime("%a").upper(),
+        "date_formatted": do.strftime("%b %d"),
+        "temp_max": max(temps),
+        "temp_min": min(temps),
+        "condition": cond,
+        "description": desc.title(),
+        "icon_code": icon,
+        "humidity": round(humidity),
+        "wind": wind,
+    }
+
+
+def _parse_forecast(data: dict) -> list:
+    """Aggregate a projected 3-hourly forecast into up to five daily records."""
+    daily: dict = {}
+    for step in data["steps"]:
+        dk = datetime.utcfromtimestamp(step["dt"]).strftime("%Y-%m-%d")
+        b = daily.setdefault(dk, {
+            "temps": [], "conditions": [], "descriptions": [], "icons": [],
+            "humidity": [], "wind": [],
+        })
+        b["temps"].append(step["temp"])
+        b["conditions"].append(step["condition"])
+        b["descriptions"].append(step["description"])
+        b["icons"].append(step["icon"])
+        b["humidity"].append(step["humidity"])
+        b["wind"].append(step["wind"])
+    return [
+        _day_record(
+            datetime.strptime(ds, "%Y-%m-%d"), v["temps"], v["conditions"],
+            v["descriptions"], v["icons"], sum(v["humidity"]) / len(v["humidity"]),
+            sum(v["wind"]) / len(v["wind"]),
+        )
+        for ds, v in list(daily.items())[:5]
+    ]
+
+
+def _parse_onecall(d: dict, place: dict) -> tuple:
+    """Map a projected One Call payload to the same records as the two-call path."""
+    if not d["daily"]:
+        raise SchemaDrift(ONECALL.name, ("daily",), "empty")
+    today = d["daily"][0]
+    weather = {
+        "id": city_id(place["lat"], place["lon"]),
+        "city": place["name"],
+        "country": place["country"],
+        "lat": place["lat"],
+        "lon": place["lon"],
+        "temp": d["temp"],
+        "feels_like": d["feels_like"],
+        "temp_min": today["temp_min"],
+        "temp_max": today["temp_max"],
+        "humidity": d["humidity"],
+        "pressure": d["pressure"],
+        "wind_speed": d["wind_speed"],
+        "wind_deg": d["wind_deg"],
+        "visibility": d["visibility"],
+        "clouds": d["clouds"],
+        "condition": d["condition"],
+        "description": d["description"].title(),
+        "icon_code": d["icon_code"],
+        "sunrise": d["sunrise"],
+        "sunset": d["sunset"],
+        "timezone": d["timezone"],
+        "dt": d["dt"],
+    }
+    forecast = []
+    for day in d["daily"][:5]:
+        local = datetime.utcfromtimestamp(day["dt"] + d["timezone"])
+        do = datetime(local.year, local.month, local.day)
+        forecast.append(_day_record(
+            do, [day["temp_max"], day["temp_min"]], [day["condition"]],
+            [day["description"]], [day["icon"]], day["humidity"], day["wind_speed"],
+        ))
+    return weather, forecast
+
+
+def _parse_uv(d: dict) -> dict:
+    """UV index now and today's peak from a projected One Call payload."""
+    return {"uvi": d["uvi"], "uvi_max": d["daily"][0]["uvi"] if d["daily"] else 0}
 
 
 def fetch_current_weather(city: str) -> Optional[dict]:
-    """Fetch current weather for a city."""
+    """Fetch current weather for a city, served from cache while fresh."""
+    key = canonical_query(city)
+    if key in not_found_cache:
+        _cache_event("weather", city, "negative")
+        return None
+    hit = _lookup(weather_cache, key)
+    if hit is not None:
+        _cache_event("weather", city, "hit")
+        return hit
+    fields = {"city": city, "endpoint": "weather"}
     try:
-        params = {"q": city, "appid": API_KEY, "units": UNITS}
-        resp = requests.get(BASE_URL, params=params, timeout=_TIMEOUT)
+        params = {"q": key, "appid": API_KEY, "units": UNITS}
+        resp = _get(BASE_URL, params, city)
         if resp.status_code == 404:
-            logger.warning("City not found: %s", city)
+            _not_found(key, city)
             return None
         if resp.status_code == 401:
-            logger.error("Invalid API key")
+            logger.error("Invalid API key", extra={**fields, "status": 401})
             return None
         resp.raise_for_status()
-        d = resp.json()
-        logger.info("Fetched: %s (%s)", d["name"], d["sys"]["country"])
-        return {
-            "city": d["name"],
-            "country": d["sys"]["country"],
-            "temp": round(d["main"]["temp"]),
-            "feels_like": round(d["main"]["feels_like"]),
-            "temp_min": round(d["main"]["temp_min"]),
-            "temp_max": round(d["main"]["temp_max"]),
-            "humidity": d["main"]["humidity"],
-            "pressure": d["main"]["pressure"],
-            "wind_speed": round(d["wind"]["speed"] * 3.6, 1),
-            "wind_deg": d["wind"].get("deg", 0),
-            "visibility": round(d.get("visibility", 0) / 1000, 1),
-            "clouds": d["clouds"]["all"],
-            "condition": d["weather"][0]["main"],
-            "description": d["weather"][0]["description"].title(),
-            "icon_code": d["weather"][0]["icon"],
-            "sunrise": d["sys"]["sunrise"],
-            "sunset": d["sys"]["sunset"],
-            "timezone": d["timezone"],
-            "dt": d["dt"],
-        }
+        record = _parse_current(resp.content)
+        _store(weather_cache, key, record["id"], record)
+        _notify(record)
+        return record
+    except SchemaDrift as exc:
+        logger.error("Schema drift: %s", exc, extra=fields)
     except requests.exceptions.ConnectionError:
-        logger.error("Connection error")
+        logger.error("Connection error", extra=fields)
     except requests.exceptions.Timeout:
-        logger.error("Request timed out")
+        logger.error("Request timed out", extra=fields)
     except Exception as exc:
-        logger.error("Error: %s", exc)
+        logger.error("Error: %s", exc, extra=fields)
     return None
 
 
 def fetch_forecast(city: str) -> Optional[list]:
-    """Fetch 5-day forecast aggregated by day."""
+    """Fetch 5-day forecast aggregated by day, served from cache while fresh."""
+    key = canonical_query(city)
+    if key in not_found_cache:
+        _cache_event("forecast", city, "negative")
+        return None
+    hit = _lookup(forecast_cache, key)
+    if hit is not None:
+        _cache_event("forecast", city, "hit")
+        return hit
     try:
-        params = {"q": city, "appid": API_KEY, "units": UNITS}
-        resp = requests.get(FORECAST_URL, params=params, timeout=_TIMEOUT)
+        params = {"q": key, "appid": API_KEY, "units": UNITS}
+        resp = _get(FORECAST_URL, params, city)
+        if resp.status_code == 404:
+            _not_found(key, city)
+            return None
         resp.raise_for_status()
-        data = resp.json()
-        daily: dict = {}
-        for item in data["list"]:
-            dk = datetime.utcfromtimestamp(item["dt"]).strftime("%Y-%m-%d")
-            b = daily.setdefault(dk, {
-                "temps": [], "conditions": [], "descriptions": [],
-                "humidity": [], "wind": [],
-            })
-            b["temps"].append(item["main"]["temp"])
-            b["conditions"].append(item["weather"][0]["main"])
-            b["descriptions"].append(item["weather"][0]["description"])
-            b["humidity"].append(item["main"]["humidity"])
-            b["wind"].append(item["wind"]["speed"])
-        forecast = []
-        for ds, v in list(daily.items())[:5]:
-            do = datetime.strptime(ds, "%Y-%m-%d")
-            cond = max(set(v["conditions"]), key=v["conditions"].count)
-            desc = max(set(v["descriptions"]), key=v["descriptions"].count)
-            forecast.append({
-                "date": do,
-                "day_name": do.strftime("%a").upper(),
-                "date_formatted": do.strftime("%b %d"),
-                "temp_max": round(max(v["temps"])),
-                "temp_min": round(min(v["temps"])),
-                "condition": cond,
-                "description": desc.title(),
-                "humidity": round(sum(v["humidity"]) / len(v["humidity"])),
-                "wind": round(sum(v["wind"]) / len(v["wind"]) * 3.6, 1),
-            })
+        data = FORECAST.decode(resp.content)
+        forecast = _parse_forecast(data)
+        _store(forecast_cache, key, city_id(data["lat"], data["lon"]), forecast)
         return forecast
+    except SchemaDrift as exc:
+        logger.error("Schema drift: %s", exc, extra={"city": city, "endpoint": "forecast"})
+        return None
+    except Exception as exc:
+        logger.error("Forecast error: %s", exc, extra={"city": city, "endpoint": "forecast"})
+        return None
+
+
+def resolve_city(city: str) -> Optional[dict]:
+    """Resolve a city name to ``{name, country, lat, lon}`` via geocoding."""
+    key = canonical_query(city)
+    if key in not_found_cache:
+        _cache_event("direct", city, "negative")
+        return None
+    hit = geo_cache.get(key)
+    if hit is not None:
+        _cache_event("direct", city, "hit")
+        return hit
+    # Data layers resolve the same city concurrently with the core fetch.
+    return _single_flight(("geo", key), lambda: _resolve(key, city))
+
+
+def _resolve(key: str, city: str) -> Optional[dict]:
+    try:
+        params = {"q": key, "limit": 1, "appid": API_KEY}
+        resp = _get(GEO_URL, params, city)
+        if resp.status_code == 401:
+            logger.error("Invalid API key", extra={"city": city, "endpoint": "direct", "status": 401})
+            return None
+        resp.raise_for_status()
+        hits = loads(resp.content)
+        if not hits:
+            _not_found(key, city)
+            return None
+        place = GEO_HIT.project(hits[0])
+        geo_cache.set(key, place)
+        return place
+    except SchemaDrift as exc:
+        logger.error("Schema drift: %s", exc, extra={"city": city, "endpoint": "direct"})
+        return None
+    except Exception as exc:
+        logger.error("Geocoding error: %s", exc, extra={"city": city, "endpoint": "direct"})
+        return None
+
+
+def _onecall_available() -> bool:
+    """False for ``ONECALL_RETRY`` seconds after One Call was refused."""
+    refused = _onecall_refused
+    return refused is None or time.monotonic() - refused >= ONECALL_RETRY
+
+
+def _onecall(place: dict) -> Optional[dict]:
+    """Projected One Call payload; None when the plan lacks One Call."""
+    global _onecall_refused
+    params = {
+        "lat": place["lat"], "lon": place["lon"], "appid": API_KEY,
+        "units": UNITS, "exclude": "minutely,hourly,alerts",
+    }
+    resp = _get(ONECALL_URL, params, _place_name(place))
+    if resp.status_code in (401, 403):
+        # One Call is a separate subscription; the plan may still change,
+        # so try again after ONECALL_RETRY rather than never.
+        logger.warning("One Call unavailable on this plan — using two-call path for %ds",
+                       ONECALL_RETRY)
+        _onecall_refused = time.monotonic()
+        return None
+    resp.raise_for_status()
+    return ONECALL.decode(resp.content)
+
+
+def _fetch_onecall(place: dict) -> Optional[tuple]:
+    """One request for current + daily data; None when the plan lacks One Call."""
+    d = _onecall(place)
+    if d is None:
+        return None
+    # The same response carries UV, so that layer costs no extra request.
+    uv_cache.set(city_id(place["lat"], place["lon"]), _parse_uv(d))
+    return _parse_onecall(d, place)
+
+
+def _fetch_by_coords(place: dict) -> tuple:
+    """Two-call fallback that still skips the server-side name lookup."""
+    params = {"lat": place["lat"], "lon": place["lon"], "appid": API_KEY, "units": UNITS}
+    # The forecast goes to the shared pool; current weather runs on this thread.
+    f_fc = _fallback_pool.submit(in_context(_get), FORECAST_URL, params, _place_name(place))
+    r_cur = _get(BASE_URL, params, _place_name(place))
+    r_fc = f_fc.result()
+    r_cur.raise_for_status()
+    weather = _parse_current(r_cur.content)
+    weather.update(
+        id=city_id(place["lat"], place["lon"]), city=place["name"],
+        country=place["country"], lat=place["lat"], lon=place["lon"],
+    )
+    forecast = None
+    if r_fc.ok:
+        forecast = _parse_forecast(FORECAST.decode(r_fc.content))
+    return weather, forecast
+
+
+def fetch_city(city: str) -> tuple:
+    """Fetch ``(weather, forecast)`` for one page view.
+
+    In consolidated mode the city is geocoded once (cached long-term) and both
+    records come from a single One Call request, falling back to two
+    coordinate-based calls when the plan does not include One Call. In split
+    mode this is the classic pair of name-based calls. Either record may be
+    None.
+    """
+    if FETCH_MODE != "consolidated":
+        return fetch_current_weather(city), fetch_forecast(city)
+    key = canonical_query(city)
+    if key in not_found_cache:
+        _cache_event("city", city, "negative")
+        return None, None
+    weather, forecast = _lookup(weather_cache, key), _lookup(forecast_cache, key)
+    if weather is not None and forecast is not None:
+        _cache_event("city", city, "hit")
+        return weather, forecast
+    place = resolve_city(city)
+    if place is None:
+        return None, None
+    try:
+        result = _fetch_onecall(place) if _onecall_available() else None
+        if result is None:
+            result = _fetch_by_coords(place)
+    except SchemaDrift as exc:
+        logger.error("Schema drift: %s", exc, extra={"city": city})
+        return weather, forecast
     except Exception as exc:
-        logger.error("Forecast error: %s", exc)
+        logger.error("Error: %s", exc, extra={"city": city})
+        return weather, forecast
+    weather, forecast = result
+    _store(weather_cache, key, weather["id"], weather)
+    _notify(weather)
+    if forecast is not None:
+        forecast_cache.set(weather["id"], forecast)
+    return weather, forecast
+
+
+def fetch_air_quality(place: dict) -> Optional[dict]:
+    """Current air quality at a resolved place, served from cache while fresh."""
+    cid = city_id(place["lat"], place["lon"])
+    hit = air_cache.get(cid)
+    if hit is not None:
+        _cache_event("air_pollution", _place_name(place), "hit")
+        return hit
+    try:
+        params = {"lat": place["lat"], "lon": place["lon"], "appid": API_KEY}
+        resp = _get(AIR_URL, params, _place_name(place))
+        resp.raise_for_status()
+        air = AIR.decode(resp.content)
+        air_cache.set(cid, air)
+        return air
+    except SchemaDrift as exc:
+        logger.error("Schema drift: %s", exc,
+                     extra={"city": _place_name(place), "endpoint": "air_pollution"})
         return None
+    except Exception as exc:
+        logger.error("Air quality error: %s", exc,
+                     extra={"city": _place_name(place), "endpoint": "air_pollution"})
+        return None
+
+
+def fetch_uv(place: dict) -> Optional[dict]:
+    """UV index at a resolved place; None when One Call is not available.
+
+    In consolidated mode the core One Call response primes ``uv_cache``, so
+    this never issues a request of its own there.
+    """
+    cid = city_id(place["lat"], place["lon"])
+    hit = uv_cache.get(cid)
+    if hit is not None or not _onecall_available() or FETCH_MODE == "consolidated":
+        return hit
+    try:
+        d = _onecall(place)
+        if d is None:
+            return None
+        uv = _parse_uv(d)
+        uv_cache.set(cid, uv)
+        return uv
+    except SchemaDrift as exc:
+        logger.error("Schema drift: %s", exc, extra={"city": _place_name(place), "endpoint": "onecall"})
+        return None
+    except Exception as exc:
+        logger.error("UV error: %s", exc, extra={"city": _place_name(place), "endpoint": "onecall"})
+        return None
+
+
+def fetch_many(cities: list) -> dict:
+    """Fetch current weather for several cities concurrently.
+
+    Cached cities are answered inline; only misses go upstream. Cities that
+    fail to resolve are omitted from the result.
+    """
+    results = {}
+    misses = []
+    for c in cities:
+        hit = cached(weather_cache, c)
+        if hit is not None:
+            results[c] = hit
+        else:
+            misses.append(c)
+    if misses:
+        workers = min(GRID_FETCH_WORKERS, len(misses))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(in_context(fetch_current_weather), c) for c in misses]
+            for c, fut in zip(misses, futures):
+                rec = fut.result()
+                if rec is not None:
+                    results[c] = rec
+    return results
@@ -0,0 +1,146 @@
+"""
+Cache — thread-safe TTL + LRU store for upstream records, and a
+reference-counted intern table for records shared between sessions.
+"""
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """Bounded LRU mapping whose entries expire ``ttl`` seconds after insert."""
+
+    def __init__(self, ttl: float, maxsize: int = 256) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a live entry and mark it recently used, else ``default``."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or item[1] <= time.monotonic():
+                if item is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Insert ``value``, evicting the least recently used entry when full."""
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def entries(self) -> list:
+        """Return ``(key, value, seconds_left)`` for live entries, LRU first."""
+        now = time.monotonic()
+        with self._lock:
+            return [(k, v, exp - now) for k, (v, exp) in self._data.items() if exp > now]
+
+    def held(self) -> list:
+        """Return ``(key, value, expired)`` for every entry still in memory."""
+        now = time.monotonic()
+        with self._lock:
+            return [(k, v, exp <= now) for k, (v, exp) in self._data.items()]
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.pop(key, None)
+        return default if item is None else item[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            item = self._data.get(key)
+            return item is not None and item[1] > time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class InternTable:
+    """One shared copy per key, kept while anything references it.
+
+    :meth:`acquire` stores (or refreshes) the value and adds a reference;
+    :meth:`release` drops one and evicts the entry at zero. Releases may be
+    queued with :meth:`release_later` from contexts that must not take the
+    lock (garbage-collector finalizers); they are applied on the next call.
+    """
+
+    maxsize = None      # bounded by its referrers, not by a size
+
+    def __init__(self) -> None:
+        self._data: dict = {}       # key -> [value, refs]
+        self._pending: deque = deque()
+        self._lock = threading.Lock()
+
+    def _drain(self) -> None:
+        while self._pending:
+            self._release(self._pending.popleft())
+
+    def _release(self, key: Hashable) -> None:
+        entry = self._data.get(key)
+        if entry is None:
+            return
+        entry[1] -= 1
+        if entry[1] <= 0:
+            del self._data[key]
+
+    def acquire(self, key: Hashable, value: Any) -> None:
+        """Add a reference to ``key``; ``value`` replaces the shared copy."""
+        with self._lock:
+            self._drain()
+            entry = self._data.get(key)
+            if entry is None:
+                self._data[key] = [value, 1]
+            else:
+                entry[0] = value
+                entry[1] += 1
+
+    def release(self, key: Hashable) -> None:
+        with self._lock:
+            self._drain()
+            self._release(key)
+
+    def release_later(self, keys) -> None:
+        """Queue releases without locking (safe from a finalizer)."""
+        self._pending.extend(keys)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            self._drain()
+            entry = self._data.get(key)
+        return default if entry is None else entry[0]
+
+    def refs(self, key: Hashable) -> int:
+        with self._lock:
+            self._drain()
+            entry = self._data.get(key)
+        return 0 if entry is None else entry[1]
+
+    def held(self) -> list:
+        """Return ``(key, value, False)`` per entry, like :meth:`TTLCache.held`."""
+        with self._lock:
+            self._drain()
+            return [(k, v, False) for k, (v, _) in self._data.items()]
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.refs(key) > 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._drain()
+            return len(self._data)
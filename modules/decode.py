@@ -0,0 +1,124 @@
+"""
+Decode — schema-projected decoding of upstream JSON.
+
+A :class:`Schema` declares the output fields of a record and, for each, the
+path into the payload, the expected type and an optional default:
+
+    Schema("air", {
+        "aqi": Field(("list", 0, "main", "aqi"), int),
+        "pm10": Field(("list", 0, "components", "pm10"), float, 0),
+    })
+
+:meth:`Schema.project` builds the record in one pass over the declared
+paths; the rest of the parsed document is never walked and is dropped as
+soon as the record exists. ``float`` fields
+accept JSON integers (OWM sends ``21`` as readily as ``21.4``), a field
+typed with another Schema is a list projected item by item, and ``None``
+counts as missing.
+
+A required field that is missing or has the wrong type raises
+:class:`SchemaDrift` naming the schema and path; every drift is also
+counted in :data:`drift`, so changes upstream show up as explicit errors
+rather than a KeyError somewhere in a parser. Optional fields missing are
+not drift — OWM omits ``wind.deg`` in calm air, for example.
+
+:func:`loads` parses with ``orjson`` when it is installed (straight from the
+response bytes, with no intermediate ``str``) and the stdlib ``json``
+otherwise; :data:`PARSER` says which.
+"""
+import json
+from collections import Counter
+from typing import Any, NamedTuple, Union
+
+try:
+    import orjson
+except ImportError:  # optional; stdlib json is always there
+    orjson = None
+
+PARSER = "orjson" if orjson is not None else "json"
+REQUIRED = object()
+
+drift: Counter = Counter()      # (schema, path, problem) -> count
+
+
+def loads(raw: Union[bytes, str]) -> Any:
+    """Parse a JSON document with the fastest parser available."""
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+class SchemaDrift(ValueError):
+    """An upstream payload no longer matches the declared schema."""
+
+    def __init__(self, schema: str, path: tuple, problem: str) -> None:
+        self.schema = schema
+        self.path = _dotted(path)
+        self.problem = problem
+        drift[(schema, self.path, problem)] += 1
+        super().__init__(f"{schema}: {self.path} {problem}")
+
+
+class Field(NamedTuple):
+    path: tuple
+    type: Any                   # str, int, float, bool or a Schema (list of records)
+    default: Any = REQUIRED
+
+
+def _dotted(path: tuple) -> str:
+    return "".join(f"[{p}]" if isinstance(p, int) else f".{p}" for p in path).lstrip(".")
+
+
+def _accepts(typ) -> tuple:
+    if typ is float:
+        return (int, float)
+    return (typ,)
+
+
+class Schema:
+    """Declared projection from a JSON payload to a flat record."""
+
+    def __init__(self, name: str, fields: dict) -> None:
+        self.name = name
+        self.fields = fields
+        self._plan = tuple(
+            (out, f.path, f.type if isinstance(f.type, Schema) else _accepts(f.type),
+             f.type is not bool, f.default)
+            for out, f in fields.items()
+        )
+
+    def project(self, doc: Any) -> dict:
+        """The declared fields of ``doc`` as a record; raises :class:`SchemaDrift`."""
+        # Field by field, so a miss is a default or a precise SchemaDrift.
+        out = {}
+        for name, path, accepts, no_bool, default in self._plan:
+            v = doc
+            try:
+                for p in path:
+                    v = v[p]
+            except (KeyError, IndexError, TypeError):
+                v = None
+            if v is None:
+                if default is REQUIRED:
+                    raise SchemaDrift(self.name, path, "missing")
+                out[name] = default
+            elif isinstance(accepts, Schema):
+                if not isinstance(v, list):
+                    raise SchemaDrift(self.name, path, f"expected list, got {type(v).__name__}")
+                out[name] = [accepts.project(item) for item in v]
+            elif isinstance(v, accepts) and not (no_bool and isinstance(v, bool)):
+                out[name] = v
+            else:
+                expected = "/".join(t.__name__ for t in accepts)
+                raise SchemaDrift(self.name, path, f"expected {expected}, got {type(v).__name__}")
+        return out
+
+    def decode(self, raw: Union[bytes, str]) -> dict:
+        """:func:`loads` then :meth:`project`."""
+        return self.project(loads(raw))
+
+
+def drift_report() -> list:
+    """Drift seen so far, most frequent first."""
+    return [
+        {"schema": s, "path": p, "problem": problem, "count": n}
+        for (s, p, problem), n in drift.most_common()
+    ]
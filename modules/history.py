@@ -0,0 +1,54 @@
+"""
+History — each session's recent cities, with the records shared process-wide.
+
+A session keeps a :class:`History` in its state: at most ``HISTORY_SIZE``
+city ids, newest first, so its footprint is the same after ten lookups or
+ten thousand. The ``(weather, forecast)`` records behind those ids live once
+in :data:`interned`, a reference-counted table shared by every session. An
+entry goes when the last history holding it lets go — the city fell off the
+end, or the session itself was garbage-collected.
+"""
+import weakref
+from collections import deque
+from typing import Optional
+
+from config import HISTORY_SIZE
+from modules.cache import InternTable
+
+interned = InternTable()
+
+
+class History:
+    """A session's recent cities, as keys into :data:`interned`."""
+
+    def __init__(self, size: int = HISTORY_SIZE) -> None:
+        self._keys: deque = deque()
+        self.size = size
+        # Sessions end without notice. The finalizer holds the deque, not
+        # self, and queues the releases because it may run inside the GC.
+        weakref.finalize(self, interned.release_later, self._keys)
+
+    def push(self, weather: dict, forecast: Optional[list]) -> None:
+        """Make this city the most recent, refreshing its shared records."""
+        key = weather["id"]
+        if key in self._keys:
+            self._keys.remove(key)
+            interned.release(key)
+        elif len(self._keys) >= self.size:
+            interned.release(self._keys.pop())
+        interned.acquire(key, (weather, forecast))
+        self._keys.appendleft(key)
+
+    def recent(self, exclude: Optional[str] = None) -> list:
+        """``(weather, forecast)`` pairs, newest first, minus city id ``exclude``."""
+        out = []
+        for key in list(self._keys):
+            if key != exclude:
+                pair = interned.get(key)
+                if pair is not None:
+                    out.append(pair)
+        return out
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
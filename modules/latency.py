@@ -0,0 +1,212 @@
+"""
+Latency — per-page upstream time budget and hedged requests.
+
+``begin_page`` opens a budget of ``config.PAGE_BUDGET`` seconds for the
+current script run; every upstream call made under it gets only the time
+that is left, so a chain such as geocode → One Call shares one deadline
+instead of a full timeout each. Pool threads inherit the budget when their
+work is wrapped with :func:`in_context`; calls outside any budget are capped
+at ``REQUEST_TIMEOUT``.
+
+:func:`hedged_get` sends a GET and, if it is still outstanding once the
+endpoint's recent ``HEDGE_QUANTILE`` latency has passed, sends one
+duplicate; the first successful (``resp.ok``) response wins and the other
+is left to finish in the background. An error status or exception from one
+attempt does not end the race while the other is still running; when none
+succeeds, the first error response is returned. Hedges draw from a token
+bucket refilled at ``HEDGE_MAX_RATE`` per request, so a slow upstream cannot
+multiply quota use; the bucket starts full, so a cold process can hedge its
+first slow calls.
+
+Racing needs the attempts on ``HEDGE_WORKERS`` pool threads. When none is
+idle the request runs on the caller's thread, unhedged, so the pool never
+queues one session's call behind another's: it bounds hedging, not
+upstream concurrency.
+
+Latency quantiles cover every attempt that completed, failed ones included
+(a timeout counts at the time it took), so errors cannot pull them down.
+"""
+import contextvars
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Optional
+
+import requests
+
+from config import (
+    PAGE_BUDGET, REQUEST_TIMEOUT, HEDGE_QUANTILE, HEDGE_MAX_RATE,
+    HEDGE_DEFAULT_DELAY, HEDGE_MIN_DELAY, LATENCY_WINDOW, LATENCY_MIN_SAMPLES,
+    HEDGE_WORKERS,
+)
+
+_HEDGE_BURST = 5.0
+
+_deadline: contextvars.ContextVar = contextvars.ContextVar("latency_deadline", default=None)
+
+
+class LatencyHistogram:
+    """Rolling per-endpoint response times plus hedge accounting."""
+
+    def __init__(self, window: int) -> None:
+        self._samples: dict = {}
+        self._window = window
+        self._lock = threading.Lock()
+        self._tokens = _HEDGE_BURST
+        self.requests: Counter = Counter()
+        self.hedges: Counter = Counter()
+        self.hedge_wins: Counter = Counter()
+
+    def observe(self, endpoint: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(endpoint, deque(maxlen=self._window)).append(seconds)
+
+    def quantile(self, endpoint: str, q: float) -> Optional[float]:
+        """``q`` quantile of recent latency, or None until enough samples."""
+        with self._lock:
+            vals = sorted(self._samples.get(endpoint, ()))
+        if len(vals) < LATENCY_MIN_SAMPLES:
+            return None
+        return vals[min(len(vals) - 1, int(len(vals) * q))]
+
+    def hedge_delay(self, endpoint: str) -> float:
+        q = self.quantile(endpoint, HEDGE_QUANTILE)
+        return HEDGE_DEFAULT_DELAY if q is None else max(q, HEDGE_MIN_DELAY)
+
+    def started(self, endpoint: str) -> None:
+        with self._lock:
+            self.requests[endpoint] += 1
+            self._tokens = min(_HEDGE_BURST, self._tokens + HEDGE_MAX_RATE)
+
+    def allow_hedge(self, endpoint: str) -> bool:
+        with self._lock:
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            self.hedges[endpoint] += 1
+            return True
+
+    def hedge_won(self, endpoint: str) -> None:
+        with self._lock:
+            self.hedge_wins[endpoint] += 1
+
+    def summary(self) -> dict:
+        """``{endpoint: {p50, p95, p99, n, requests, hedges, hedge_wins}}`` in ms."""
+        with self._lock:
+            snap = {k: sorted(v) for k, v in self._samples.items()}
+        out = {}
+        for name, vals in sorted(snap.items()):
+            n = len(vals)
+            out[name] = {
+                **{f"p{p}": round(vals[min(n - 1, int(n * p / 100))] * 1000, 1)
+                   for p in (50, 95, 99)},
+                "n": n,
+                "requests": self.requests[name],
+                "hedges": self.hedges[name],
+                "hedge_wins": self.hedge_wins[name],
+            }
+        return out
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+            self._tokens = _HEDGE_BURST
+            self.requests.clear()
+            self.hedges.clear()
+            self.hedge_wins.clear()
+
+
+stats = LatencyHistogram(LATENCY_WINDOW)
+
+_pool = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix="storm-hedge")
+_idle = threading.BoundedSemaphore(HEDGE_WORKERS)     # one per pool thread not in use
+
+
+def begin_page(budget: float = PAGE_BUDGET) -> None:
+    """Start the upstream time budget for the current page view."""
+    _deadline.set(time.monotonic() + budget)
+
+
+def remaining() -> float:
+    """Seconds left for the next upstream call."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return REQUEST_TIMEOUT
+    return min(REQUEST_TIMEOUT, deadline - time.monotonic())
+
+
+def in_context(fn: Callable) -> Callable:
+    """Bind ``fn`` to a copy of the caller's context (and so its budget).
+
+    Make one wrapper per submitted task: a context cannot be entered by two
+    threads at once.
+    """
+    ctx = contextvars.copy_context()
+    return lambda *args, **kwargs: ctx.run(fn, *args, **kwargs)
+
+
+def _attempt(url: str, params: dict, endpoint: str, timeout: float) -> requests.Response:
+    t0 = time.monotonic()
+    try:
+        return requests.get(url, params=params, timeout=timeout)
+    finally:
+        stats.observe(endpoint, time.monotonic() - t0)
+
+
+def _start(*args) -> Future:
+    """Run ``_attempt`` on the pool; the caller has taken an ``_idle`` slot."""
+    try:
+        fut = _pool.submit(_attempt, *args)
+    except BaseException:
+        _idle.release()
+        raise
+    fut.add_done_callback(lambda _f: _idle.release())
+    return fut
+
+
+def hedged_get(url: str, params: dict, endpoint: Optional[str] = None) -> requests.Response:
+    """GET within the remaining budget, hedging once past the latency quantile.
+
+    Returns the first ``ok`` response, else the first error response.
+    Raises ``requests.exceptions.Timeout`` when the budget runs out with
+    neither, or the first attempt's exception when every attempt raised.
+    """
+    endpoint = endpoint or url.rsplit("/", 1)[-1]
+    budget = remaining()
+    if budget <= 0:
+        raise requests.exceptions.Timeout(f"{endpoint}: page latency budget exhausted")
+    start = time.monotonic()
+    stats.started(endpoint)
+    if not _idle.acquire(blocking=False):
+        return _attempt(url, params, endpoint, budget)
+    first = _start(url, params, endpoint, budget)
+    pending = {first}
+    done, _ = wait(pending, timeout=min(stats.hedge_delay(endpoint), budget))
+    left = budget - (time.monotonic() - start)
+    if not done and left > 0 and _idle.acquire(blocking=False):
+        if stats.allow_hedge(endpoint):
+            pending.add(_start(url, params, endpoint, left))
+        else:
+            _idle.release()
+    error = failed = None
+    while pending:
+        left = budget - (time.monotonic() - start)
+        if left <= 0:
+            break
+        done, pending = wait(pending, timeout=left, return_when=FIRST_COMPLETED)
+        for fut in done:
+            if fut.exception() is not None:
+                error = error or fut.exception()
+                continue
+            resp = fut.result()
+            if resp.ok:
+                if fut is not first:
+                    stats.hedge_won(endpoint)
+                return resp
+            failed = failed or resp     # a fast 5xx must not beat a slower good reply
+    if failed is not None:
+        return failed
+    if error is not None and not pending:
+        raise error
+    raise requests.exceptions.Timeout(f"{endpoint}: no response within {budget:.2f}s")
@@ -0,0 +1,108 @@
+"""
+Layers — optional data sections fetched alongside the core weather request.
+
+Current conditions and the forecast remain the core, answered by
+``api_handler.fetch_city`` (one upstream response in consolidated mode).
+Every other layer — air quality, UV — is keyed by the resolved place, keeps
+its own cache and TTL in ``api_handler``, and has its own deadline from
+``config.LAYER_DEADLINES``. A :class:`LayerSet` starts all of them before
+the core request, so they are in flight together, and
+:meth:`LayerSet.results` hands each one over as soon as it completes. A layer
+that fails or misses its deadline yields None and its section is left out;
+late results still land in the cache for the next view.
+"""
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Iterator, Optional
+
+from config import LAYER_DEADLINES, LAYER_WORKERS
+from modules.api_handler import (
+    air_cache, fetch_air_quality, fetch_uv, geo_cache, resolve_city, uv_cache,
+)
+from modules.cache import TTLCache
+from modules.latency import in_context
+from modules.utils import canonical_query, city_id
+
+logger = logging.getLogger(__name__)
+
+
+class Layer:
+    """One optional data source: ``fetch(place)`` fills ``cache`` by city id."""
+
+    __slots__ = ("name", "fetch", "cache", "deadline")
+
+    def __init__(self, name: str, fetch: Callable[[dict], Optional[dict]],
+                 cache: TTLCache, deadline: float) -> None:
+        self.name = name
+        self.fetch = fetch
+        self.cache = cache
+        self.deadline = deadline
+
+
+LAYERS: dict = {}
+
+
+def register_layer(name: str, fetch: Callable[[dict], Optional[dict]],
+                   cache: TTLCache, deadline: float) -> None:
+    LAYERS[name] = Layer(name, fetch, cache, deadline)
+
+
+register_layer("air", fetch_air_quality, air_cache, LAYER_DEADLINES["air"])
+register_layer("uv", fetch_uv, uv_cache, LAYER_DEADLINES["uv"])
+
+_pool = ThreadPoolExecutor(max_workers=LAYER_WORKERS, thread_name_prefix="storm-layer")
+
+
+def _run(layer: Layer, city: str) -> tuple:
+    # Geocoding is single-flight, so this shares the core request's lookup.
+    place = resolve_city(city)
+    if place is None:
+        return None, None
+    try:
+        return place, layer.fetch(place)
+    except Exception as exc:
+        logger.error("Layer %s failed: %s", layer.name, exc)
+        return place, None
+
+
+class LayerSet:
+    """The optional layers in flight for one page view of ``city``."""
+
+    def __init__(self, city: str, names: Optional[list] = None) -> None:
+        self._started = time.monotonic()
+        self._ready: dict = {}
+        self._pending: dict = {}
+        place = geo_cache.get(canonical_query(city))
+        for name in names or list(LAYERS):
+            layer = LAYERS[name]
+            hit = None if place is None else layer.cache.get(city_id(place["lat"], place["lon"]))
+            if hit is not None:
+                self._ready[name] = hit
+            else:
+                self._pending[name] = _pool.submit(in_context(_run), layer, city)
+
+    def _due(self, name: str) -> float:
+        return self._started + LAYERS[name].deadline
+
+    def results(self) -> Iterator[tuple]:
+        """Yield ``(name, value)`` in completion order; None past the deadline."""
+        yield from self._ready.items()
+        pending = dict(self._pending)
+        while pending:
+            now = time.monotonic()
+            for name in [n for n, f in pending.items() if not f.done() and now >= self._due(n)]:
+                del pending[name]
+                logger.warning("Layer %s missed its %.1fs deadline", name, LAYERS[name].deadline)
+                yield name, None
+            if not pending:
+                break
+            timeout = max(0.0, min(self._due(n) for n in pending) - time.monotonic())
+            done, _ = wait(list(pending.values()), timeout=timeout, return_when=FIRST_COMPLETED)
+            for name in [n for n, f in pending.items() if f in done]:
+                place, value = pending.pop(name).result()
+                if value is None and place is not None:
+                    # Layers primed by the core response (UV in One Call
+                    # mode) find their value in the cache by now.
+                    value = LAYERS[name].cache.get(city_id(place["lat"], place["lon"]))
+                yield name, value
@@ -0,0 +1,155 @@
+"""
+Live — in-place refresh of the city view for always-on displays.
+
+With live mode on (``?live=1``, or ``STORM_LIVE=1`` for everyone) the city
+view is a fragment that Streamlit reruns every ``LIVE_POLL`` seconds without
+touching the rest of the page. Each tick:
+
+* reads the city's records from the cache; upstream is asked only once the
+  shown record has expired, so polling follows the cache's freshness
+  schedule rather than the tick rate;
+* keys every section on the normalized values it displays (never the
+  observation timestamp) and compares that with what is on screen;
+* rebuilds only the sections whose key changed. Unchanged sections re-emit
+  the HTML kept from the previous tick — a fragment rerun drops elements it
+  does not send again — and, being byte-identical, go over the websocket as
+  a hash reference (``global.minCachedMessageSize`` in .streamlit/config.toml).
+
+:data:`stats` counts ticks, rebuilt and reused sections and upstream fetches.
+A tick inside a full rerun is measured with it; a fragment rerun brackets
+its own payload accounting.
+"""
+import logging
+import time
+from collections import Counter
+from typing import Optional
+
+import streamlit as st
+
+from config import LIVE_MODE, LIVE_POLL
+from modules import latency, payload, solar
+from modules.alerts import engine as alert_engine
+from modules.api_handler import fetch_city
+from modules.layers import LAYERS, LayerSet
+from modules.payload import section
+from modules.search import peek
+from modules.ui_components import (
+    _html, air_quality_html, alerts_html, current_weather_html, forecast_html,
+    live_status_html, metric_cards_html, sun_card_html, uv_index_html,
+    weather_tip_html,
+)
+
+logger = logging.getLogger(__name__)
+
+HERO_FIELDS = ("city", "country", "temp", "temp_min", "temp_max", "description",
+               "condition", "icon_code", "timezone")
+METRIC_FIELDS = ("feels_like", "humidity", "wind_speed", "wind_deg", "pressure",
+                 "visibility", "clouds")
+SOLAR_FIELDS = ("lat", "lon", "sunrise", "sunset", "timezone")
+LAYER_BUILDERS = {"air": air_quality_html, "uv": uv_index_html}
+
+stats: Counter = Counter()
+
+
+def enabled(query_params) -> bool:
+    return LIVE_MODE or query_params.get("live") == "1"
+
+
+def _pick(record: dict, fields: tuple) -> tuple:
+    return tuple(record.get(f) for f in fields)
+
+
+def _records(city: str) -> tuple:
+    hit = peek(city)
+    if hit is not None:
+        return hit
+    # Expired (or evicted): this is the tick the cache schedule asks for.
+    stats["fetches"] += 1
+    return fetch_city(city)
+
+
+def _layer(name: str, weather: dict) -> Optional[dict]:
+    try:
+        return LAYERS[name].fetch(weather)     # cached until the layer's own TTL
+    except Exception as exc:
+        logger.error("Layer %s failed: %s", name, exc)
+        return None
+
+
+def _emit(state: dict, name: str, key, build) -> None:
+    shown = state["shown"].get(name)
+    if shown is not None and shown[0] == key:
+        html = shown[1]
+        stats["reused"] += 1
+    else:
+        html = build()
+        state["shown"][name] = (key, html)
+        state["updated"] = time.time()
+        stats["rebuilt"] += 1
+    if html:
+        section(name)(_html)(html)
+
+
+def _tick(city: str, units: str) -> None:
+    standalone = not payload.measuring()
+    if standalone:
+        payload.begin_rerun()
+    try:
+        _draw(city, units)
+    finally:
+        if standalone:
+            payload.end_rerun()
+
+
+def _draw(city: str, units: str) -> None:
+    stats["ticks"] += 1
+    state = st.session_state.live
+    layers: Optional[LayerSet] = state.pop("layers", None)    # set by a full rerun only
+    latency.begin_page()
+    weather, forecast = _records(city)
+    if not weather:
+        return
+
+    status = st.empty()
+    alerts = alert_engine.alerts_for(weather)
+    _emit(state, "hero", (units, _pick(weather, HERO_FIELDS)),
+          lambda: current_weather_html(weather, units))
+    _emit(state, "tip", weather["condition"], lambda: weather_tip_html(weather["condition"]))
+    _emit(state, "alerts", tuple((a["severity"], a["field"], a["value"]) for a in alerts),
+          lambda: alerts_html(alerts))
+    _emit(state, "metrics", (units, _pick(weather, METRIC_FIELDS)),
+          lambda: metric_cards_html(weather, units))
+    slots = {name: st.empty() for name in LAYER_BUILDERS}
+    day = solar.local_day(time.time(), weather["timezone"])
+    _emit(state, "solar", (day, _pick(weather, SOLAR_FIELDS)), lambda: sun_card_html(weather))
+    if forecast:
+        _emit(state, "forecast", (units, tuple(tuple(sorted(d.items())) for d in forecast)),
+              lambda: forecast_html(forecast, units, weather))
+
+    # The full rerun hands over the layers already in flight; ticks read the
+    # layer caches, which refetch on their own TTLs.
+    values = layers.results() if layers is not None else (
+        (name, _layer(name, weather)) for name in LAYER_BUILDERS
+    )
+    for name, value in values:
+        if value is not None:
+            key = tuple(sorted((k, v) for k, v in value.items() if k != "dt"))
+            with slots[name].container():
+                _emit(state, name, key, lambda b=LAYER_BUILDERS[name], v=value: b(v))
+
+    # A couple of hundred bytes; changes only when a section did.
+    with status.container():
+        section("live")(_html)(live_status_html(state["updated"], weather["timezone"]))
+
+
+_fragment = st.fragment(_tick, run_every=LIVE_POLL)
+
+
+def render(city: str, units: str, layers: Optional[LayerSet] = None) -> None:
+    """Render the city view as a live fragment (call from the full script run)."""
+    state = st.session_state.setdefault("live", {})
+    if (state.get("city"), state.get("units")) != (city, units):
+        state.clear()
+        state.update(city=city, units=units, shown={}, updated=time.time())
+    state["layers"] = layers
+    _fragment(city, units)
@@ -0,0 +1,150 @@
+"""
+Logs — non-blocking structured logging for the whole process.
+
+:func:`setup` (once per process, from ``app.py`` and the CLIs) puts a single
+queue handler on the root logger. The calling thread only builds the record,
+runs the error sampler and enqueues it; a background listener formats and
+writes. Nothing on the request path touches stderr. When the queue is full,
+records are dropped and counted rather than blocking; the next record that
+fits is followed by a "Log queue full" warning carrying the count, and
+:func:`dropped` (shown in the admin panel) keeps the running total.
+
+Records are one JSON object per line: ``ts``, ``level``, ``logger``, ``msg``
+and, when the call site passes them in ``extra``, the fetch fields ``city``,
+``endpoint``, ``latency_ms``, ``cache`` (hit / miss / negative) and
+``status``. ``STORM_LOG_FORMAT=text`` gives the classic one-line format.
+
+Warnings and errors are sampled per message template: the first
+``LOG_ERROR_BURST`` in each ``LOG_ERROR_WINDOW`` pass, the rest are counted
+and reported as ``suppressed`` on the next one that does.
+"""
+import atexit
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from config import LOG_ERROR_BURST, LOG_ERROR_WINDOW, LOG_FORMAT, LOG_LEVEL, LOG_QUEUE_SIZE
+
+FIELDS = ("city", "endpoint", "latency_ms", "cache", "status", "suppressed")
+
+_listener: Optional[QueueListener] = None
+_handler: Optional["_Handler"] = None
+_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with the structured fetch fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        out = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for f in FIELDS:
+            v = record.__dict__.get(f)
+            if v is not None:
+                out[f] = v
+        if record.exc_info:
+            out["exc"] = self.formatException(record.exc_info)
+        return json.dumps(out, default=str)
+
+
+class ErrorSampler(logging.Filter):
+    """Pass at most ``burst`` WARNING+ records per message template per window."""
+
+    def __init__(self, burst: int = LOG_ERROR_BURST, window: float = LOG_ERROR_WINDOW) -> None:
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self._seen: dict = {}     # (logger, template) -> [window start, passed, suppressed]
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING:
+            return True
+        key = (record.name, record.msg)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._seen.get(key)
+            if entry is None or now - entry[0] >= self.window:
+                suppressed = entry[2] if entry else 0
+                entry = self._seen[key] = [now, 0, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+            if entry[1] >= self.burst:
+                entry[2] += 1
+                return False
+            entry[1] += 1
+            return True
+
+
+class _Handler(QueueHandler):
+    """Enqueue without blocking; count what a full queue forces us to drop."""
+
+    def __init__(self, q: queue.Queue) -> None:
+        super().__init__(q)
+        self.dropped = 0
+        self._unreported = 0
+        self._count_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The queue never leaves the process, so formatting waits for the
+        # listener thread instead of running here.
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._count_lock:
+                self.dropped += 1
+                self._unreported += 1
+            return
+        if self._unreported:
+            self._report_drops()
+
+    def _report_drops(self) -> None:
+        with self._count_lock:
+            n, self._unreported = self._unreported, 0
+        if not n:
+            return
+        # Straight onto the queue: going through logging would re-enter here.
+        notice = logging.LogRecord(__name__, logging.WARNING, __file__, 0,
+                                   "Log queue full: dropped %d records", (n,), None)
+        try:
+            self.queue.put_nowait(notice)
+        except queue.Full:
+            with self._count_lock:
+                self._unreported += n
+
+
+def setup(level: str = LOG_LEVEL, fmt: str = LOG_FORMAT) -> None:
+    """Route all logging through the background queue (idempotent)."""
+    global _listener, _handler
+    with _lock:
+        if _listener is not None:
+            return
+        out = logging.StreamHandler(sys.stderr)
+        out.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter(
+            "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
+        ))
+        _handler = _Handler(queue.Queue(maxsize=LOG_QUEUE_SIZE))
+        _handler.addFilter(ErrorSampler())
+        root = logging.getLogger()
+        root.addHandler(_handler)
+        root.setLevel(level)
+        _listener = QueueListener(_handler.queue, out)
+        _listener.start()
+        atexit.register(_listener.stop)
+
+
+def dropped() -> int:
+    """Records dropped because the queue was full."""
+    return _handler.dropped if _handler is not None else 0
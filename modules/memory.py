@@ -0,0 +1,261 @@
+"""
+Memory — periodic footprint samples and leak tracking for long-running servers.
+
+A daemon thread, started once per process from ``app.py``, records a sample
+every ``MEMORY_INTERVAL`` seconds:
+
+* process RSS;
+* every tracked cache: entries (live and expired-but-held) against its
+  ``maxsize`` and an estimated deep size, labelled with the record type it
+  holds;
+* every session the Streamlit runtime still holds (connected, or
+  disconnected and not yet expired): estimated deep size of its session
+  state. Sessions are listed from the runtime rather than tracked here, so
+  memory accounting never keeps one alive;
+* with ``STORM_MEMORY_TRACE=1``, a tracemalloc snapshot diffed against the
+  first one — the allocation sites that grew the most since start-up.
+
+The last ``MEMORY_SAMPLES`` samples are kept. :func:`report` adds the RSS
+trend (least-squares slope) and lists bound violations: caches over
+``maxsize`` and sessions over ``SESSION_BYTES_BUDGET``. Sizes are estimates;
+a record shared by two caches is counted in both.
+"""
+import linecache
+import logging
+import os
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+import types
+from collections import deque
+
+import streamlit
+from streamlit import runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from config import (
+    MEMORY_INTERVAL, MEMORY_SAMPLES, MEMORY_TOP, MEMORY_TRACE, SESSION_BYTES_BUDGET,
+)
+from modules import history, profiler
+from modules.api_handler import (
+    air_cache, alias_cache, forecast_cache, geo_cache, not_found_cache, uv_cache,
+    weather_cache,
+)
+from modules.ui_components import _card_cache
+
+logger = logging.getLogger(__name__)
+
+_SIZE_LIMIT = 200_000      # objects visited per deep-size estimate
+_OPAQUE = (type, types.ModuleType, types.FunctionType, types.MethodType,
+           types.BuiltinFunctionType, type(threading.Lock()), threading.Thread)
+
+CACHES: dict = {
+    "weather": (weather_cache, "current record"),
+    "forecast": (forecast_cache, "forecast days"),
+    "geo": (geo_cache, "place"),
+    "alias": (alias_cache, "query alias"),
+    "not_found": (not_found_cache, "negative entry"),
+    "air": (air_cache, "air quality"),
+    "uv": (uv_cache, "uv index"),
+    "cards": (_card_cache, "card html"),
+    "history": (history.interned, "shared history records"),
+}
+
+samples: deque = deque(maxlen=MEMORY_SAMPLES)
+_baseline = None
+_lock = threading.Lock()
+_started = False
+_no_session_mgr_logged = False
+
+
+def _session_states() -> list:
+    """Session states the runtime holds; just the caller's without a server.
+
+    Streamlit has no public way to list sessions, so this reads the private
+    ``Runtime._session_mgr`` (present through Streamlit 1.66; pinned by
+    tests/test_memory.py). If an upgrade removes it, sampling falls back to
+    the caller's session and logs a warning once.
+    """
+    global _no_session_mgr_logged
+    if runtime.exists():
+        # list_sessions() includes disconnected sessions the runtime keeps
+        # for reconnects, which still hold their state.
+        mgr = getattr(runtime.get_instance(), "_session_mgr", None)
+        if mgr is not None:
+            return [info.session.session_state for info in mgr.list_sessions()]
+        if not _no_session_mgr_logged:
+            _no_session_mgr_logged = True
+            logger.warning("Streamlit %s has no Runtime._session_mgr; "
+                           "memory samples cover the current session only",
+                           streamlit.__version__)
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return []
+    # The SafeSessionState wrapper is rebuilt per rerun; the SessionState
+    # inside it lives as long as the session.
+    return [getattr(ctx.session_state, "_state", ctx.session_state)]
+
+
+def rss_bytes() -> int:
+    """Current resident set size; falls back to peak RSS off Linux."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def deep_size(obj) -> int:
+    """Estimated bytes reachable from ``obj`` (containers, attributes, slots)."""
+    seen: set = set()
+    stack = [obj]
+    total = 0
+    while stack and len(seen) < _SIZE_LIMIT:
+        o = stack.pop()
+        if id(o) in seen or isinstance(o, _OPAQUE):
+            continue
+        seen.add(id(o))
+        total += sys.getsizeof(o, 0)
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset, deque)):
+            stack.extend(o)
+        elif isinstance(o, (str, bytes, int, float, complex, bool)) or o is None:
+            continue
+        else:
+            if hasattr(o, "__dict__"):
+                stack.append(vars(o))
+            for slot in getattr(type(o), "__slots__", ()):
+                if hasattr(o, slot):
+                    stack.append(getattr(o, slot))
+    return total
+
+
+def _cache_stats() -> dict:
+    out = {}
+    for name, (cache, kind) in CACHES.items():
+        held = cache.held()
+        out[name] = {
+            "kind": kind,
+            "entries": len(held),
+            "expired": sum(1 for _, _, expired in held if expired),
+            "maxsize": cache.maxsize,
+            "kb": round(sum(deep_size(k) + deep_size(v) for k, v, _ in held) / 1024, 1),
+        }
+    return out
+
+
+def _session_stats() -> dict:
+    sizes = []
+    for state in _session_states():
+        try:
+            sizes.append(deep_size(state.filtered_state))
+        except Exception:       # session torn down mid-sample
+            continue
+    return {
+        "count": len(sizes),
+        "total_kb": round(sum(sizes) / 1024, 1),
+        "mean_kb": round(sum(sizes) / len(sizes) / 1024, 1) if sizes else 0.0,
+        "max_kb": round(max(sizes, default=0) / 1024, 1),
+    }
+
+
+def _top_growth() -> list:
+    global _baseline
+    if not tracemalloc.is_tracing():
+        return []
+    # Late imports are growth, not leaks.
+    snap = tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        tracemalloc.Filter(False, linecache.__file__),
+    ])
+    if _baseline is None:
+        _baseline = snap
+        return []
+    return [
+        {"site": f"{s.traceback[0].filename}:{s.traceback[0].lineno}",
+         "growth_kb": round(s.size_diff / 1024, 1), "count": s.count_diff}
+        for s in snap.compare_to(_baseline, "lineno")[:MEMORY_TOP] if s.size_diff > 0
+    ]
+
+
+def sample() -> dict:
+    """Take one sample now and append it to :data:`samples`."""
+    with _lock:
+        caches = _cache_stats()
+        sessions = _session_stats()
+        entry = {
+            "at": time.time(),
+            "rss_mb": round(rss_bytes() / 2**20, 1),
+            "caches_kb": round(sum(c["kb"] for c in caches.values()), 1),
+            "sessions_kb": sessions["total_kb"],
+            "caches": caches,
+            "sessions": sessions,
+            "top_growth": _top_growth(),
+        }
+        samples.append(entry)
+    return entry
+
+
+def report() -> dict:
+    """Latest sample, RSS trend and bound violations."""
+    hist = list(samples)
+    if not hist:
+        return {"latest": None, "trend": None, "violations": [], "history": []}
+    latest = hist[-1]
+    trend = None
+    if len(hist) >= 3:
+        hours = [(s["at"] - hist[0]["at"]) / 3600.0 for s in hist]
+        rss = [s["rss_mb"] for s in hist]
+        mh, mr = sum(hours) / len(hours), sum(rss) / len(rss)
+        var = sum((h - mh) ** 2 for h in hours)
+        slope = sum((h - mh) * (r - mr) for h, r in zip(hours, rss)) / var if var else 0.0
+        trend = {"rss_mb_per_hour": round(slope, 2), "hours": round(hours[-1], 2)}
+    violations = [
+        f"cache {name}: {c['entries']} entries > maxsize {c['maxsize']}"
+        for name, c in latest["caches"].items()
+        if c["maxsize"] is not None and c["entries"] > c["maxsize"]
+    ]
+    if latest["sessions"]["max_kb"] * 1024 > SESSION_BYTES_BUDGET:
+        violations.append(
+            f"session state {latest['sessions']['max_kb']} KB > {SESSION_BYTES_BUDGET // 1024} KB"
+        )
+    history = [{k: s[k] for k in ("at", "rss_mb", "caches_kb", "sessions_kb")} for s in hist]
+    return {"latest": latest, "trend": trend, "violations": violations, "history": history}
+
+
+def start_monitor() -> None:
+    """Start periodic sampling (once per process; ``MEMORY_INTERVAL`` 0 disables).
+
+    Tracing is started either way, so samples taken from the admin panel
+    still report growth sites.
+    """
+    global _started
+    if _started:
+        return
+    _started = True
+    if MEMORY_TRACE:
+        profiler.acquire_tracing()
+        _top_growth()           # baseline
+    if MEMORY_INTERVAL <= 0:
+        return
+
+    def loop() -> None:
+        while True:
+            try:
+                entry = sample()
+                logger.info("Memory: rss %.1f MB, caches %.0f KB, %d sessions (max %.0f KB)",
+                            entry["rss_mb"], entry["caches_kb"], entry["sessions"]["count"],
+                            entry["sessions"]["max_kb"])
+                for violation in report()["violations"]:
+                    logger.warning("Memory bound violated: %s", violation)
+            except Exception as exc:
+                logger.error("Memory sample failed: %s", exc)
+            time.sleep(MEMORY_INTERVAL)
+
+    threading.Thread(target=loop, name="storm-memory", daemon=True).start()
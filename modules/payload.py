@@ -0,0 +1,139 @@
+"""
+Payload — per-rerun websocket byte accounting for rendered sections.
+
+``render_*`` functions are tagged with :func:`section`; every ``_html`` call
+reports the serialized size of the Markdown element it sends, attributed to
+the enclosing section. ``begin_rerun``/``end_rerun`` bracket one script run
+(a full rerun, or a fragment rerun on its own),
+roll the per-section totals into process-wide percentiles and check them
+against ``config.PAYLOAD_BUDGETS`` — logging a warning, or raising
+:class:`PayloadBudgetExceeded` when ``STORM_PAYLOAD_STRICT`` is set so test
+runs fail on regressions.
+"""
+import contextvars
+import functools
+import logging
+import threading
+from collections import deque
+from typing import Callable, Optional
+
+from config import PAYLOAD_BUDGETS, PAYLOAD_STRICT, PAYLOAD_WINDOW
+
+try:
+    from streamlit.proto.Markdown_pb2 import Markdown as _MarkdownProto
+except ImportError:  # pragma: no cover - older/newer layouts
+    _MarkdownProto = None
+
+logger = logging.getLogger(__name__)
+
+UNATTRIBUTED = "other"
+
+_section: contextvars.ContextVar = contextvars.ContextVar("payload_section", default=UNATTRIBUTED)
+_rerun: contextvars.ContextVar = contextvars.ContextVar("payload_rerun", default=None)
+
+
+class PayloadBudgetExceeded(Exception):
+    """Raised in strict mode when a section's bytes exceed its budget."""
+
+
+def element_size(body: str) -> int:
+    """Serialized size of a Markdown delta carrying ``body``."""
+    if _MarkdownProto is not None:
+        return _MarkdownProto(body=body, allow_html=True).ByteSize()
+    return len(body.encode("utf-8"))
+
+
+def record(body: str) -> None:
+    """Attribute one rendered element to the current section, if measuring."""
+    sizes = _rerun.get()
+    if sizes is not None:
+        name = _section.get()
+        sizes[name] = sizes.get(name, 0) + element_size(body)
+
+
+def section(name: str) -> Callable:
+    """Decorator attributing everything a render function emits to ``name``."""
+    def wrap(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            token = _section.set(name)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _section.reset(token)
+        return inner
+    return wrap
+
+
+class PayloadStats:
+    """Rolling per-section byte samples across recent reruns."""
+
+    def __init__(self, window: int) -> None:
+        self._samples: dict = {}
+        self._window = window
+        self._lock = threading.Lock()
+        self.reruns = 0
+
+    def add(self, sizes: dict) -> None:
+        with self._lock:
+            self.reruns += 1
+            for name, n in sizes.items():
+                self._samples.setdefault(name, deque(maxlen=self._window)).append(n)
+            self._samples.setdefault("total", deque(maxlen=self._window)).append(
+                sum(sizes.values())
+            )
+
+    def summary(self) -> dict:
+        """``{section: {p50, p95, max, n, budget}}`` over the rolling window."""
+        with self._lock:
+            snap = {k: sorted(v) for k, v in self._samples.items()}
+        out = {}
+        for name, vals in sorted(snap.items()):
+            n = len(vals)
+            out[name] = {
+                "p50": vals[(n - 1) // 2],
+                "p95": vals[min(n - 1, int(n * 0.95))],
+                "max": vals[-1],
+                "n": n,
+                "budget": PAYLOAD_BUDGETS.get(name),
+            }
+        return out
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+            self.reruns = 0
+
+
+stats = PayloadStats(PAYLOAD_WINDOW)
+
+
+def begin_rerun() -> None:
+    _rerun.set({})
+
+
+def measuring() -> bool:
+    """True between ``begin_rerun`` and ``end_rerun``."""
+    return _rerun.get() is not None
+
+
+def end_rerun(strict: Optional[bool] = None) -> dict:
+    """Close the current rerun; return its per-section sizes."""
+    sizes = _rerun.get()
+    _rerun.set(None)
+    if not sizes:
+        return {}
+    stats.add(sizes)
+    over = {
+        name: (n, PAYLOAD_BUDGETS[name]) for name, n in sizes.items()
+        if name in PAYLOAD_BUDGETS and n > PAYLOAD_BUDGETS[name]
+    }
+    total = sum(sizes.values())
+    if "total" in PAYLOAD_BUDGETS and total > PAYLOAD_BUDGETS["total"]:
+        over["total"] = (total, PAYLOAD_BUDGETS["total"])
+    if over:
+        detail = ", ".join(f"{k}={n}B>{b}B" for k, (n, b) in over.items())
+        if PAYLOAD_STRICT if strict is None else strict:
+            raise PayloadBudgetExceeded(detail)
+        logger.warning("Payload budget exceeded: %s", detail)
+    return sizes
@@ -0,0 +1,227 @@
+"""
+Profiler — on-demand sampling profiles of individual reruns.
+
+Enabled for every rerun with ``STORM_PROFILE=1``, or for one rerun by an
+admin with ``?admin=<STORM_ADMIN_TOKEN>&profile=1``. While a rerun is
+profiled, a daemon thread samples the script thread's stack every
+``PROFILE_INTERVAL`` seconds (wall clock, so time blocked on upstream calls
+shows up too) and ``tracemalloc`` records allocations. On completion two
+files are written to ``PROFILE_DIR``:
+
+* ``<stamp>-<label>.speedscope.json`` — open at https://www.speedscope.app
+* ``<stamp>-<label>.json`` — duration, a per-module breakdown (each sample
+  is charged to the innermost frame in this repo or in Streamlit) and the
+  top allocation sites
+
+When the mode is off nothing here runs: no thread, no tracing.
+"""
+import hmac
+import json
+import logging
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from config import (
+    ADMIN_TOKEN, PROFILE, PROFILE_DIR, PROFILE_INTERVAL, PROFILE_KEEP,
+    PROFILE_MAX_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+ROOT = Path(__file__).resolve().parent.parent
+_STREAMLIT = "/streamlit/"
+_TOP_ALLOCS = 10
+
+recent: deque = deque(maxlen=PROFILE_KEEP)   # summaries, newest last
+_active: dict = {}                           # thread id -> RerunProfile
+_lock = threading.Lock()
+_tracing = {"refs": 0, "owned": False}       # shared with concurrent profiles and modules.memory
+
+
+def acquire_tracing() -> None:
+    """Ensure tracemalloc runs until the matching :func:`release_tracing`."""
+    with _lock:
+        if _tracing["refs"] == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracing["owned"] = True
+        _tracing["refs"] += 1
+
+
+def release_tracing() -> None:
+    with _lock:
+        _tracing["refs"] -= 1
+        if _tracing["refs"] == 0 and _tracing["owned"]:
+            tracemalloc.stop()
+            _tracing["owned"] = False
+
+
+def is_admin(query_params) -> bool:
+    """True when the request carries the configured admin token."""
+    token = query_params.get("admin", "")
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(str(token), ADMIN_TOKEN)
+
+
+def requested(query_params) -> bool:
+    return PROFILE or (is_admin(query_params) and query_params.get("profile") == "1")
+
+
+def _module_of(filename: str) -> Optional[str]:
+    """Repo-relative path for our files, ``"streamlit"`` for Streamlit's."""
+    if _STREAMLIT in filename.replace("\\", "/"):
+        return "streamlit"
+    try:
+        return Path(filename).resolve().relative_to(ROOT).as_posix()
+    except ValueError:
+        return None
+
+
+class RerunProfile:
+    """Samples one thread's stack until :meth:`stop`."""
+
+    def __init__(self, label: str) -> None:
+        self.label = label
+        self._tid = threading.get_ident()
+        self._frames: dict = {}       # (name, file, line) -> index
+        self._samples: list = []      # stacks of frame indexes, root first
+        self._modules: dict = {}      # frame index -> module or None
+        self._stop = threading.Event()
+        self._released = False
+        acquire_tracing()
+        tracemalloc.reset_peak()
+        self._mem0 = tracemalloc.take_snapshot()
+        self._t0 = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="storm-profiler", daemon=True)
+        self._thread.start()
+
+    def _frame(self, code) -> int:
+        key = (code.co_name, code.co_filename, code.co_firstlineno)
+        idx = self._frames.get(key)
+        if idx is None:
+            idx = self._frames[key] = len(self._frames)
+            self._modules[idx] = _module_of(code.co_filename)
+        return idx
+
+    def _run(self) -> None:
+        deadline = self._t0 + PROFILE_MAX_SECONDS
+        while not self._stop.wait(PROFILE_INTERVAL):
+            frame = sys._current_frames().get(self._tid)
+            if frame is None or time.perf_counter() > deadline:
+                # The rerun was interrupted (or ran away); drop the profile.
+                self._release()
+                return
+            stack = []
+            while frame is not None:
+                stack.append(self._frame(frame.f_code))
+                frame = frame.f_back
+            stack.reverse()
+            self._samples.append(stack)
+
+    def _release(self) -> bool:
+        with _lock:
+            if self._released:
+                return False
+            self._released = True
+            if _active.get(self._tid) is self:
+                del _active[self._tid]
+        release_tracing()
+        return True
+
+    def _breakdown(self) -> dict:
+        counts: Counter = Counter()
+        for stack in self._samples:
+            owner = next((m for m in map(self._modules.get, reversed(stack)) if m), "other")
+            counts[owner] += 1
+        n = len(self._samples) or 1
+        return {k: round(v / n, 3) for k, v in counts.most_common()}
+
+    def _allocations(self) -> list:
+        snap = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)]
+        )
+        stats = snap.compare_to(self._mem0, "lineno")[:_TOP_ALLOCS]
+        return [
+            {"site": f"{s.traceback[0].filename}:{s.traceback[0].lineno}",
+             "size_kb": round(s.size_diff / 1024, 1), "count": s.count_diff}
+            for s in stats
+        ]
+
+    def _speedscope(self, duration: float) -> dict:
+        frames = [
+            {"name": name, "file": fname, "line": line}
+            for (name, fname, line), _ in sorted(self._frames.items(), key=lambda kv: kv[1])
+        ]
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": self.label,
+            "exporter": "storm.profiler",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled", "name": self.label, "unit": "seconds",
+                "startValue": 0, "endValue": duration,
+                "samples": self._samples,
+                "weights": [PROFILE_INTERVAL] * len(self._samples),
+            }],
+        }
+
+    def stop(self) -> dict:
+        """Finish sampling, write the profile files and return the summary."""
+        self._stop.set()
+        self._thread.join()
+        duration = time.perf_counter() - self._t0
+        peak, allocations = 0, []
+        if not self._released:
+            peak = tracemalloc.get_traced_memory()[1]
+            allocations = self._allocations()
+            self._release()
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")[:-3]
+        out = Path(PROFILE_DIR)
+        out.mkdir(parents=True, exist_ok=True)
+        slug = re.sub(r"[^\w-]+", "_", self.label)
+        base = out / f"{stamp}-{slug}"
+        summary = {
+            "label": self.label,
+            "at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "duration_ms": round(duration * 1000, 1),
+            "samples": len(self._samples),
+            "breakdown": self._breakdown(),
+            "peak_kb": round(peak / 1024, 1),
+            "allocations": allocations,
+            "speedscope": f"{base}.speedscope.json",
+        }
+        Path(summary["speedscope"]).write_text(json.dumps(self._speedscope(duration)))
+        Path(f"{base}.json").write_text(json.dumps(summary, indent=2))
+        recent.append(summary)
+        _prune(out)
+        logger.info("Profiled %s: %.0f ms, %d samples -> %s",
+                    self.label, duration * 1000, len(self._samples), summary["speedscope"])
+        return summary
+
+
+def _prune(out: Path) -> None:
+    files = sorted(out.glob("*.speedscope.json"))
+    for old in files[:-PROFILE_KEEP]:
+        old.unlink(missing_ok=True)
+        old.with_name(old.name.replace(".speedscope.json", ".json")).unlink(missing_ok=True)
+
+
+def start(label: str) -> RerunProfile:
+    """Profile the calling thread's rerun.
+
+    A rerun interrupted by a newer one never reaches :func:`stop`; its
+    profile is discarded when the session's next profiled rerun starts.
+    """
+    stale = _active.get(threading.get_ident())
+    if stale is not None:
+        stale._stop.set()
+        stale._release()
+    prof = RerunProfile(label)
+    with _lock:
+        _active[prof._tid] = prof
+    return prof
@@ -0,0 +1,142 @@
+"""
+Search — local city index and newest-query-wins live lookups.
+
+Keystrokes are debounced in the browser (see ``components/live_search``);
+each settled query is answered from the cache and the local prefix index
+first, and only then sent upstream. A newer query supersedes older ones:
+queued lookups are cancelled, and results of lookups already in flight are
+dropped (they still warm the cache). Identical queries from concurrent
+sessions share one upstream request.
+"""
+import bisect
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from typing import Callable, Optional
+
+from config import POPULAR_CITIES, WATCHLIST, SEARCH_WORKERS, SEARCH_POLL
+from modules.api_handler import add_observer, cached, fetch_city, forecast_cache, weather_cache
+from modules.latency import in_context
+from modules.utils import canonical_query
+
+
+class CityIndex:
+    """Canonicalized sorted index of city names for prefix suggestions."""
+
+    def __init__(self, names: list = ()) -> None:
+        self._keys: list = []
+        self._names: dict = {}
+        self._lock = threading.Lock()
+        for n in names:
+            self.add(n)
+
+    def add(self, name: str) -> None:
+        key = canonical_query(name)
+        with self._lock:
+            if key not in self._names:
+                self._names[key] = name
+                bisect.insort(self._keys, key)
+
+    def exact(self, query: str) -> Optional[str]:
+        return self._names.get(canonical_query(query))
+
+    def prefix(self, query: str, limit: int = 5) -> list:
+        q = canonical_query(query)
+        if not q:
+            return []
+        with self._lock:
+            i = bisect.bisect_left(self._keys, q)
+            out = []
+            while i < len(self._keys) and len(out) < limit and self._keys[i].startswith(q):
+                out.append(self._names[self._keys[i]])
+                i += 1
+        return out
+
+
+index = CityIndex(POPULAR_CITIES + WATCHLIST)
+add_observer(lambda record: index.add(record["city"]))
+
+_pool = ThreadPoolExecutor(max_workers=SEARCH_WORKERS, thread_name_prefix="storm-search")
+_inflight: dict = {}   # canonical query -> [future, waiters]
+# Reentrant: add_done_callback on a finished future and a successful cancel()
+# both run _forget in the calling thread, while the lock is held.
+_inflight_lock = threading.RLock()
+
+
+def peek(city: str) -> Optional[tuple]:
+    """Cached ``(weather, forecast)`` for ``city`` without any network call."""
+    weather, forecast = cached(weather_cache, city), cached(forecast_cache, city)
+    if weather is None or forecast is None:
+        return None
+    return weather, forecast
+
+
+def _acquire(query: str) -> Future:
+    with _inflight_lock:
+        entry = _inflight.get(query)
+        if entry is None:
+            # Runs under the page budget of the session that started it.
+            fut = _pool.submit(in_context(fetch_city), query)
+            entry = _inflight[query] = [fut, 0]
+            fut.add_done_callback(lambda _f, q=query: _forget(q, _f))
+        entry[1] += 1
+        return entry[0]
+
+
+def _release(query: str) -> None:
+    """Drop one waiter; cancel the lookup if nobody wants it and it hasn't started."""
+    with _inflight_lock:
+        entry = _inflight.get(query)
+        if entry is None:
+            return
+        entry[1] -= 1
+        if entry[1] <= 0:
+            entry[0].cancel()       # on success, _forget drops the entry
+
+
+def _forget(query: str, fut: Future) -> None:
+    with _inflight_lock:
+        entry = _inflight.get(query)
+        if entry is not None and entry[0] is fut:
+            del _inflight[query]
+
+
+class LiveSearch:
+    """Per-session lookup coordinator; only the newest query is honoured."""
+
+    def __init__(self) -> None:
+        self.generation = 0
+        self._query: Optional[str] = None
+        self._future: Optional[Future] = None
+
+    def submit(self, query: str) -> int:
+        """Start a lookup for ``query``, superseding any earlier one."""
+        if self._query is not None:
+            _release(self._query)
+        self.generation += 1
+        # Spelling variants of one query share a single upstream lookup.
+        self._query = canonical_query(query)
+        self._future = _acquire(self._query)
+        return self.generation
+
+    def wait(self, generation: int, timeout: float,
+             tick: Callable[[], None] = lambda: None) -> Optional[tuple]:
+        """Result of lookup ``generation``, or None if superseded or timed out.
+
+        ``tick`` runs between polls; in the app it is a Streamlit call, which
+        lets a newer keystroke interrupt this rerun instead of queueing behind it.
+        """
+        deadline = time.monotonic() + timeout
+        while generation == self.generation:
+            try:
+                result = self._future.result(timeout=SEARCH_POLL)
+            except TimeoutError:
+                if time.monotonic() >= deadline:
+                    return None
+                tick()
+                continue
+            if generation != self.generation:
+                return None
+            self._query = None
+            return result
+        return None
@@ -0,0 +1,201 @@
+"""
+Snapshot — export/import of the upstream caches for warm deployments.
+
+File layout (all integers little-endian)::
+
+    b"STWXSNAP" | u16 version | f64 created_at
+    repeated:  u32 length | compact JSON {"c": cache, "k": key, "v": value, "e": expires_at}
+
+Records are length-prefixed so a snapshot is read through ``mmap`` one entry
+at a time; expiry is stored as wall-clock time and entries are re-checked
+against it (and capped at the cache's own TTL) on load.
+
+    python -m modules.snapshot export  snapshot.bin --cities London,Tokyo
+    python -m modules.snapshot inspect snapshot.bin
+"""
+import argparse
+import atexit
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from datetime import datetime
+from typing import Iterator
+
+from modules.api_handler import (
+    air_cache, alias_cache, fetch_city, forecast_cache, geo_cache, uv_cache,
+    weather_cache,
+)
+from modules import logs
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"STWXSNAP"
+# v2: record caches keyed by city id, plus the query -> id alias table.
+VERSION = 2
+_HEADER = struct.Struct("<8sHd")
+_LEN = struct.Struct("<I")
+
+CACHES: dict = {
+    "weather": weather_cache,
+    "forecast": forecast_cache,
+    "geo": geo_cache,
+    "alias": alias_cache,
+    "air": air_cache,
+    "uv": uv_cache,
+}
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file is unreadable or of an unknown version."""
+
+
+def _encode(obj):
+    if isinstance(obj, datetime):
+        return {"__dt__": obj.isoformat()}
+    raise TypeError(f"cannot snapshot {type(obj).__name__}")
+
+
+def _decode(obj: dict):
+    if "__dt__" in obj:
+        return datetime.fromisoformat(obj["__dt__"])
+    if "__tuple__" in obj:
+        return tuple(obj["__tuple__"])
+    return obj
+
+
+def _dumps(record: dict) -> bytes:
+    # Tuples are pre-wrapped because json serializes them as lists natively.
+    def wrap(o):
+        if isinstance(o, tuple):
+            return {"__tuple__": [wrap(x) for x in o]}
+        if isinstance(o, dict):
+            return {k: wrap(v) for k, v in o.items()}
+        if isinstance(o, list):
+            return [wrap(x) for x in o]
+        return o
+
+    return json.dumps(wrap(record), default=_encode, separators=(",", ":")).encode()
+
+
+def export_snapshot(path: str) -> int:
+    """Write every live cache entry to ``path`` atomically; return the count."""
+    now_wall = time.time()
+    tmp = f"{path}.{os.getpid()}.tmp"
+    n = 0
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, now_wall))
+        for name, cache in CACHES.items():
+            for key, value, left in cache.entries():
+                raw = _dumps({"c": name, "k": key, "v": value, "e": now_wall + left})
+                f.write(_LEN.pack(len(raw)))
+                f.write(raw)
+                n += 1
+    os.replace(tmp, path)
+    logger.info("Snapshot exported: %d entries -> %s", n, path)
+    return n
+
+
+def iter_snapshot(path: str) -> Iterator[dict]:
+    """Yield decoded records from ``path``, mapping the file rather than reading it."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < _HEADER.size:
+            raise SnapshotError(f"{path}: truncated header")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            magic, version, _ = _HEADER.unpack_from(mm, 0)
+            if magic != MAGIC:
+                raise SnapshotError(f"{path}: not a snapshot file")
+            if version != VERSION:
+                raise SnapshotError(f"{path}: unsupported version {version}")
+            pos = _HEADER.size
+            end = len(mm)
+            while pos + _LEN.size <= end:
+                (size,) = _LEN.unpack_from(mm, pos)
+                pos += _LEN.size
+                if pos + size > end:
+                    logger.warning("Snapshot %s truncated at byte %d", path, pos)
+                    return
+                yield json.loads(mm[pos:pos + size], object_hook=_decode)
+                pos += size
+
+
+def load_snapshot(path: str) -> int:
+    """Load unexpired entries from ``path`` into the registered caches.
+
+    Returns the number of entries restored. A missing file is not an error —
+    the first replica of a fresh deployment simply starts cold.
+    """
+    if not os.path.exists(path):
+        logger.info("No snapshot at %s — starting cold", path)
+        return 0
+    now = time.time()
+    loaded = expired = 0
+    for rec in iter_snapshot(path):
+        cache = CACHES.get(rec["c"])
+        left = rec["e"] - now
+        if cache is None or left <= 0:
+            expired += 1
+            continue
+        cache.set(rec["k"], rec["v"], ttl=min(left, cache.ttl))
+        loaded += 1
+    logger.info("Snapshot loaded: %d entries (%d expired/unknown) from %s", loaded, expired, path)
+    return loaded
+
+
+def enable_persistence(path: str, interval: int) -> None:
+    """Warm the caches from ``path`` and keep it refreshed while serving.
+
+    The snapshot is rewritten every ``interval`` seconds (0 disables the
+    timer) and once more at interpreter exit.
+    """
+    try:
+        load_snapshot(path)
+    except (SnapshotError, OSError, ValueError) as exc:
+        logger.error("Snapshot load failed: %s", exc)
+    atexit.register(export_snapshot, path)
+    if interval > 0:
+        def loop() -> None:
+            while True:
+                time.sleep(interval)
+                try:
+                    export_snapshot(path)
+                except Exception as exc:
+                    # Anything escaping here would end the thread, and with
+                    # it persistence, for the life of the process.
+                    logger.error("Snapshot export failed: %s", exc)
+
+        threading.Thread(target=loop, name="storm-snapshot", daemon=True).start()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Export or inspect cache snapshots.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    ex = sub.add_parser("export", help="fetch cities and write a snapshot")
+    ex.add_argument("path")
+    ex.add_argument("--cities", default="", help="comma-separated; defaults to POPULAR_CITIES")
+    ins = sub.add_parser("inspect", help="summarize a snapshot file")
+    ins.add_argument("path")
+    args = ap.parse_args()
+    logs.setup()
+
+    if args.cmd == "export":
+        from config import POPULAR_CITIES
+        cities = [c.strip() for c in args.cities.split(",") if c.strip()] or POPULAR_CITIES
+        for c in cities:
+            fetch_city(c)
+        print(f"{export_snapshot(args.path)} entries -> {args.path}")
+    else:
+        now = time.time()
+        counts: dict = {}
+        for rec in iter_snapshot(args.path):
+            live, stale = counts.get(rec["c"], (0, 0))
+            counts[rec["c"]] = (live + 1, stale) if rec["e"] > now else (live, stale + 1)
+        for name, (live, stale) in sorted(counts.items()):
+            print(f"{name:<12} live={live:<6} expired={stale}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Solar — local sun-position maths for solar noon, twilight and day length.
+
+Implements the sunrise equation in NOAA's low-precision form (about a minute
+of error at latitudes below ±65°) with numpy, so a single call covers every
+forecast day of every city on a page. Inputs are the ``lat``/``lon`` and
+``timezone`` offset already on each record; nothing is fetched.
+
+Dates are local calendar days expressed as days since the unix epoch, and
+all returned instants are unix seconds (UTC).
+"""
+from datetime import datetime
+
+import numpy as np
+
+# Sun altitude (degrees) at each event: refraction + half the disc for
+# sunrise/sunset, 6° below the horizon for civil dawn/dusk.
+HORIZON = -0.833
+CIVIL = -6.0
+
+_J2000_DAY = 10957            # 2000-01-01 as days since the unix epoch
+_J2000_UNIX = 946728000.0     # J2000.0 epoch (2000-01-01 12:00 UTC)
+_OBLIQUITY = np.radians(23.4397)
+_DAY = 86400.0
+
+
+def solar_days(lat, lon, days) -> dict:
+    """Solar events for every (place, day) pair.
+
+    ``lat``/``lon`` (degrees, east positive) broadcast against ``days``;
+    pass column vectors of places and a row of days for a city × day grid.
+    Returns arrays ``noon``, ``sunrise``, ``sunset``, ``dawn`` and ``dusk``
+    (NaN when the sun never crosses that altitude) and ``day_length`` in
+    seconds (0 in polar night, 86400 under the midnight sun).
+    """
+    phi = np.radians(np.asarray(lat, dtype=float))
+    j_star = np.asarray(days, dtype=float) - _J2000_DAY - np.asarray(lon, dtype=float) / 360.0
+    m = np.radians((357.5291 + 0.98560028 * j_star) % 360.0)
+    centre = 1.9148 * np.sin(m) + 0.02 * np.sin(2 * m) + 0.0003 * np.sin(3 * m)
+    ecl_lon = np.radians((np.degrees(m) + centre + 282.9372) % 360.0)
+    transit = j_star + 0.0053 * np.sin(m) - 0.0069 * np.sin(2 * ecl_lon)
+    sin_dec = np.sin(ecl_lon) * np.sin(_OBLIQUITY)
+    cos_dec = np.sqrt(1.0 - sin_dec ** 2)
+
+    noon = _J2000_UNIX + transit * _DAY
+    out = {"noon": noon}
+    for altitude, before, after in ((HORIZON, "sunrise", "sunset"), (CIVIL, "dawn", "dusk")):
+        cos_h = (np.sin(np.radians(altitude)) - np.sin(phi) * sin_dec) / (np.cos(phi) * cos_dec)
+        half = np.degrees(np.arccos(np.clip(cos_h, -1.0, 1.0))) / 360.0 * _DAY
+        crosses = np.abs(cos_h) <= 1.0
+        out[before] = np.where(crosses, noon - half, np.nan)
+        out[after] = np.where(crosses, noon + half, np.nan)
+        if altitude == HORIZON:
+            out["day_length"] = 2.0 * half
+    return out
+
+
+def local_day(ts: float, tz_offset: int) -> int:
+    """Local calendar day of a unix instant, as days since the epoch."""
+    return int((ts + tz_offset) // _DAY)
+
+
+def date_day(d: datetime) -> int:
+    """Days since the epoch for a naive calendar date."""
+    return (d - datetime(1970, 1, 1)).days
+
+
+def forecast_day_lengths(record: dict, forecast: list) -> np.ndarray:
+    """Day length (seconds) for each forecast day at the record's location."""
+    days = [date_day(day["date"]) for day in forecast]
+    return solar_days(record["lat"], record["lon"], days)["day_length"]
+
+
+def day_lengths(records: list) -> np.ndarray:
+    """Today's day length (seconds) for many cities in one pass."""
+    if not records:
+        return np.empty(0)
+    lat = [r["lat"] for r in records]
+    lon = [r["lon"] for r in records]
+    days = [local_day(r["dt"], r["timezone"]) for r in records]
+    return solar_days(lat, lon, days)["day_length"]
@@ -0,0 +1,306 @@
+"""
+Static Pages — pre-rendered pages for the hottest cities, served as files.
+
+Most traffic is the ``POPULAR_CITIES`` chips, whose content is the same for
+every visitor. This module renders a complete standalone page per city in
+``STATIC_CITIES`` with the same ``*_html`` builders the app uses, rewrites
+them every ``STATIC_REFRESH`` seconds (a page is only replaced when its
+bytes change), and serves them with a small threaded HTTP server:
+
+* ``/`` — index of the pre-rendered cities
+* ``/<slug>`` — one city, e.g. ``/new-york``
+* ``/app/static/...`` — the same content-hashed fonts and sprite as the app
+* any other ``/<slug>`` — redirected to the interactive app (``APP_URL?city=...``)
+
+Pages carry strong ETags; a matching ``If-None-Match`` gets a 304. File
+bodies are held in memory keyed by ``(mtime, size)``, so a hot page costs a
+``stat`` rather than a Streamlit session.
+
+    python -m modules.static_pages build --cities London,Tokyo
+    python -m modules.static_pages serve --port 8502
+"""
+import argparse
+import hashlib
+import html
+import logging
+import mimetypes
+import os
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+from urllib.parse import quote, unquote, urlparse
+
+from config import (
+    APP_URL, DEFAULT_UNIT_SYSTEM, STATIC_CITIES, STATIC_PAGES_DIR, STATIC_PORT,
+    STATIC_REFRESH,
+)
+from modules import latency, logs
+from modules.alerts import engine as alert_engine
+from modules.api_handler import fetch_city
+from modules.layers import LayerSet
+from modules.ui_components import (
+    air_quality_html, alerts_html, css_html, current_weather_html, footer_html,
+    forecast_html, header_html, metric_cards_html, sun_card_html, uv_index_html,
+    weather_tip_html,
+)
+
+logger = logging.getLogger(__name__)
+
+ROOT = Path(__file__).resolve().parent.parent
+STATIC = ROOT / "static"
+_SLUG = re.compile(r"^[a-z0-9-]+$")
+
+# Standalone pages have no Streamlit shell; these rules stand in for it.
+_PAGE_CSS = """<style>
+body { margin: 0; background: var(--bg); color: var(--text-primary); }
+.block-container { max-width: 1200px; margin: 0 auto; padding: 1.5rem 1rem; }
+.static-bar { display: flex; flex-wrap: wrap; gap: 0.5rem 1rem; align-items: center;
+  margin: 0 0 1.2rem; font-family: var(--font-mono); font-size: 0.75rem; color: var(--text-muted); }
+.static-bar a { color: var(--text-secondary); text-decoration: none; }
+.static-bar a:hover, .static-bar a.current { color: var(--accent); }
+.static-bar .static-open { margin-left: auto; border: 1px solid var(--border-hover);
+  padding: 0.3rem 0.7rem; color: var(--accent); }
+</style>"""
+
+
+def slug(city: str) -> str:
+    """URL path segment for a city name: ``"New York"`` -> ``"new-york"``."""
+    return re.sub(r"[^a-z0-9]+", "-", city.lower()).strip("-")
+
+
+def app_link(city: str) -> str:
+    return f"{APP_URL.rstrip('/')}/?city={quote(city)}"
+
+
+def _document(title: str, body: str) -> str:
+    return (
+        '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8">'
+        '<meta name="viewport" content="width=device-width, initial-scale=1">'
+        f'<title>{html.escape(title)}</title>'
+        f'{css_html()}{_PAGE_CSS}</head>'
+        f'<body><div class="stApp"><div class="block-container">{body}</div></div></body></html>'
+    )
+
+
+def _nav(cities: list, current: Optional[str], observed: Optional[int] = None) -> str:
+    # Only the record's own time goes in: a render-time clock would change
+    # every page on every pass and defeat both _write and the ETags.
+    links = "".join(
+        f'<a href="{slug(c)}"{" class=current" if c == current else ""}>{html.escape(c)}</a>'
+        for c in cities
+    )
+    stamp = (
+        f" &middot; observed {datetime.fromtimestamp(observed, timezone.utc):%H:%M} UTC"
+        if observed is not None else ""
+    )
+    open_in = html.escape(app_link(current) if current else APP_URL)
+    return (
+        '<div class="static-bar">'
+        f'<span>&gt; snapshot{stamp} &middot; every {STATIC_REFRESH // 60} min</span>'
+        f'{links}'
+        f'<a class="static-open" href="{open_in}">[ OPEN LIVE ]</a>'
+        '</div>'
+    )
+
+
+def build_page(city: str, cities: list, units: str = DEFAULT_UNIT_SYSTEM) -> Optional[str]:
+    """The complete page for ``city``, or None when it cannot be fetched."""
+    latency.begin_page()
+    layers = LayerSet(city)
+    weather, forecast = fetch_city(city)
+    if not weather:
+        return None
+    extra = {name: value for name, value in layers.results() if value is not None}
+    body = (
+        header_html()
+        + _nav(cities, city, weather["dt"])
+        + current_weather_html(weather, units, at=weather["dt"])
+        + weather_tip_html(weather["condition"])
+        + alerts_html(alert_engine.alerts_for(weather))
+        + metric_cards_html(weather, units)
+        + (air_quality_html(extra["air"]) if "air" in extra else "")
+        + (uv_index_html(extra["uv"]) if "uv" in extra else "")
+        + sun_card_html(weather)
+        + (forecast_html(forecast, units, weather) if forecast else "")
+        + footer_html()
+    )
+    return _document(f"Storm · {weather['city']} Weather", body)
+
+
+def build_index(cities: list) -> str:
+    return _document("Storm · Weather Terminal", header_html() + _nav(cities, None) + footer_html())
+
+
+def _write(path: Path, text: str) -> bool:
+    """Replace ``path`` atomically if its content changed; True if written."""
+    data = text.encode()
+    try:
+        if path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    tmp = path.with_suffix(".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+    return True
+
+
+def refresh(cities: list = STATIC_CITIES, out: str = STATIC_PAGES_DIR) -> dict:
+    """Render every city's page into ``out``; returns ``{city: status}``.
+
+    A city that fails to fetch keeps its previous page until the next pass.
+    """
+    root = Path(out)
+    root.mkdir(parents=True, exist_ok=True)
+    status = {}
+    for city in cities:
+        try:
+            page = build_page(city, cities)
+        except Exception as exc:
+            logger.error("Static page %s failed: %s", city, exc)
+            page = None
+        if page is None:
+            status[city] = "failed"
+            continue
+        status[city] = "written" if _write(root / f"{slug(city)}.html", page) else "unchanged"
+    _write(root / "index.html", build_index(cities))
+    logger.info("Static pages refreshed: %s", status)
+    return status
+
+
+def start_refresher(cities: list = STATIC_CITIES, out: str = STATIC_PAGES_DIR,
+                    interval: int = STATIC_REFRESH) -> None:
+    """Refresh now, then every ``interval`` seconds on a daemon thread."""
+    refresh(cities, out)
+
+    def loop() -> None:
+        while True:
+            time.sleep(interval)
+            try:
+                refresh(cities, out)
+            except OSError as exc:
+                logger.error("Static page refresh failed: %s", exc)
+
+    threading.Thread(target=loop, name="storm-static-pages", daemon=True).start()
+
+
+class PageServer(ThreadingHTTPServer):
+    """Serves ``root`` (pages) and ``static/`` (assets) with ETags."""
+
+    daemon_threads = True
+
+    def __init__(self, addr: tuple, root: str = STATIC_PAGES_DIR) -> None:
+        super().__init__(addr, _Handler)
+        self.root = Path(root).resolve()
+        self._files: dict = {}      # path -> (mtime_ns, size, body, etag)
+        self._lock = threading.Lock()
+
+    def load(self, path: Path) -> Optional[tuple]:
+        """``(body, etag)`` for a file, re-read only when it changed on disk."""
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        with self._lock:
+            hit = self._files.get(path)
+        if hit is not None and hit[:2] == (st.st_mtime_ns, st.st_size):
+            return hit[2], hit[3]
+        body = path.read_bytes()
+        etag = f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+        with self._lock:
+            self._files[path] = (st.st_mtime_ns, st.st_size, body, etag)
+        return body, etag
+
+
+def _within(base: Path, rel: str) -> Optional[Path]:
+    path = (base / rel).resolve()
+    return path if path.is_relative_to(base) and path.is_file() else None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: PageServer
+
+    def do_GET(self) -> None:
+        self._serve(head=False)
+
+    def do_HEAD(self) -> None:
+        self._serve(head=True)
+
+    def _serve(self, head: bool) -> None:
+        path = unquote(urlparse(self.path).path)
+        if path.startswith("/app/static/"):
+            # Asset names are content-hashed, so they never change in place.
+            file = _within(STATIC.resolve(), path[len("/app/static/"):])
+            cache = "public, max-age=31536000, immutable"
+        else:
+            name = path.strip("/") or "index"
+            if not _SLUG.match(name):
+                return self._status(404)
+            file = _within(self.server.root, f"{name}.html")
+            cache = "public, max-age=60"
+            if file is None and name != "index":
+                # Not pre-rendered: hand the visitor to the interactive app.
+                self.send_response(302)
+                self.send_header("Location", app_link(name.replace("-", " ")))
+                self.end_headers()
+                return
+        loaded = self.server.load(file) if file is not None else None
+        if loaded is None:
+            return self._status(404)
+        body, etag = loaded
+        if etag in (t.strip() for t in self.headers.get("If-None-Match", "").split(",")):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", cache)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", mimetypes.guess_type(file.name)[0] or "application/octet-stream")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", cache)
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def _status(self, code: int) -> None:
+        self.send_response(code)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Build or serve pre-rendered city pages.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    for name, help_ in (("build", "render the pages once"),
+                        ("serve", "render on a schedule and serve them")):
+        p = sub.add_parser(name, help=help_)
+        p.add_argument("--cities", default="", help="comma-separated; defaults to STATIC_CITIES")
+        p.add_argument("--out", default=STATIC_PAGES_DIR)
+    sub.choices["serve"].add_argument("--port", type=int, default=STATIC_PORT)
+    args = ap.parse_args()
+    logs.setup()
+
+    cities = [c.strip() for c in args.cities.split(",") if c.strip()] or STATIC_CITIES
+    if args.cmd == "build":
+        for city, status in refresh(cities, args.out).items():
+            print(f"{city:<16} {status}")
+        return
+    start_refresher(cities, args.out)
+    server = PageServer(("0.0.0.0", args.port), args.out)
+    print(f"Serving {len(cities)} pages from {args.out} on :{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -2,32 +2,128 @@
 UI Components — Storm v2
 Terminal-grade aesthetic. No gradients. Pure darkness + Tiger Orange accent.
 Matching the Tiger Analytics design DNA exactly.
+
+Startup stays light: numpy (via ``solar``) and the live search component are
+loaded on first use, and the stylesheet is built once per process, so the
+shell paints before the heavy parts of the UI are imported.
 """
+import functools
+import html
+import json
+import logging
+from pathlib import Path
+from typing import Optional
 import streamlit as st
+from config import CACHE_MAXSIZE, FORECAST_TTL, GRID_PAGE_SIZE
+from modules.cache import TTLCache
+from modules.payload import record, section
+from modules.units import (
+    METRIC, LABELS, convert_record, convert_records, other_system,
+)
 from modules.utils import (
-    country_code_to_flag, format_unix_time, get_local_datetime,
+    country_code_to_flag, format_duration, format_unix_time, get_local_datetime,
     get_weather_emoji, get_weather_tip, get_wind_direction,
     get_feels_description, get_humidity_level, get_wind_severity,
-    celsius_to_fahrenheit,
+    get_aqi_level, get_uv_level,
 )
 
 
+logger = logging.getLogger(__name__)
+
+
 def _html(content: str) -> None:
     """Render HTML, stripping blank lines to prevent Streamlit parser breakage."""
     cleaned = "\n".join(line for line in content.split("\n") if line.strip())
+    record(cleaned)
     st.markdown(cleaned, unsafe_allow_html=True)
 
 
+# ════════════════════════════════════════════
+#  STATIC ASSETS
+# ════════════════════════════════════════════
+
+# Built by tools/build_assets.py; served by Streamlit static file serving.
+_STATIC_URL = "app/static"
+_MANIFEST = Path(__file__).resolve().parent.parent / "static" / "assets.json"
+
+
+def _load_manifest() -> dict:
+    try:
+        return json.loads(_MANIFEST.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+_ASSETS = _load_manifest()
+
+
+def _font_assets() -> tuple:
+    """Return ``(preload_links, font_face_css)`` for the self-hosted fonts.
+
+    Fonts are never fetched from a third party at page load. Without a built
+    manifest both are empty, the stylesheet falls back to the generic
+    families and an error says to run ``tools/build_assets.py``.
+    """
+    if not _ASSETS.get("fonts"):
+        logger.error("Fonts not built — run python -m tools.build_assets")
+        return "", ""
+    links, faces = "", ""
+    for f in _ASSETS.get("fonts", []):
+        url = f"{_STATIC_URL}/{f['file']}"
+        faces += (
+            f"@font-face {{ font-family: '{f['family']}'; font-style: normal; "
+            f"font-weight: {f['weight']}; font-display: swap; "
+            f"src: url('{url}') format('woff2'); }}\n"
+        )
+        if f.get("preload"):
+            links += f'<link rel="preload" href="{url}" as="font" type="font/woff2" crossorigin>'
+    return links, faces
+
+
+def weather_icon(icon_code: str, condition: str, css_class: str) -> str:
+    """Sprite icon for an OWM ``icon_code``, or the condition emoji as fallback."""
+    sprite = _ASSETS.get("sprite")
+    if sprite and icon_code:
+        return (
+            f'<svg class="wx-icon {css_class}" role="img" aria-label="{condition}">'
+            f'<use href="{_STATIC_URL}/{sprite}#wx-{icon_code}"/></svg>'
+        )
+    return f'<span class="{css_class}">{get_weather_emoji(condition)}</span>'
+
+
+# ════════════════════════════════════════════
+#  LIVE SEARCH COMPONENT
+# ════════════════════════════════════════════
+
+@functools.lru_cache(maxsize=1)
+def _live_search():
+    # Declaring walks the module table to find its caller (~100 ms), so it
+    # waits for the first search box rather than the import.
+    import streamlit.components.v1 as components
+    return components.declare_component(
+        "live_search", path=str(Path(__file__).resolve().parent / "components" / "live_search"),
+    )
+
+
+def live_search_input(key: str, debounce_ms: int) -> str:
+    """Search box that reports its value only after typing pauses."""
+    return _live_search()(
+        placeholder="> query city name...", debounce_ms=debounce_ms,
+        key=key, default="",
+    ) or ""
+
+
 # ════════════════════════════════════════════
 #  CSS INJECTION
 # ════════════════════════════════════════════
 
-def inject_custom_css() -> None:
-    """Inject the full terminal-grade stylesheet."""
+@functools.lru_cache(maxsize=1)
+def css_html() -> str:
+    """The full terminal-grade stylesheet, as a ``<style>`` element (built once)."""
     css = """
     <style>
     /* ═══ FONTS ═══ */
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600&family=JetBrains+Mono:wght@400;500;700&family=Space+Grotesk:wght@500;700&display=swap');
+    /*@FONT_FACES@*/
     /* ═══ VARIABLES ═══ */
     :root {
         --accent: #f05a28;
@@ -484,6 +580,15 @@ def inject_custom_css() -> None:
         letter-spacing: 0.1em;
         margin-top: 0.3rem;
     }
+    .sun-summary {
+        font-family: var(--font-mono);
+        font-size: 0.65rem;
+        color: var(--text-muted);
+        text-transform: uppercase;
+        letter-spacing: 0.1em;
+        text-align: center;
+        margin-top: 1rem;
+    }
     /* ═══ TIP CARD ═══ */
     .tip-card {
         background: rgba(var(--accent-rgb), 0.03);
@@ -559,6 +664,13 @@ def inject_custom_css() -> None:
         margin-bottom: 0.8rem;
         display: block;
     }
+    svg.wx-icon {
+        width: 1em;
+        height: 1em;
+        color: var(--text-primary);
+    }
+    svg.forecast-emoji { margin-left: auto; margin-right: auto; color: var(--text-secondary); }
+    svg.city-card-icon { font-size: 1.1rem; color: var(--text-secondary); }
     .forecast-temps {
         display: flex;
         justify-content: center;
@@ -576,6 +688,92 @@ def inject_custom_css() -> None:
         text-transform: uppercase;
         letter-spacing: 0.05em;
     }
+    .forecast-sun {
+        font-family: var(--font-mono);
+        font-size: 0.6rem;
+        color: var(--text-dim);
+        margin-top: 0.3rem;
+    }
+    /* ═══ ALERTS ═══ */
+    .alert-card {
+        display: flex;
+        align-items: center;
+        gap: 0.8rem;
+        background: rgba(var(--accent-rgb), 0.06);
+        border: 1px solid rgba(var(--accent-rgb), 0.3);
+        border-left: 3px solid var(--accent);
+        border-radius: 0.6rem;
+        padding: 0.7rem 1rem;
+        margin-bottom: 0.6rem;
+        font-family: var(--font-mono);
+        font-size: 0.75rem;
+        color: var(--text-secondary);
+        animation: fadeInUp 0.5s var(--ease-expo);
+    }
+    .alert-card.advisory {
+        background: var(--bg-card);
+        border-color: var(--border);
+        border-left-color: var(--text-muted);
+    }
+    .alert-level {
+        color: var(--accent);
+        font-weight: 700;
+        text-transform: uppercase;
+        letter-spacing: 0.08em;
+    }
+    .alert-card.advisory .alert-level { color: var(--text-secondary); }
+    .city-card.alerting { border-color: rgba(var(--accent-rgb), 0.45); }
+    /* ═══ WATCH LIST GRID ═══ */
+    .city-grid {
+        display: grid;
+        grid-template-columns: repeat(auto-fill, minmax(180px, 1fr));
+        gap: 0.75rem;
+        margin-bottom: 0.75rem;
+    }
+    .city-card {
+        background: var(--bg-card);
+        border: 1px solid var(--border);
+        border-radius: var(--radius);
+        padding: 1rem 1.1rem;
+        transition: border-color 0.3s var(--ease-expo), background 0.3s var(--ease-expo);
+    }
+    .city-card:hover {
+        border-color: var(--border-hover);
+        background: var(--bg-card-hover);
+    }
+    .city-card-head {
+        display: flex;
+        justify-content: space-between;
+        align-items: center;
+        font-family: var(--font-mono);
+        font-size: 0.65rem;
+        color: var(--text-muted);
+        text-transform: uppercase;
+        letter-spacing: 0.08em;
+    }
+    .city-card-name {
+        font-family: var(--font-display);
+        font-size: 1.05rem;
+        font-weight: 700;
+        color: var(--text-primary);
+        margin: 0.4rem 0 0.2rem;
+        white-space: nowrap;
+        overflow: hidden;
+        text-overflow: ellipsis;
+    }
+    .city-card-temp {
+        font-family: var(--font-display);
+        font-size: 1.8rem;
+        font-weight: 700;
+        color: var(--text-primary);
+    }
+    .city-card-cond {
+        font-family: var(--font-mono);
+        font-size: 0.6rem;
+        color: var(--text-muted);
+        text-transform: uppercase;
+        letter-spacing: 0.05em;
+    }
     /* ═══ WELCOME ═══ */
     .welcome-container {
         text-align: center;
@@ -665,15 +863,25 @@ def inject_custom_css() -> None:
     }
     </style>
     """
-    _html(css)
+    links, faces = _font_assets()
+    return links + css.replace("/*@FONT_FACES@*/", faces)
+
+
+@section("css")
+def inject_custom_css() -> None:
+    """Inject the full terminal-grade stylesheet."""
+    _html(css_html())
 
 
 # ════════════════════════════════════════════
 #  RENDER FUNCTIONS
 # ════════════════════════════════════════════
 
-def render_header() -> None:
-    _html(
+# Each ``*_html`` builder returns a section's markup; ``render_*`` emits it
+# as one element. The builders are also used for static pages (static_pages).
+
+def header_html() -> str:
+    return (
         '<div class="app-header">'
         '<div class="app-logo">'
         '<span class="caret">&gt;</span>STORM'
@@ -689,8 +897,13 @@ def render_header() -> None:
     )
 
 
-def render_welcome() -> None:
-    _html(
+@section("header")
+def render_header() -> None:
+    _html(header_html())
+
+
+def welcome_html() -> str:
+    return (
         '<div class="welcome-container">'
         '<span class="welcome-icon">&#9729;&#65039;</span>'
         '<div class="welcome-title">Weather Intelligence Terminal</div>'
@@ -705,37 +918,45 @@ def render_welcome() -> None:
     )
 
 
-def render_current_weather(data: dict) -> None:
-    emoji = get_weather_emoji(data["condition"])
+@section("welcome")
+def render_welcome() -> None:
+    _html(welcome_html())
+
+
+def current_weather_html(data: dict, units: str = METRIC, at: Optional[int] = None) -> str:
+    """Hero section; the clock shows local time now, or at unix time ``at``."""
+    icon = weather_icon(data.get("icon_code"), data["condition"], "weather-emoji")
     flag = country_code_to_flag(data["country"])
-    local_dt = get_local_datetime(data["timezone"])
+    local_dt = get_local_datetime(data["timezone"], at)
     date_str = local_dt.strftime("%A, %b %d &middot; %I:%M %p")
-    f_temp = celsius_to_fahrenheit(data["temp"])
+    alt_units = other_system(units)
+    alt_temp = convert_record(data, alt_units)["temp"]
+    data = convert_record(data, units)
 
-    _html(
+    return (
         '<div class="section-label">01 / Current Conditions</div>'
         '<div class="weather-hero">'
         '<div class="scan"></div>'
         '<div class="hero-grid">'
         # Left
         '<div class="hero-left">'
-        f'<div class="city-name">{data["city"]}</div>'
+        f'<div class="city-name">{html.escape(data["city"])}</div>'
         '<div class="city-country">'
         f'<span class="dot"></span>'
-        f'{flag}&ensp;{data["country"]}'
+        f'{flag}&ensp;{html.escape(data["country"])}'
         '</div>'
-        f'<div class="temp-display">{data["temp"]}<span class="temp-unit">&deg;C</span></div>'
+        f'<div class="temp-display">{data["temp"]}<span class="temp-unit">{LABELS[units]["temp"]}</span></div>'
         '<div class="temp-range">'
         f'<span class="temp-high">&#9650; {data["temp_max"]}&deg;</span>'
         f'<span class="temp-low">&#9660; {data["temp_min"]}&deg;</span>'
         f'<span style="color:#525252;font-family:var(--font-mono);font-size:0.75rem;">'
-        f'/ {f_temp}&deg;F</span>'
+        f'/ {alt_temp}{LABELS[alt_units]["temp"]}</span>'
         '</div>'
         '</div>'
         # Right
         '<div class="hero-right">'
-        f'<span class="weather-emoji">{emoji}</span>'
-        f'<div class="weather-desc">{data["description"]}</div>'
+        f'{icon}'
+        f'<div class="weather-desc">{html.escape(data["description"])}</div>'
         f'<div class="weather-date">{date_str}</div>'
         '</div>'
         '</div>'
@@ -743,9 +964,14 @@ def render_current_weather(data: dict) -> None:
     )
 
 
-def render_weather_tip(condition: str) -> None:
+@section("hero")
+def render_current_weather(data: dict, units: str = METRIC) -> None:
+    _html(current_weather_html(data, units))
+
+
+def weather_tip_html(condition: str) -> str:
     tip = get_weather_tip(condition)
-    _html(
+    return (
         '<div class="tip-card">'
         '<div class="tip-prefix">&gt;_</div>'
         f'<div class="tip-text">{tip}</div>'
@@ -753,11 +979,39 @@ def render_weather_tip(condition: str) -> None:
     )
 
 
-def render_metric_cards(data: dict) -> None:
+@section("tip")
+def render_weather_tip(condition: str) -> None:
+    _html(weather_tip_html(condition))
+
+
+def alerts_html(alerts: list) -> str:
+    inner = ""
+    for a in alerts:
+        inner += (
+            f'<div class="alert-card {a["severity"]}">'
+            f'<span class="alert-level">[{a["severity"]}]</span>'
+            f'<span>sys.alert: {a["message"]} &mdash; {a["field"]}={a["value"]}</span>'
+            '</div>'
+        )
+    return inner
+
+
+@section("alerts")
+def render_alerts(alerts: list) -> None:
+    if alerts:
+        _html(alerts_html(alerts))
+
+
+def metric_cards_html(data: dict, units: str = METRIC) -> str:
+    # Bands and bar widths come from canonical values; labels from display ones.
+    wind_kmh = data["wind_speed"] * 3.6
     wind_dir = get_wind_direction(data["wind_deg"])
     feels_desc = get_feels_description(data["feels_like"])
     hum_level = get_humidity_level(data["humidity"])
-    wind_sev = get_wind_severity(data["wind_speed"])
+    wind_sev = get_wind_severity(wind_kmh)
+    vis_pct = min(data["visibility"] / 20000 * 100, 100)
+    labels = LABELS[units]
+    data = convert_record(data, units)
 
     cards = [
         ("FEELS LIKE",  "&#x1F321;&#xFE0F;", f'{data["feels_like"]}&deg;',
@@ -765,15 +1019,28 @@ def render_metric_cards(data: dict) -> None:
         ("HUMIDITY",     "&#x1F4A7;",          f'{data["humidity"]}%',
          hum_level, data["humidity"]),
         ("WIND",         "&#x1F4A8;",          f'{data["wind_speed"]}',
-         f"{wind_dir} &middot; {wind_sev}", min(data["wind_speed"] / 100 * 100, 100)),
+         f'{labels["speed"]} &middot; {wind_dir} &middot; {wind_sev}', min(wind_kmh, 100)),
         ("PRESSURE",     "&#x1F4CA;",          f'{data["pressure"]}',
          "HPA", None),
         ("VISIBILITY",   "&#x1F441;&#xFE0F;", f'{data["visibility"]}',
-         "KM", min(data["visibility"] / 20 * 100, 100)),
+         labels["distance"], vis_pct),
         ("CLOUD COVER",  "&#9729;&#65039;",    f'{data["clouds"]}%',
          "COVERAGE", data["clouds"]),
     ]
 
+    return (
+        '<div class="section-label">02 / Atmospheric Data</div>'
+        f'<div class="metrics-grid">{_metric_cards(cards)}</div>'
+    )
+
+
+@section("metrics")
+def render_metric_cards(data: dict, units: str = METRIC) -> None:
+    _html(metric_cards_html(data, units))
+
+
+def _metric_cards(cards: list) -> str:
+    """``(label, icon, value, sub, bar_pct)`` tuples as metric card HTML."""
     inner = ""
     for label, icon, value, sub, bar_pct in cards:
         bar_html = ""
@@ -794,59 +1061,117 @@ def render_metric_cards(data: dict) -> None:
             f'{bar_html}'
             '</div>'
         )
+    return inner
 
-    _html(
-        '<div class="section-label">02 / Atmospheric Data</div>'
-        f'<div class="metrics-grid">{inner}</div>'
+
+def air_quality_html(air: dict) -> str:
+    cards = [
+        ("AIR QUALITY", "&#x1F343;", f'{air["aqi"]}/5',
+         get_aqi_level(air["aqi"]), air["aqi"] * 20),
+        ("PM2.5", "&#x1F32B;&#xFE0F;", f'{air["pm2_5"]:.0f}', "&micro;G/M&sup3;", None),
+        ("PM10",  "&#x1F32B;&#xFE0F;", f'{air["pm10"]:.0f}',  "&micro;G/M&sup3;", None),
+        ("OZONE", "&#x1F300;",          f'{air["o3"]:.0f}',    "&micro;G/M&sup3;", None),
+    ]
+    return (
+        '<div class="section-label">02.1 / Air Quality</div>'
+        f'<div class="metrics-grid">{_metric_cards(cards)}</div>'
     )
 
 
-def render_sun_card(data: dict) -> None:
-    sunrise = format_unix_time(data["sunrise"], data["timezone"])
-    sunset = format_unix_time(data["sunset"], data["timezone"])
+@section("air")
+def render_air_quality(air: dict) -> None:
+    _html(air_quality_html(air))
 
-    _html(
-        '<div class="section-label">03 / Solar Cycle</div>'
-        '<div class="sun-card">'
-        '<div class="sun-timeline">'
-        '<div class="sun-point">'
-        '<span class="sun-icon">&#127749;</span>'
-        f'<div class="sun-time">{sunrise}</div>'
-        '<div class="sun-tag">Sunrise</div>'
-        '</div>'
-        '<div class="sun-point">'
-        '<span class="sun-icon">&#9728;&#65039;</span>'
-        '<div class="sun-time">12:00 PM</div>'
-        '<div class="sun-tag">Solar Peak</div>'
-        '</div>'
+
+def uv_index_html(uv: dict) -> str:
+    cards = [
+        ("UV INDEX",  "&#x1F506;", f'{uv["uvi"]:.1f}', get_uv_level(uv["uvi"]),
+         min(uv["uvi"] / 11 * 100, 100)),
+        ("UV PEAK",   "&#x2600;&#xFE0F;", f'{uv["uvi_max"]:.1f}',
+         f'TODAY &middot; {get_uv_level(uv["uvi_max"])}', min(uv["uvi_max"] / 11 * 100, 100)),
+    ]
+    return (
+        '<div class="section-label">02.2 / UV Exposure</div>'
+        f'<div class="metrics-grid">{_metric_cards(cards)}</div>'
+    )
+
+
+@section("uv")
+def render_uv_index(uv: dict) -> None:
+    _html(uv_index_html(uv))
+
+
+def sun_card_html(data: dict) -> str:
+    from modules import solar
+    # Sunrise/sunset come from upstream; noon, twilight and day length are
+    # computed locally for today and tomorrow in one call.
+    tz = data["timezone"]
+    day = solar.local_day(data["dt"], tz)
+    ev = solar.solar_days(data["lat"], data["lon"], [day, day + 1])
+    length, tomorrow = ev["day_length"]
+    delta = round((tomorrow - length) / 60)
+
+    def at(ts: float) -> str:
+        return "&mdash;" if ts != ts else format_unix_time(ts, tz)   # NaN: no crossing
+
+    points = [
+        ("&#127748;", at(ev["dawn"][0]), "Civil Dawn"),
+        ("&#127749;", format_unix_time(data["sunrise"], tz), "Sunrise"),
+        ("&#9728;&#65039;", at(ev["noon"][0]), "Solar Noon"),
+        ("&#127751;", format_unix_time(data["sunset"], tz), "Sunset"),
+        ("&#127747;", at(ev["dusk"][0]), "Civil Dusk"),
+    ]
+    inner = "".join(
         '<div class="sun-point">'
-        '<span class="sun-icon">&#127751;</span>'
-        f'<div class="sun-time">{sunset}</div>'
-        '<div class="sun-tag">Sunset</div>'
+        f'<span class="sun-icon">{icon}</span>'
+        f'<div class="sun-time">{time_}</div>'
+        f'<div class="sun-tag">{tag}</div>'
         '</div>'
+        for icon, time_, tag in points
+    )
+    return (
+        '<div class="section-label">03 / Solar Cycle</div>'
+        '<div class="sun-card">'
+        f'<div class="sun-timeline">{inner}</div>'
+        '<div class="sun-summary">'
+        f'Day length {format_duration(length)} &middot; '
+        f'{delta:+d} min tomorrow'
         '</div>'
         '</div>'
     )
 
 
-def render_forecast(forecast: list) -> None:
+@section("solar")
+def render_sun_card(data: dict) -> None:
+    _html(sun_card_html(data))
+
+
+def forecast_html(forecast: list, units: str = METRIC, place: dict = None) -> str:
+    """Daily cards; with ``place`` (a current record) each shows its day length."""
+    from modules import solar
+    lengths = solar.forecast_day_lengths(place, forecast) if place else [None] * len(forecast)
     inner = ""
-    for day in forecast:
-        emoji = get_weather_emoji(day["condition"])
+    for day, length in zip(convert_records(forecast, units), lengths):
+        daylight = (
+            f'<div class="forecast-sun">&#9728;&#65039; {format_duration(length)}</div>'
+            if length is not None else ""
+        )
+        icon = weather_icon(day.get("icon_code"), day["condition"], "forecast-emoji")
         inner += (
             '<div class="forecast-card">'
             f'<div class="forecast-day">{day["day_name"]}</div>'
             f'<div class="forecast-date">{day["date_formatted"]}</div>'
-            f'<span class="forecast-emoji">{emoji}</span>'
+            f'{icon}'
             '<div class="forecast-temps">'
             f'<span class="forecast-hi">{day["temp_max"]}&deg;</span>'
             f'<span class="forecast-lo">{day["temp_min"]}&deg;</span>'
             '</div>'
-            f'<div class="forecast-cond">{day["description"]}</div>'
+            f'<div class="forecast-cond">{html.escape(day["description"])}</div>'
+            f'{daylight}'
             '</div>'
         )
 
-    _html(
+    return (
         '<div class="forecast-section">'
         '<div class="section-label">04 / 5-Day Forecast</div>'
         f'<div class="forecast-grid">{inner}</div>'
@@ -854,8 +1179,89 @@ def render_forecast(forecast: list) -> None:
     )
 
 
-def render_error(message: str = "City not found") -> None:
+@section("forecast")
+def render_forecast(forecast: list, units: str = METRIC, place: dict = None) -> None:
+    _html(forecast_html(forecast, units, place))
+
+
+# Card HTML keyed by observation identity — a card is rebuilt only when its
+# city reports a new observation, never on window moves or reruns.
+_card_cache = TTLCache(FORECAST_TTL, CACHE_MAXSIZE)
+
+
+def build_city_card(data: dict, units: str = METRIC, alerting: bool = False,
+                    daylight: float = None) -> str:
+    """Return the compact grid card for one display record, reusing prior builds.
+
+    ``daylight`` is the day length in seconds; it is fixed for a given
+    observation day, so it does not take part in the cache key.
+    """
+    key = (data["city"], data["country"], data["dt"], units, alerting)
+    card = _card_cache.get(key)
+    if card is None:
+        marker = "&#9888;&#65039; " if alerting else ""
+        card = (
+            f'<div class="city-card{" alerting" if alerting else ""}">'
+            '<div class="city-card-head">'
+            f'<span>{country_code_to_flag(data["country"])}&ensp;{html.escape(data["country"])}</span>'
+            f'<span>{marker}{weather_icon(data.get("icon_code"), data["condition"], "city-card-icon")}</span>'
+            '</div>'
+            f'<div class="city-card-name">{html.escape(data["city"])}</div>'
+            f'<div class="city-card-temp">{data["temp"]}&deg;</div>'
+            f'<div class="city-card-cond">{html.escape(data["description"])} &middot; '
+            f'&#9650;{data["temp_max"]}&deg; &#9660;{data["temp_min"]}&deg;</div>'
+            + (f'<div class="city-card-cond">&#9728;&#65039; {format_duration(daylight)}</div>'
+               if daylight is not None else '')
+            + '</div>'
+        )
+        _card_cache.set(key, card)
+    return card
+
+
+@section("grid")
+def render_city_grid(records: list, start: int, total: int,
+                     units: str = METRIC, alerting: frozenset = frozenset()) -> None:
+    """Render the visible window of the watch list, one element per page.
+
+    Only the records passed in are materialized; each page is emitted as its
+    own element so the payload is bounded by the window, not the list.
+    ``alerting`` holds the city ids with active alerts.
+    """
+    from modules import solar
+    end = start + len(records)
     _html(
+        '<div class="section-label">'
+        f'Watch List &middot; {start + 1}&ndash;{end} of {total}'
+        '</div>'
+    )
+    lengths = solar.day_lengths(records)     # whole window in one pass
+    records = convert_records(records, units)
+    for i in range(0, len(records), GRID_PAGE_SIZE):
+        page = zip(records[i:i + GRID_PAGE_SIZE], lengths[i:i + GRID_PAGE_SIZE])
+        cards = "".join(
+            build_city_card(r, units, r["id"] in alerting, length) for r, length in page
+        )
+        _html(f'<div class="city-grid">{cards}</div>')
+
+
+@section("search")
+def render_searching(slot, query: str, dots: int) -> None:
+    """Draw one frame of the searching status into ``slot`` (an ``st.empty``)."""
+    with slot:
+        _html(searching_html(query, dots))
+
+
+def searching_html(query: str, dots: int) -> str:
+    """Inline status line shown while a live lookup is in flight."""
+    return (
+        '<div class="welcome-hint" style="margin:1rem 0;text-align:left;">'
+        f'&gt; resolving <span class="accent">{html.escape(query)}</span>{"." * (dots % 4)}'
+        '</div>'
+    )
+
+
+def error_html(message: str = "City not found") -> str:
+    return (
         '<div class="error-card">'
         '<div class="error-icon">&#128683;</div>'
         f'<div class="error-title">ERR: {message.upper()}</div>'
@@ -866,8 +1272,23 @@ def render_error(message: str = "City not found") -> None:
     )
 
 
-def render_footer() -> None:
-    _html(
+def live_status_html(updated: float, tz: int) -> str:
+    """Live-mode status line: when the shown values last changed."""
+    return (
+        '<div class="welcome-hint" style="margin:0 0 0.8rem;text-align:right;">'
+        '<span class="status-dot"></span> live &middot; updated '
+        f'<span class="accent">{format_unix_time(updated, tz)}</span>'
+        '</div>'
+    )
+
+
+@section("error")
+def render_error(message: str = "City not found") -> None:
+    _html(error_html(message))
+
+
+def footer_html() -> str:
+    return (
         '<div class="app-footer">'
         '<div class="footer-status">'
         '<span>sys.status: normal</span>'
@@ -880,3 +1301,8 @@ def render_footer() -> None:
         ' &middot; powered by openweathermap'
         '</div>'
     )
+
+
+@section("footer")
+def render_footer() -> None:
+    _html(footer_html())
@@ -0,0 +1,60 @@
+"""
+Units — display-unit conversion over canonical records.
+
+Records coming out of ``api_handler`` are canonical and unrounded: °C for
+temperatures, m/s for wind, metres for visibility, hPa for pressure. Every
+conversion and all display rounding happens here, column-wise over numpy
+arrays, so switching unit system is pure computation over cached data.
+numpy is imported on the first conversion; the unit tables are plain data.
+"""
+METRIC = "metric"
+IMPERIAL = "imperial"
+UNIT_SYSTEMS = (METRIC, IMPERIAL)
+
+LABELS: dict = {
+    METRIC: {"temp": "&deg;C", "speed": "KM/H", "distance": "KM", "short": "°C"},
+    IMPERIAL: {"temp": "&deg;F", "speed": "MPH", "distance": "MI", "short": "°F"},
+}
+
+# (scale, offset, decimals) applied to canonical values, per field family.
+_TEMP = {METRIC: (1.0, 0.0, 0), IMPERIAL: (1.8, 32.0, 0)}
+_SPEED = {METRIC: (3.6, 0.0, 1), IMPERIAL: (2.236936, 0.0, 1)}
+_DISTANCE = {METRIC: (0.001, 0.0, 1), IMPERIAL: (0.000621371, 0.0, 1)}
+
+_FIELDS: dict = {
+    "temp": _TEMP, "feels_like": _TEMP, "temp_min": _TEMP, "temp_max": _TEMP,
+    "wind_speed": _SPEED, "wind": _SPEED,
+    "visibility": _DISTANCE,
+}
+
+
+def other_system(system: str) -> str:
+    return IMPERIAL if system == METRIC else METRIC
+
+
+def convert_records(records: list, system: str) -> list:
+    """Return display copies of ``records`` converted to ``system``.
+
+    Each convertible field is converted for all records in one vectorized
+    step. Input records are never mutated, so cached canonical data stays
+    intact.
+    """
+    if not records:
+        return []
+    import numpy as np
+    out = [dict(r) for r in records]
+    n = len(records)
+    for field, table in _FIELDS.items():
+        if field not in records[0]:
+            continue
+        scale, offset, decimals = table[system]
+        col = np.fromiter((r[field] for r in records), dtype=float, count=n)
+        col = np.round(col * scale + offset, decimals)
+        values = col.astype(int).tolist() if decimals == 0 else col.tolist()
+        for rec, v in zip(out, values):
+            rec[field] = v
+    return out
+
+
+def convert_record(record: dict, system: str) -> dict:
+    return convert_records([record], system)[0]
@@ -1,14 +1,13 @@
 """
 Utility functions — conversions, formatting, mapping.
 """
+import re
+import unicodedata
 from datetime import datetime, timezone, timedelta
+from typing import Optional
 from config import WEATHER_EMOJIS, WEATHER_TIPS
 
 
-def celsius_to_fahrenheit(c: float) -> float:
-    return round((c * 9 / 5) + 32, 1)
-
-
 def get_wind_direction(deg: int) -> str:
     dirs = ["N","NNE","NE","ENE","E","ESE","SE","SSE",
             "S","SSW","SW","WSW","W","WNW","NW","NNW"]
@@ -20,8 +19,15 @@ def format_unix_time(ts: int, tz_offset: int) -> str:
     return datetime.fromtimestamp(ts, tz=tz).strftime("%I:%M %p")
 
 
-def get_local_datetime(tz_offset: int) -> datetime:
-    return datetime.now(tz=timezone(timedelta(seconds=tz_offset)))
+def format_duration(seconds: float) -> str:
+    minutes = int(round(seconds / 60))
+    return f"{minutes // 60}h {minutes % 60:02d}m"
+
+
+def get_local_datetime(tz_offset: int, ts: Optional[float] = None) -> datetime:
+    """Local time at ``tz_offset``: now, or at unix time ``ts``."""
+    tz = timezone(timedelta(seconds=tz_offset))
+    return datetime.now(tz=tz) if ts is None else datetime.fromtimestamp(ts, tz=tz)
 
 
 def get_weather_emoji(condition: str) -> str:
@@ -63,3 +69,46 @@ def get_wind_severity(speed: float) -> str:
     if speed >= 20:  return "MODERATE"
     if speed >= 10:  return "LIGHT"
     return "CALM"
+
+
+def get_aqi_level(aqi: int) -> str:
+    # OWM's 1–5 air quality index.
+    return {1: "GOOD", 2: "FAIR", 3: "MODERATE", 4: "POOR"}.get(aqi, "VERY POOR")
+
+
+def get_uv_level(uvi: float) -> str:
+    if uvi >= 11: return "EXTREME"
+    if uvi >= 8:  return "VERY HIGH"
+    if uvi >= 6:  return "HIGH"
+    if uvi >= 3:  return "MODERATE"
+    return "LOW"
+
+
+def grid_window(total: int, offset: int, pages: int,
+                page_size: int, max_pages: int) -> tuple:
+    """Return the ``(start, end)`` slice of a paginated grid window.
+
+    The window grows page by page up to ``max_pages`` and then slides, so at
+    most ``max_pages * page_size`` items are ever visible at once.
+    """
+    pages = max(1, min(pages, max_pages))
+    start = max(0, min(offset, max(total - 1, 0)))
+    return start, min(start + pages * page_size, total)
+
+
+_SPACE = re.compile(r"\s+")
+
+
+def canonical_query(name: str) -> str:
+    """Normalize a typed city name into a cache key.
+
+    NFKC folds compatibility forms (full-width letters, ligatures), casefold
+    handles ``ß``/``İ`` and friends, and runs of whitespace collapse to one
+    space — so ``"  new   YORK"`` and ``"Ｎｅｗ York"`` share an entry.
+    """
+    return _SPACE.sub(" ", unicodedata.normalize("NFKC", name).casefold()).strip()
+
+
+def city_id(lat: float, lon: float) -> str:
+    """Stable identity of a resolved place; ~1 km resolution."""
+    return f"{lat:.2f},{lon:.2f}"
@@ -0,0 +1,24 @@
+"""Shared test setup: import from the repo root, answer upstream from the stub."""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from tools.owm_stub import serve  # noqa: E402
+
+_stub = serve()
+# config reads the environment once, at import.
+os.environ["STORM_OWM_HOST"] = _stub.url
+os.environ["OPENWEATHER_API_KEY"] = "test"
+os.environ["STORM_MEMORY_INTERVAL"] = "0"
+os.environ.pop("STORM_CACHE_SNAPSHOT", None)
+
+
+@pytest.fixture
+def stub():
+    """The local OpenWeatherMap stub every test talks to."""
+    return _stub
@@ -0,0 +1,47 @@
+from collections import Counter
+from pathlib import Path
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from modules import decode, live, profiler
+
+APP = Path(__file__).resolve().parent.parent / "app.py"
+
+
+@pytest.fixture
+def admin_page(monkeypatch):
+    """Render the home page as an operator sees it."""
+    monkeypatch.setattr(profiler, "ADMIN_TOKEN", "secret")
+
+    def render():
+        at = AppTest.from_file(str(APP), default_timeout=30)
+        at.query_params["admin"] = "secret"
+        at.run()
+        assert not at.exception
+        return at
+    return render
+
+
+def test_panels_render(admin_page):
+    labels = [e.label for e in admin_page().expander]
+    assert [label.split(" (")[0] for label in labels] == [
+        "admin · profiles", "admin · memory", "admin · payload", "admin · upstream",
+        "admin · schema drift", "admin · live", "admin · logs",
+    ]
+
+
+def test_live_panel_shows_the_counters(monkeypatch, admin_page):
+    monkeypatch.setattr(live, "stats", Counter(ticks=4, rebuilt=1, reused=3, fetches=2))
+    panel = next(e for e in admin_page().expander if e.label.startswith("admin · live"))
+    assert panel.label == "admin · live (4 ticks)"
+    assert panel.markdown[0].value == "rebuilt 1 · reused 3 (75%) · upstream fetches 2"
+
+
+def test_drift_panel_lists_the_report(monkeypatch, admin_page):
+    monkeypatch.setattr(decode, "drift", Counter({("forecast", "list", "missing"): 3}))
+    panel = next(e for e in admin_page().expander if e.label.startswith("admin · schema drift"))
+    assert panel.label == "admin · schema drift (1)"
+    assert panel.dataframe[0].value.to_dict("records") == [
+        {"schema": "forecast", "path": "list", "problem": "missing", "count": 3},
+    ]
@@ -0,0 +1,60 @@
+from modules.alerts import AlertEngine, Rule
+
+OSLO = "59.91,10.75"
+
+
+def _obs(dt: int, temp: float, wind_speed: float = 1.0, city: str = "Oslo",
+         cid: str = OSLO) -> dict:
+    return {"id": cid, "city": city, "dt": dt, "temp": temp, "feels_like": temp,
+            "humidity": 50, "wind_speed": wind_speed, "condition": "Clear"}
+
+
+def test_alerts_fire_on_the_rising_edge_only():
+    engine = AlertEngine()
+    fired = []
+    engine.subscribe(fired.append)
+    engine.add_rule(Rule(OSLO, "temp", "gt", 30, rule_id="heat"))
+
+    assert [a["rule_id"] for a in engine.observe(_obs(1, 31))] == ["heat"]
+    assert engine.observe(_obs(2, 33)) == []            # still matching
+    assert engine.active(OSLO)[0]["value"] == 33
+    assert engine.observe(_obs(3, 25)) == []            # clears
+    assert engine.active(OSLO) == []
+    assert len(engine.observe(_obs(4, 35))) == 1        # fires again
+    assert [a["value"] for a in fired] == [31, 35]
+
+
+def test_repeated_observation_is_ignored():
+    engine = AlertEngine()
+    engine.add_rule(Rule(OSLO, "temp", "gt", 30))
+    assert len(engine.observe(_obs(1, 31))) == 1
+    engine.remove_rule(engine.active(OSLO)[0]["rule_id"])
+    rule_id = engine.add_rule(Rule(OSLO, "temp", "gt", 30))
+    # A new rule is evaluated against the city already seen...
+    assert [a["rule_id"] for a in engine.active(OSLO)] == [rule_id]
+    assert engine.active(OSLO)[0]["city"] == "Oslo"
+    # ...and the same observation is not ingested twice.
+    assert engine.observe(_obs(1, 31)) == []
+
+
+def test_places_sharing_a_name_keep_separate_state():
+    engine = AlertEngine()
+    oregon, maine = "45.52,-122.68", "43.66,-70.26"
+    engine.add_rule(Rule(oregon, "temp", "gt", 30, rule_id="heat"))
+    assert engine.observe(_obs(1, 35, city="Portland", cid=maine)) == []
+    fired = engine.observe(_obs(1, 31, city="Portland", cid=oregon))
+    assert [(a["city_id"], a["city"]) for a in fired] == [(oregon, "Portland")]
+    assert engine.observe(_obs(2, 20, city="Portland", cid=maine)) == []
+    assert [a["rule_id"] for a in engine.active(oregon)] == ["heat"]
+    assert engine.active(maine) == []
+
+
+def test_any_city_band_rules_and_failing_callbacks():
+    engine = AlertEngine()
+    engine.subscribe(lambda alert: 1 / 0)
+    engine.add_rule(Rule("*", "wind_severity", "at_least", "STORM", rule_id="wind"))
+    lima = "-12.05,-77.04"
+    assert engine.observe(_obs(1, 10, wind_speed=2, city="Lima", cid=lima)) == []
+    fired = engine.observe(_obs(2, 10, wind_speed=30, city="Lima", cid=lima))
+    assert [a["city"] for a in fired] == ["Lima"]
+    assert engine.alerts_for(_obs(2, 10, wind_speed=30, city="Lima", cid=lima)) == engine.active(lima)
@@ -0,0 +1,38 @@
+import time
+
+import pytest
+
+from modules import api_handler
+
+
+@pytest.fixture
+def onecall_refused(monkeypatch, stub):
+    """A plan without One Call, with empty record caches."""
+    for cache in (api_handler.weather_cache, api_handler.forecast_cache, api_handler.alias_cache):
+        cache.clear()
+    monkeypatch.setattr(api_handler, "_onecall_refused", None)
+    monkeypatch.setattr(stub, "onecall", False)
+    stub.calls.clear()
+    return stub
+
+
+def test_refused_one_call_falls_back_to_two_calls(onecall_refused):
+    weather, forecast = api_handler.fetch_city("Berlin")
+    assert weather["city"] == "Berlin" and forecast
+    assert onecall_refused.calls["onecall"] == 1
+    assert onecall_refused.calls["weather"] == onecall_refused.calls["forecast"] == 1
+
+    api_handler.fetch_city("Madrid")                # not retried while refused
+    assert onecall_refused.calls["onecall"] == 1
+
+
+def test_one_call_is_retried_after_the_interval(monkeypatch, onecall_refused):
+    api_handler.fetch_city("Vienna")
+    assert not api_handler._onecall_available()
+    monkeypatch.setattr(api_handler, "_onecall_refused",
+                        time.monotonic() - api_handler.ONECALL_RETRY - 1)
+    onecall_refused.onecall = True                  # the plan was upgraded
+    weather, forecast = api_handler.fetch_city("Prague")
+    assert weather["city"] == "Prague" and forecast
+    assert onecall_refused.calls["onecall"] == 2
+    assert api_handler._onecall_available()
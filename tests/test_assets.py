@@ -0,0 +1,18 @@
+from modules import ui_components
+from tools import build_assets
+
+
+def test_stylesheet_never_loads_third_party_fonts(monkeypatch):
+    face = {"family": "Inter", "weight": 400, "file": "fonts/inter-400.0123456789.woff2",
+            "preload": True}
+    for assets in ({"sprite": "icons/sprite.svg"}, {"fonts": [face]}):
+        monkeypatch.setattr(ui_components, "_ASSETS", assets)
+        links, faces = ui_components._font_assets()
+        assert "googleapis" not in links + faces and "@import" not in faces
+    assert "app/static/fonts/inter-400.0123456789.woff2" in faces and "preload" in links
+
+
+def test_check_reports_every_unbuilt_face():
+    problems = build_assets.check({})
+    assert "icon sprite" in problems
+    assert sum(p.startswith("font ") for p in problems) == sum(map(len, build_assets.FONTS.values()))
@@ -0,0 +1,44 @@
+import time
+
+from modules.cache import InternTable, TTLCache
+
+
+def test_lru_entry_is_evicted_at_maxsize():
+    cache = TTLCache(ttl=60, maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1          # b is now least recently used
+    cache.set("c", 3)
+    assert "b" not in cache
+    assert [k for k, _, _ in cache.entries()] == ["a", "c"]
+
+
+def test_expired_entry_is_held_until_read():
+    cache = TTLCache(ttl=0.01, maxsize=4)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=60)
+    time.sleep(0.02)
+    assert [k for k, _, _ in cache.entries()] == ["b"]
+    assert [(k, expired) for k, _, expired in cache.held()] == [("a", True), ("b", False)]
+    assert cache.get("a", "gone") == "gone"
+    assert len(cache) == 1
+
+
+def test_intern_entry_goes_with_its_last_reference():
+    table = InternTable()
+    table.acquire("oslo", "v1")
+    table.acquire("oslo", "v2")         # refreshes the shared copy
+    assert table.get("oslo") == "v2" and table.refs("oslo") == 2
+    table.release("oslo")
+    assert "oslo" in table
+    table.release("oslo")
+    assert "oslo" not in table and len(table) == 0
+
+
+def test_queued_releases_apply_on_next_access():
+    table = InternTable()
+    table.acquire("rome", 1)
+    table.acquire("lima", 2)
+    table.release_later(["rome"])
+    assert table._data.keys() == {"rome", "lima"}   # nothing applied yet
+    assert table.held() == [("lima", 2, False)]
@@ -0,0 +1,55 @@
+import pytest
+
+from modules import decode
+from modules.decode import Field, Schema, SchemaDrift
+
+STEP = Schema("step", {"t": Field(("main", "temp"), float)})
+RECORD = Schema("record", {
+    "name": Field(("name",), str),
+    "temp": Field(("main", "temp"), float),
+    "deg": Field(("wind", "deg"), int, 0),
+    "rain": Field(("rain", "1h"), float, 0.0),
+    "steps": Field(("list",), STEP),
+})
+
+
+def _doc(**over) -> dict:
+    doc = {"name": "Oslo", "main": {"temp": 21}, "wind": {"speed": 3, "deg": 180},
+           "list": [{"main": {"temp": 1.5}}, {"main": {"temp": 2}}]}
+    doc.update(over)
+    return doc
+
+
+def test_projects_declared_fields_only():
+    assert RECORD.project(_doc()) == {
+        "name": "Oslo", "temp": 21, "deg": 180, "rain": 0.0,
+        "steps": [{"t": 1.5}, {"t": 2}],
+    }
+
+
+def test_missing_or_null_optional_fields_take_defaults():
+    out = RECORD.project(_doc(wind={"speed": 0, "deg": None}))
+    assert out["deg"] == 0 and out["rain"] == 0.0
+    assert RECORD.project(_doc(wind={}))["deg"] == 0
+
+
+def test_decode_parses_bytes():
+    assert STEP.decode(b'{"main": {"temp": 4}}') == {"t": 4}
+
+
+@pytest.mark.parametrize("doc, path, problem", [
+    (_doc(name=None), "name", "missing"),
+    (_doc(main={}), "main.temp", "missing"),
+    (_doc(main={"temp": "21"}), "main.temp", "expected int/float, got str"),
+    (_doc(main={"temp": True}), "main.temp", "expected int/float, got bool"),
+    (_doc(list={"main": {}}), "list", "expected list, got dict"),
+    (_doc(list=[{"main": {}}]), "main.temp", "missing"),
+])
+def test_drift_names_schema_and_path(doc, path, problem):
+    before = sum(decode.drift.values())
+    with pytest.raises(SchemaDrift) as err:
+        RECORD.project(doc)
+    assert err.value.path == path and err.value.problem == problem
+    assert sum(decode.drift.values()) == before + 1
+    assert any(r["path"] == path and r["problem"] == problem for r in decode.drift_report())
+
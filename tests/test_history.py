@@ -0,0 +1,47 @@
+import gc
+from pathlib import Path
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from modules import history
+from modules.history import History
+
+APP = Path(__file__).resolve().parent.parent / "app.py"
+
+
+def _record(name: str) -> dict:
+    return {"id": name.lower(), "city": name}
+
+
+@pytest.fixture(autouse=True)
+def _empty_table():
+    history.interned._data.clear()
+    yield
+    gc.collect()
+    history.interned._data.clear()
+
+
+def test_shared_entry_lives_until_its_last_history_lets_go():
+    a, b = History(size=2), History(size=2)
+    a.push(_record("Oslo"), None)
+    b.push(_record("Oslo"), None)
+    assert history.interned.refs("oslo") == 2
+    a.push(_record("Rome"), None)
+    a.push(_record("Lima"), None)       # Oslo falls off a
+    assert history.interned.refs("oslo") == 1
+    assert [w["city"] for w, _ in a.recent()] == ["Lima", "Rome"]
+    del b
+    gc.collect()
+    assert "oslo" not in history.interned
+    assert len(history.interned) == 2
+
+
+def test_dropped_session_releases_its_recent_cities():
+    at = AppTest.from_file(str(APP), default_timeout=30).run()
+    at.text_input[0].input("London").run()
+    assert not at.exception
+    assert len(history.interned) == 1
+    del at
+    gc.collect()
+    assert len(history.interned) == 0
@@ -0,0 +1,107 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from modules import latency
+
+
+class _Response:
+    """Enough of ``requests.Response`` for hedged_get."""
+
+    def __init__(self, body: str, status_code: int = 200) -> None:
+        self.body = body
+        self.status_code = status_code
+        self.ok = status_code < 400
+
+
+class _Upstream:
+    """Stands in for ``requests.get``: answers are taken in call order."""
+
+    def __init__(self, *answers) -> None:
+        self.answers = list(answers)     # (delay seconds, response or exception)
+        self.threads: list = []
+        self._lock = threading.Lock()
+
+    def __call__(self, url, params=None, timeout=None):
+        with self._lock:
+            delay, answer = self.answers.pop(0)
+            self.threads.append(threading.current_thread())
+        time.sleep(delay)
+        if isinstance(answer, BaseException):
+            raise answer
+        return answer if isinstance(answer, _Response) else _Response(answer)
+
+
+@pytest.fixture(autouse=True)
+def _no_page_budget():
+    token = latency._deadline.set(None)
+    yield
+    latency._deadline.reset(token)
+
+
+@pytest.fixture
+def stats(monkeypatch):
+    fresh = latency.LatencyHistogram(latency.LATENCY_WINDOW)
+    monkeypatch.setattr(latency, "stats", fresh)
+    monkeypatch.setattr(fresh, "hedge_delay", lambda endpoint: 0.05)
+    return fresh
+
+
+def test_cold_process_can_hedge(monkeypatch, stats):
+    monkeypatch.setattr(latency.requests, "get", _Upstream((1.0, "slow"), (0.0, "fast")))
+    assert latency.hedged_get("http://owm/weather", {}).body == "fast"
+    summary = stats.summary()["weather"]
+    assert summary["hedges"] == 1 and summary["hedge_wins"] == 1
+
+
+def test_fast_error_from_the_hedge_does_not_win(monkeypatch, stats):
+    monkeypatch.setattr(latency.requests, "get",
+                        _Upstream((0.3, "slow"), (0.0, _Response("busy", 503))))
+    assert latency.hedged_get("http://owm/weather", {}).body == "slow"
+    assert stats.summary()["weather"]["hedge_wins"] == 0
+
+
+def test_error_response_is_returned_when_nothing_succeeds(monkeypatch, stats):
+    monkeypatch.setattr(latency.requests, "get", _Upstream(
+        (0.1, _Response("first", 502)), (0.15, _Response("second", 503))))
+    resp = latency.hedged_get("http://owm/weather", {})
+    assert (resp.body, resp.status_code) == ("first", 502)
+
+
+def test_failed_attempts_count_towards_latency(monkeypatch, stats):
+    error = requests.exceptions.ConnectionError("refused")
+    monkeypatch.setattr(latency.requests, "get", _Upstream((0.01, error)))
+    with pytest.raises(requests.exceptions.ConnectionError):
+        latency.hedged_get("http://owm/weather", {})
+    assert stats.summary()["weather"]["n"] == 1
+
+
+def test_busy_pool_runs_on_the_callers_thread(monkeypatch, stats):
+    upstream = _Upstream((0.0, "ok"))
+    monkeypatch.setattr(latency.requests, "get", upstream)
+    monkeypatch.setattr(latency, "_idle", threading.BoundedSemaphore(1))
+    latency._idle.acquire()
+    assert latency.hedged_get("http://owm/weather", {}).body == "ok"
+    assert upstream.threads == [threading.current_thread()]
+    assert stats.summary()["weather"]["hedges"] == 0
+
+
+def test_exhausted_page_budget_fails_fast(monkeypatch, stats):
+    monkeypatch.setattr(latency.requests, "get", _Upstream())
+    latency.begin_page(budget=0.0)
+    with pytest.raises(requests.exceptions.Timeout, match="budget exhausted"):
+        latency.hedged_get("http://owm/weather", {})
+
+
+def test_calls_share_one_page_budget(monkeypatch, stats):
+    monkeypatch.setattr(stats, "allow_hedge", lambda endpoint: False)
+    monkeypatch.setattr(latency.requests, "get", _Upstream((0.15, "geo"), (2.0, "late")))
+    latency.begin_page(budget=0.3)
+    assert latency.hedged_get("http://owm/direct", {}).body == "geo"
+    assert latency.remaining() < 0.2
+    t0 = time.monotonic()
+    with pytest.raises(requests.exceptions.Timeout):
+        latency.hedged_get("http://owm/onecall", {})
+    assert time.monotonic() - t0 < 0.5          # the rest of the budget, not 2 s
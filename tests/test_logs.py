@@ -0,0 +1,36 @@
+import logging
+import queue
+
+from modules import logs
+
+
+def _record(msg: str) -> logging.LogRecord:
+    return logging.LogRecord("test", logging.INFO, __file__, 0, msg, (), None)
+
+
+def test_full_queue_drops_and_then_reports_the_count():
+    handler = logs._Handler(queue.Queue(maxsize=2))
+    for i in range(4):
+        handler.enqueue(_record(f"r{i}"))
+    assert handler.dropped == 2
+    assert [handler.queue.get_nowait().getMessage() for _ in range(2)] == ["r0", "r1"]
+
+    handler.enqueue(_record("r4"))                  # room again
+    assert [handler.queue.get_nowait().getMessage() for _ in range(2)] == [
+        "r4", "Log queue full: dropped 2 records",
+    ]
+    handler.enqueue(_record("r5"))                  # reported once
+    assert handler.queue.qsize() == 1 and handler.dropped == 2
+
+
+def test_report_that_does_not_fit_is_kept_for_later():
+    handler = logs._Handler(queue.Queue(maxsize=2))
+    for i in range(3):
+        handler.enqueue(_record(f"r{i}"))           # r2 dropped
+    handler.queue.get_nowait()
+    handler.enqueue(_record("r3"))                  # fills the queue again
+    assert [handler.queue.get_nowait().getMessage() for _ in range(2)] == ["r1", "r3"]
+    handler.enqueue(_record("r4"))
+    assert [handler.queue.get_nowait().getMessage() for _ in range(2)] == [
+        "r4", "Log queue full: dropped 1 records",
+    ]
@@ -0,0 +1,43 @@
+import logging
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+from streamlit.runtime.memory_uploaded_file_manager import MemoryUploadedFileManager
+from streamlit.runtime.runtime import Runtime, RuntimeConfig
+from streamlit.runtime.session_manager import SessionInfo
+
+from modules import memory
+
+APP = Path(__file__).resolve().parent.parent / "app.py"
+
+
+@pytest.fixture
+def server_runtime():
+    """A real (unstarted) Streamlit Runtime, as ``streamlit run`` creates."""
+    rt = Runtime(RuntimeConfig(
+        script_path=str(APP), media_file_storage=MemoryMediaFileStorage("/media"),
+        uploaded_file_manager=MemoryUploadedFileManager("/upload"),
+    ))
+    yield rt
+    Runtime._instance = None
+
+
+def test_sessions_are_listed_through_the_runtime(monkeypatch, server_runtime):
+    # Pins the private API memory relies on: Runtime._session_mgr and
+    # SessionInfo.session.session_state. Fails loudly if Streamlit moves them.
+    state = {"history": ["Oslo"]}
+    infos = [SessionInfo(client=None, session=SimpleNamespace(session_state=state))]
+    monkeypatch.setattr(server_runtime._session_mgr, "list_sessions", lambda: infos)
+    assert memory._session_states() == [state]
+
+
+def test_missing_session_manager_is_logged_once(monkeypatch, server_runtime, caplog):
+    monkeypatch.delattr(server_runtime, "_session_mgr")
+    monkeypatch.setattr(memory, "_no_session_mgr_logged", False)
+    with caplog.at_level(logging.WARNING, logger="modules.memory"):
+        assert memory._session_states() == []
+        assert memory._session_states() == []
+    logged = [r.getMessage() for r in caplog.records if r.name == "modules.memory"]
+    assert len(logged) == 1 and "Runtime._session_mgr" in logged[0]
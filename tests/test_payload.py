@@ -0,0 +1,64 @@
+from pathlib import Path
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+import config
+from config import GRID_PAGE_SIZE, PAYLOAD_BUDGETS
+from modules import payload
+
+APP = Path(__file__).resolve().parent.parent / "app.py"
+
+
+@pytest.fixture
+def strict(monkeypatch):
+    """STORM_PAYLOAD_STRICT=1: any section over budget raises in the rerun."""
+    monkeypatch.setattr(payload, "PAYLOAD_STRICT", True)
+    payload.stats.reset()
+    yield
+    payload.stats.reset()
+
+
+def test_pages_fit_their_budgets(monkeypatch, strict):
+    monkeypatch.setattr(config, "WATCHLIST", [f"Watch {i}" for i in range(GRID_PAGE_SIZE * 2)])
+    at = AppTest.from_file(str(APP), default_timeout=30).run()
+    assert not at.exception                 # home: css and a full grid page
+    at.text_input[0].input("London").run()
+    assert not at.exception                 # city: hero, metrics, forecast
+    sizes = payload.stats.summary()
+    for name in ("css", "hero", "metrics", "forecast", "grid", "total"):
+        assert sizes[name]["max"] <= PAYLOAD_BUDGETS[name], name
+
+
+def test_strict_mode_raises_over_budget(strict):
+    @payload.section("hero")
+    def render_hero():
+        payload.record("x" * (PAYLOAD_BUDGETS["hero"] + 1))
+
+    payload.begin_rerun()
+    render_hero()
+    with pytest.raises(payload.PayloadBudgetExceeded, match="hero="):
+        payload.end_rerun()
+
+
+def test_searching_status_is_counted(monkeypatch, strict, stub):
+    monkeypatch.setattr(config, "LIVE_SEARCH", True)
+    monkeypatch.setattr(stub, "latency", 0.3)       # a few status frames
+    at = AppTest.from_file(str(APP), default_timeout=30)
+    at.query_params["city"] = "Reykjavik"
+    at.run()
+    assert not at.exception
+    assert payload.stats.summary()["search"]["max"] > 0
+
+
+def test_fragment_rerun_is_measured_on_its_own(monkeypatch, strict):
+    from modules import live
+
+    monkeypatch.setattr(live, "_draw", lambda city, units: payload.record("x" * 100))
+    live._tick("Oslo", "metric")                    # a fragment rerun
+    assert payload.stats.reruns == 1
+    payload.begin_rerun()                           # a tick inside a full rerun
+    live._tick("Oslo", "metric")
+    assert payload.stats.reruns == 1
+    payload.end_rerun()
+    assert payload.stats.reruns == 2
@@ -0,0 +1,81 @@
+import threading
+from concurrent.futures import Future
+
+import pytest
+
+from modules import search
+
+
+class _InlinePool:
+    """Runs lookups on submit, so the future is already done when returned."""
+
+    def submit(self, fn, *args):
+        fut = Future()
+        fut.set_result(fn(*args))
+        return fut
+
+
+class _IdlePool:
+    """Never starts lookups, so every future can still be cancelled."""
+
+    def submit(self, fn, *args):
+        return Future()
+
+
+def _within(fn, timeout: float = 5.0) -> None:
+    t = threading.Thread(target=fn, daemon=True)
+    t.start()
+    t.join(timeout)
+    assert not t.is_alive(), "deadlocked on the in-flight lock"
+
+
+@pytest.fixture(autouse=True)
+def _clean_inflight():
+    search._inflight.clear()
+    yield
+    search._inflight.clear()
+
+
+def test_repeated_negative_cached_query_does_not_deadlock(monkeypatch):
+    # A negative-cache hit answers without I/O: the lookup is finished before
+    # its done-callback is registered.
+    monkeypatch.setattr(search, "_pool", _InlinePool())
+    monkeypatch.setattr(search, "fetch_city", lambda query: None)
+    live = search.LiveSearch()
+
+    def lookups():
+        for _ in range(3):
+            gen = live.submit("Nowhereville")
+            assert live.wait(gen, timeout=1) is None
+
+    _within(lookups)
+    assert search._inflight == {}
+
+
+def test_superseded_lookup_is_cancelled_and_forgotten(monkeypatch):
+    monkeypatch.setattr(search, "_pool", _IdlePool())
+    live = search.LiveSearch()
+
+    def lookups():
+        live.submit("Lon")
+        live.submit("London")
+
+    _within(lookups)
+    assert list(search._inflight) == ["london"]
+
+
+def test_sessions_share_one_lookup(monkeypatch):
+    monkeypatch.setattr(search, "_pool", _IdlePool())
+    a, b = search.LiveSearch(), search.LiveSearch()
+    a.submit("Paris")
+    b.submit("  paris ")
+    assert a._future is b._future
+    assert search._inflight["paris"][1] == 2
+
+
+def test_searching_status_escapes_the_query():
+    from modules.ui_components import searching_html
+
+    status = searching_html('<img src=x onerror="alert(1)">', 1)
+    assert "<img" not in status
+    assert "&lt;img src=x onerror=&quot;alert(1)&quot;&gt;" in status
@@ -0,0 +1,35 @@
+import pytest
+
+from modules import snapshot
+from modules.cache import TTLCache
+
+
+@pytest.fixture
+def caches(monkeypatch):
+    fresh = {"weather": TTLCache(600, 8), "geo": TTLCache(3600, 8)}
+    monkeypatch.setattr(snapshot, "CACHES", fresh)
+    return fresh
+
+
+def test_round_trip_restores_live_entries(tmp_path, caches):
+    path = str(tmp_path / "snap.bin")
+    record = {"city": "Oslo", "coord": (59.9, 10.7), "days": [{"t": 1}]}
+    caches["weather"].set("oslo", record)
+    caches["geo"].set("oslo", {"lat": 59.9, "lon": 10.7}, ttl=30)
+    caches["geo"].set("gone", {"lat": 0, "lon": 0}, ttl=-1)     # already expired
+    assert snapshot.export_snapshot(path) == 2
+
+    for c in caches.values():
+        c.clear()
+    assert snapshot.load_snapshot(path) == 2
+    assert caches["weather"].get("oslo") == record     # tuples survive
+    (key, _, left), = caches["geo"].entries()
+    assert key == "oslo" and left <= 30                 # remaining TTL kept
+
+
+def test_missing_and_foreign_files(tmp_path, caches):
+    assert snapshot.load_snapshot(str(tmp_path / "none.bin")) == 0
+    bogus = tmp_path / "bogus.bin"
+    bogus.write_bytes(b"NOTASNAP" + bytes(16))
+    with pytest.raises(snapshot.SnapshotError):
+        snapshot.load_snapshot(str(bogus))
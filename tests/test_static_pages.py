@@ -0,0 +1,21 @@
+from modules import static_pages
+from modules.api_handler import fetch_city
+from modules.ui_components import current_weather_html
+
+
+def test_unchanged_records_leave_pages_untouched(tmp_path):
+    cities = ["London", "Tokyo"]
+    first = static_pages.refresh(cities, str(tmp_path))
+    assert set(first.values()) == {"written"}
+    mtimes = {p.name: p.stat().st_mtime_ns for p in tmp_path.iterdir()}
+    # Same cached records, so the same bytes: ETags and 304s keep working.
+    assert set(static_pages.refresh(cities, str(tmp_path)).values()) == {"unchanged"}
+    assert {p.name: p.stat().st_mtime_ns for p in tmp_path.iterdir()} == mtimes
+
+
+def test_upstream_strings_are_escaped():
+    weather, _ = fetch_city("London")
+    hostile = dict(weather, city="<script>x()</script>", description='"><img src=x>')
+    page = current_weather_html(hostile, at=weather["dt"])
+    assert "<script>" not in page and "<img" not in page
+    assert "&lt;script&gt;" in page
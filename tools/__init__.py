@@ -0,0 +1 @@
+"""Storm v2 — Tools."""
@@ -0,0 +1,177 @@
+"""
+Build Assets — self-hosted fonts and the weather icon sprite.
+
+Writes content-hashed, long-cacheable files under ``static/`` (served by
+Streamlit at ``/app/static/``) and a ``static/assets.json`` manifest that
+``ui_components`` reads to emit ``@font-face`` rules, preload hints and
+sprite references. Nothing is fetched at page load.
+
+    python -m tools.build_assets            # icons + fonts
+    python -m tools.build_assets --icons    # icons only (offline)
+    python -m tools.build_assets --check    # fail unless every asset is built
+
+Fonts are downloaded once from Google Fonts at build time (latin block only)
+and, when fontTools is installed, further subset to the glyphs the UI uses.
+The build is a required deploy step: it fails rather than write a manifest
+missing a face, and ``--check`` fails a deploy whose manifest lacks one.
+"""
+import argparse
+import hashlib
+import io
+import json
+import re
+import sys
+import urllib.request
+from pathlib import Path
+from xml.etree import ElementTree
+
+ROOT = Path(__file__).resolve().parent.parent
+ICON_SRC = ROOT / "assets" / "weather_icons"
+STATIC = ROOT / "static"
+MANIFEST = STATIC / "assets.json"
+
+FONTS = {
+    "Inter": (300, 400, 500, 600),
+    "JetBrains Mono": (400, 500, 700),
+    "Space Grotesk": (500, 700),
+}
+# Weights rendered above the fold; these get <link rel="preload">.
+PRELOAD = {("Inter", 400), ("JetBrains Mono", 400), ("Space Grotesk", 700)}
+# Basic Latin, Latin-1, general punctuation, arrows/triangles and degree signs.
+UNICODES = "U+0020-007E,U+00A0-00FF,U+2000-206F,U+2190-21FF,U+25A0-25FF,U+2103,U+2109"
+_CSS_API = "https://fonts.googleapis.com/css2?family={family}:wght@{weights}&display=swap"
+# A modern UA makes the CSS API answer with woff2 sources.
+_UA = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/120 Safari/537.36"
+# OWM icon codes; day/night share a glyph except for clear sky and few clouds.
+ICON_CODES = [f"{n:02d}{t}" for n in (1, 2, 3, 4, 9, 10, 11, 13, 50) for t in "dn"]
+_SVG_NS = "http://www.w3.org/2000/svg"
+
+
+def _hashed(name: str, data: bytes) -> str:
+    stem, _, ext = name.rpartition(".")
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:10]}.{ext}"
+
+
+def _write(subdir: str, name: str, data: bytes) -> str:
+    out = STATIC / subdir
+    out.mkdir(parents=True, exist_ok=True)
+    for stale in out.glob(name.rpartition(".")[0] + ".*." + name.rpartition(".")[2]):
+        stale.unlink()
+    fname = _hashed(name, data)
+    (out / fname).write_bytes(data)
+    return f"{subdir}/{fname}"
+
+
+def build_sprite() -> str:
+    """Combine ``assets/weather_icons/*.svg`` into one ``<symbol>`` sprite."""
+    ElementTree.register_namespace("", _SVG_NS)
+    sources = {p.stem: p for p in ICON_SRC.glob("*.svg")}
+    symbols = []
+    for code in ICON_CODES:
+        src = sources.get(code) or sources.get(code[:2])
+        if src is None:
+            raise SystemExit(f"no icon for {code} in {ICON_SRC}")
+        svg = ElementTree.parse(src).getroot()
+        attrs = " ".join(
+            f'{k}="{v}"' for k, v in svg.attrib.items()
+            if k in ("viewBox", "fill", "stroke", "stroke-width",
+                     "stroke-linecap", "stroke-linejoin")
+        )
+        body = "".join(
+            ElementTree.tostring(child, encoding="unicode").replace(f' xmlns="{_SVG_NS}"', "")
+            for child in svg
+        )
+        body = re.sub(r">\s+<", "><", body).strip()
+        symbols.append(f'<symbol id="wx-{code}" {attrs}>{body}</symbol>')
+    sprite = f'<svg xmlns="{_SVG_NS}">{"".join(symbols)}</svg>\n'
+    return _write("icons", "sprite.svg", sprite.encode())
+
+
+def _fetch(url: str) -> bytes:
+    req = urllib.request.Request(url, headers={"User-Agent": _UA})
+    with urllib.request.urlopen(req, timeout=30) as resp:
+        return resp.read()
+
+
+def _subset(data: bytes) -> bytes:
+    try:
+        from fontTools import subset
+    except ImportError:
+        return data
+    opts = subset.Options()
+    opts.flavor = "woff2"
+    opts.layout_features = ["kern", "liga", "tnum"]
+    font = subset.load_font(io.BytesIO(data), opts)
+    sub = subset.Subsetter(opts)
+    sub.populate(unicodes=subset.parse_unicodes(UNICODES))
+    sub.subset(font)
+    out = io.BytesIO()
+    subset.save_font(font, out, opts)
+    return out.getvalue()
+
+
+def build_fonts() -> list:
+    """Download the latin woff2 files for each family/weight and subset them."""
+    faces = []
+    for family, weights in FONTS.items():
+        css = _fetch(_CSS_API.format(
+            family=family.replace(" ", "+"), weights=";".join(map(str, weights)),
+        )).decode()
+        # Each @font-face block is preceded by a /* subset */ comment.
+        for block in re.finditer(r"/\* latin \*/\s*@font-face\s*{([^}]*)}", css):
+            rule = block.group(1)
+            weight = int(re.search(r"font-weight:\s*(\d+)", rule).group(1))
+            src = re.search(r"url\((https://[^)]+\.woff2)\)", rule).group(1)
+            data = _subset(_fetch(src))
+            slug = family.lower().replace(" ", "-")
+            faces.append({
+                "family": family, "weight": weight,
+                "file": _write("fonts", f"{slug}-{weight}.woff2", data),
+                "preload": (family, weight) in PRELOAD,
+            })
+    missing = _missing_faces(faces)
+    if missing:
+        raise SystemExit(f"Google Fonts returned no latin woff2 for: {', '.join(missing)}")
+    return faces
+
+
+def _missing_faces(faces: list) -> list:
+    built = {(f["family"], f["weight"]) for f in faces if (STATIC / f["file"]).exists()}
+    return [f"{family} {w}" for family, weights in FONTS.items()
+            for w in weights if (family, w) not in built]
+
+
+def check(manifest: dict) -> list:
+    """Problems that would make the app fall back; empty when fully built."""
+    problems = []
+    sprite = manifest.get("sprite")
+    if not sprite or not (STATIC / sprite).exists():
+        problems.append("icon sprite")
+    problems += [f"font {face}" for face in _missing_faces(manifest.get("fonts", []))]
+    return problems
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    ap.add_argument("--icons", action="store_true", help="rebuild the sprite only")
+    ap.add_argument("--check", action="store_true", help="verify the manifest; build nothing")
+    args = ap.parse_args()
+    manifest = json.loads(MANIFEST.read_text()) if MANIFEST.exists() else {}
+    if args.check:
+        problems = check(manifest)
+        if problems:
+            sys.exit(f"not built: {', '.join(problems)} — run python -m tools.build_assets")
+        print(f"{MANIFEST.relative_to(ROOT)}: all assets built")
+        return
+    manifest["sprite"] = build_sprite()
+    if not args.icons:
+        manifest["fonts"] = build_fonts()
+    MANIFEST.parent.mkdir(parents=True, exist_ok=True)
+    MANIFEST.write_text(json.dumps(manifest, indent=2) + "\n")
+    print(f"sprite -> static/{manifest['sprite']}")
+    for face in manifest.get("fonts", []):
+        print(f"font   -> static/{face['file']}")
+
+
+if __name__ == "__main__":
+    main()
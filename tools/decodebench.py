@@ -0,0 +1,117 @@
+"""
+Decode Bench — parse time and allocations for upstream payloads.
+
+Compares, on payloads from the local OWM stub:
+
+* ``json``     — stdlib ``json.loads`` of the decoded text, the whole tree
+  kept (what ``resp.json()`` did before ``modules.decode``);
+* ``json+proj`` — the same parse, projected through the app's schema;
+* ``fast+proj`` — ``modules.decode.loads`` on the raw bytes (``orjson``
+  when installed) plus the projection — the path the app now takes.
+
+Payloads: the 40-step 5-day forecast, a One Call response, and a batch of
+current-weather responses (one watch-list page). For each: best time per
+payload, peak traced memory while decoding, and memory blocks still held by
+the result.
+
+    python -m tools.decodebench
+    python -m tools.decodebench --batch 48 --repeat 9 --json
+"""
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+
+from config import GRID_PAGE_SIZE
+from modules import decode
+from modules.api_handler import CURRENT, FORECAST, ONECALL
+from tools.owm_stub import current_payload, forecast_payload, onecall_payload
+
+
+def _payloads(batch: int) -> dict:
+    now = int(time.time())
+    return {
+        "forecast (40 steps)": (FORECAST, [json.dumps(forecast_payload("London", now)).encode()]),
+        "onecall": (ONECALL, [json.dumps(onecall_payload("London", now)).encode()]),
+        f"current x{batch} (batch)": (
+            CURRENT, [json.dumps(current_payload(f"City{i}", now)).encode() for i in range(batch)],
+        ),
+    }
+
+
+def _variants(schema) -> dict:
+    return {
+        "json": lambda raw: json.loads(raw.decode("utf-8")),
+        "json+proj": lambda raw: schema.project(json.loads(raw.decode("utf-8"))),
+        "fast+proj": lambda raw: schema.project(decode.loads(raw)),
+    }
+
+
+def _time_us(fn, raws: list, repeat: int) -> float:
+    """Best-of-``repeat`` microseconds per payload, GC off (as timeit does)."""
+    loops = max(1, 2000 // len(raws))
+    runs = []
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            for _ in range(loops):
+                for raw in raws:
+                    fn(raw)
+            runs.append((time.perf_counter() - t0) / (loops * len(raws)) * 1e6)
+    finally:
+        gc.enable()
+    return min(runs)
+
+
+def _memory(fn, raws: list) -> tuple:
+    """``(peak KB while decoding, blocks held by the results)`` per payload."""
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+    tracemalloc.start()
+    held = [fn(raw) for raw in raws]
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    gc.collect()
+    retained = sys.getallocatedblocks() - blocks
+    del held
+    return peak / 1024 / len(raws), retained / len(raws)
+
+
+def run(batch: int, repeat: int) -> list:
+    rows = []
+    for label, (schema, raws) in _payloads(batch).items():
+        size = sum(len(r) for r in raws) / len(raws)
+        for name, fn in _variants(schema).items():
+            fn(raws[0])     # warm-up
+            peak_kb, blocks = _memory(fn, raws)
+            rows.append({
+                "payload": label, "bytes": round(size), "variant": name,
+                "us": round(_time_us(fn, raws, repeat), 1),
+                "peak_kb": round(peak_kb, 1), "blocks_held": round(blocks),
+            })
+    return rows
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    ap.add_argument("--batch", type=int, default=GRID_PAGE_SIZE, help="payloads per batch")
+    ap.add_argument("--repeat", type=int, default=5, help="timing runs (best of)")
+    ap.add_argument("--json", action="store_true", help="print the rows as JSON")
+    args = ap.parse_args()
+
+    rows = run(args.batch, args.repeat)
+    if args.json:
+        print(json.dumps({"parser": decode.PARSER, "rows": rows}, indent=2))
+        return
+    print(f"fast parser: {decode.PARSER}\n")
+    print(f"{'payload':<22} {'variant':<10} {'µs/payload':>11} {'peak KB':>9} {'blocks held':>12}")
+    for r in rows:
+        print(f"{r['payload']:<22} {r['variant']:<10} {r['us']:>11.1f} "
+              f"{r['peak_kb']:>9.1f} {r['blocks_held']:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Import Time — cold-start import cost of app.py, checked against a budget.
+
+A cold process pays for every import before the first paint. This tool runs
+app.py's import statements in fresh interpreters, in two phases:
+
+* **shell** — everything app.py imports before its ``Deferred Imports``
+  section, i.e. what stands between a new session and the header and search
+  bar;
+* **deferred** — the rest (network stack, caches, numpy), reported only.
+
+Streamlit itself is imported first and not counted: the server has already
+paid for it before any script runs. The median over ``--runs`` processes is
+compared with ``IMPORT_BUDGET_MS``; over budget exits 1, so CI can gate on
+it. The largest shell imports (from ``-X importtime``) are listed to show
+what to defer next.
+
+    python -m tools.importtime
+    python -m tools.importtime --runs 9 --budget 120
+"""
+import argparse
+import ast
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+from config import IMPORT_BUDGET_MS
+
+ROOT = Path(__file__).resolve().parent.parent
+APP = ROOT / "app.py"
+MARKER = "# ── Deferred Imports ──"
+PHASE = "-- storm importtime phase --"
+
+_CHILD = """
+import sys, time, json
+sys.path.insert(0, {root!r})
+import streamlit
+print({phase!r}, file=sys.stderr, flush=True)
+t0 = time.perf_counter()
+exec({shell!r})
+t1 = time.perf_counter()
+print({phase!r}, file=sys.stderr, flush=True)
+exec({deferred!r})
+t2 = time.perf_counter()
+print(json.dumps({{"shell_ms": (t1 - t0) * 1e3, "deferred_ms": (t2 - t1) * 1e3}}))
+"""
+
+
+def split_imports(path: Path = APP) -> tuple:
+    """``(shell, deferred)`` source of app.py's top-level imports, streamlit excluded."""
+    source = path.read_text()
+    lines = source.splitlines()
+    cut = next((i + 1 for i, line in enumerate(lines) if line.strip() == MARKER), len(lines) + 1)
+    shell, deferred = [], []
+    for node in ast.parse(source).body:
+        if not isinstance(node, (ast.Import, ast.ImportFrom)):
+            continue
+        if isinstance(node, ast.Import) and all(a.name == "streamlit" for a in node.names):
+            continue
+        (shell if node.lineno < cut else deferred).append(ast.unparse(node))
+    return "\n".join(shell), "\n".join(deferred)
+
+
+def _child(shell: str, deferred: str, trace: bool) -> subprocess.CompletedProcess:
+    code = _CHILD.format(root=str(ROOT), shell=shell, deferred=deferred, phase=PHASE)
+    cmd = [sys.executable] + (["-X", "importtime"] if trace else []) + ["-c", code]
+    out = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True, timeout=120)
+    if out.returncode != 0:
+        raise SystemExit(f"import failed:\n{out.stderr[-2000:]}")
+    return out
+
+
+def _offenders(stderr: str, top: int) -> list:
+    """Largest cumulative top-level imports of the shell phase."""
+    rows = []
+    for line in stderr.split(PHASE)[1].splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = (p.strip() for p in line[len("import time:"):].split("|"))
+        if not cumulative.isdigit():
+            continue        # the header row
+        # -X importtime indents nested imports by two spaces per level.
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        rows.append({"module": name.strip(), "depth": depth, "ms": int(cumulative) / 1e3})
+    shallowest = min((r["depth"] for r in rows), default=0)
+    rows = [r for r in rows if r["depth"] <= shallowest + 1]
+    return sorted(rows, key=lambda r: r["ms"], reverse=True)[:top]
+
+
+def measure(runs: int = 5, top: int = 10) -> dict:
+    shell, deferred = split_imports()
+    timings = [json.loads(_child(shell, deferred, trace=False).stdout.strip().splitlines()[-1])
+               for _ in range(runs)]
+    return {
+        "runs": runs,
+        "shell_ms": round(statistics.median(t["shell_ms"] for t in timings), 1),
+        "deferred_ms": round(statistics.median(t["deferred_ms"] for t in timings), 1),
+        "shell_imports": shell.splitlines(),
+        "offenders": _offenders(_child(shell, deferred, trace=True).stderr, top),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    ap.add_argument("--runs", type=int, default=5, help="fresh processes to time")
+    ap.add_argument("--budget", type=float, default=IMPORT_BUDGET_MS, help="shell budget (ms)")
+    ap.add_argument("--top", type=int, default=10, help="largest shell imports to list")
+    ap.add_argument("--json", action="store_true", help="print the result as JSON")
+    args = ap.parse_args()
+
+    result = measure(args.runs, args.top)
+    result["budget_ms"] = args.budget
+    result["ok"] = result["shell_ms"] <= args.budget
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"shell     {result['shell_ms']:>8.1f} ms   (budget {args.budget:.0f} ms, "
+              f"median of {args.runs})")
+        print(f"deferred  {result['deferred_ms']:>8.1f} ms")
+        print("\nlargest shell imports (cumulative, -X importtime):")
+        for r in result["offenders"]:
+            print(f"  {r['ms']:>8.1f} ms  {'  ' * r['depth']}{r['module']}")
+        print("\nOK" if result["ok"] else "\nFAIL: startup imports over budget")
+    sys.exit(0 if result["ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
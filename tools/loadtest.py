@@ -0,0 +1,438 @@
+"""
+Load Test — concurrent sessions against a real ``streamlit run`` server.
+
+The tool starts ``streamlit run app.py`` on a free port with OpenWeatherMap
+replaced by the local stub, then opens one websocket per simulated user on
+``/_stcore/stream`` and speaks the browser's protocol: each action is a
+``rerun_script`` BackMsg carrying the session's widget states, timed until
+the server's ``script_finished``. Sessions run a weighted mix of chip
+clicks, searches (including misspellings) and unit switches.
+
+Measured from outside the server, as a browser would see it: rerun latency
+percentiles, bytes on the wire per rerun, exception elements (errors), and
+the server process's CPU and RSS from ``/proc``. The stub counts upstream
+calls per endpoint. The server's JSON log (stderr) supplies the rest:
+per-endpoint upstream latency from the ``upstream`` records, hedges as stub
+calls beyond those records, the memory monitor's last sample and every
+warning or error by message. ``--payload-strict`` makes budget overruns
+raise in the app, so they count as errors; ``--stub-tail-ms`` and
+``--stub-tail-rate`` inject slow upstream responses.
+
+Results are written as JSON under ``loadtest_results/`` so capacity can be
+compared between releases; the server log is kept next to them.
+
+    python -m tools.loadtest --sessions 20 --actions 30 --stub-latency-ms 200
+    python -m tools.loadtest --sessions 50 --baseline loadtest_results/<prev>.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+
+from tools.owm_stub import serve
+
+ROOT = Path(__file__).resolve().parent.parent
+APP = ROOT / "app.py"
+DEFAULT_MIX = "chip=0.6,search=0.3,units=0.1"
+PERCENTILES = (50, 90, 95, 99)
+MEMORY_INTERVAL_S = 2       # server-side sampling while the test runs
+
+
+def _percentile(sorted_vals: list, pct: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    k = max(0, min(len(sorted_vals) - 1, round(pct / 100 * len(sorted_vals) + 0.5) - 1))
+    return sorted_vals[k]
+
+
+def _summary(vals: list, scale: float = 1.0, digits: int = 2) -> dict:
+    vals = sorted(v * scale for v in vals)
+    out = {f"p{p}": round(_percentile(vals, p), digits) for p in PERCENTILES}
+    out["max"] = round(vals[-1], digits) if vals else 0.0
+    out["n"] = len(vals)
+    return out
+
+
+def _git_rev() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+            capture_output=True, text=True, timeout=5,
+        )
+        return out.stdout.strip() or "unknown"
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+
+
+def _parse_mix(spec: str) -> dict:
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight)
+    unknown = set(mix) - {"chip", "search", "units"}
+    if unknown:
+        raise SystemExit(f"unknown actions in --mix: {', '.join(sorted(unknown))}")
+    return mix
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+# ── Server ──
+class Server:
+    """``streamlit run app.py`` in a child process, logging JSON to a file."""
+
+    def __init__(self, args: argparse.Namespace, stub_url: str, log_path: Path) -> None:
+        self.port = _free_port()
+        self.log_path = log_path
+        env = dict(
+            os.environ,
+            STORM_OWM_HOST=stub_url,
+            OPENWEATHER_API_KEY=os.environ.get("OPENWEATHER_API_KEY", "stub"),
+            STORM_MEMORY_INTERVAL=str(MEMORY_INTERVAL_S),
+            STORM_LOG_FORMAT="json",
+        )
+        if args.payload_strict:
+            env["STORM_PAYLOAD_STRICT"] = "1"
+        self._log = open(log_path, "w")
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", "streamlit", "run", str(APP),
+             "--server.port", str(self.port), "--server.address", "127.0.0.1",
+             "--server.headless", "true", "--server.fileWatcherType", "none",
+             "--browser.gatherUsageStats", "false"],
+            cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=self._log,
+        )
+        self.url = f"ws://127.0.0.1:{self.port}/_stcore/stream"
+
+    def wait_ready(self, timeout: float = 60.0) -> None:
+        health = f"http://127.0.0.1:{self.port}/_stcore/health"
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.proc.poll() is not None:
+                raise SystemExit(f"server exited with {self.proc.returncode}; see {self.log_path}")
+            try:
+                with urllib.request.urlopen(health, timeout=1) as resp:
+                    if resp.status == 200:
+                        return
+            except OSError:
+                time.sleep(0.2)
+        raise SystemExit(f"server not ready after {timeout:.0f}s; see {self.log_path}")
+
+    def cpu_s(self) -> float:
+        """User + system CPU seconds of the server process (Linux ``/proc``)."""
+        with open(f"/proc/{self.proc.pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+    def rss_bytes(self) -> int:
+        with open(f"/proc/{self.proc.pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+    def stop(self) -> None:
+        self.proc.terminate()
+        try:
+            self.proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+        self._log.close()
+
+
+def _read_log(path: Path) -> dict:
+    """Upstream latency, last memory sample and warnings/errors from the server log."""
+    upstream: dict = {}
+    problems: Counter = Counter()
+    memory = None
+    for line in path.read_text(errors="replace").splitlines():
+        try:
+            rec = json.loads(line)
+        except ValueError:
+            continue            # Streamlit's own banner lines are not JSON
+        if not isinstance(rec, dict) or "msg" not in rec:
+            continue
+        if rec.get("logger") == "modules.api_handler" and "latency_ms" in rec:
+            upstream.setdefault(rec["endpoint"], []).append(rec["latency_ms"])
+        elif rec.get("logger") == "modules.memory" and rec["msg"].startswith("Memory: "):
+            memory = rec["msg"]
+        if rec.get("level") in ("WARNING", "ERROR", "CRITICAL"):
+            # Group by message template: the text before the first ":".
+            problems[f"{rec['level']} {rec['msg'].split(':', 1)[0]}"] += 1 + rec.get("suppressed", 0)
+    return {"upstream": upstream, "memory": memory, "problems": problems}
+
+
+# ── Sessions ──
+class Session:
+    """One simulated browser tab: a websocket plus a seeded action stream."""
+
+    def __init__(self, idx: int, args: argparse.Namespace, mix: dict) -> None:
+        from config import POPULAR_CITIES
+
+        self.rng = random.Random(args.seed + idx)
+        self.args = args
+        self.chips = POPULAR_CITIES
+        self.actions = list(mix)
+        self.weights = [mix[a] for a in self.actions]
+        self.ws = None
+        self.widgets: dict = {}     # key or type -> (element type, proto)
+        self.values: dict = {}      # widget id -> WidgetState, sent on every rerun
+        self.samples: list = []     # (action, seconds, bytes)
+        self.errors = 0
+
+    async def connect(self, url: str) -> None:
+        import websockets
+
+        self.ws = await websockets.connect(url, subprotocols=["streamlit"], max_size=None)
+        await self.rerun()
+
+    async def close(self) -> None:
+        if self.ws is not None:
+            await self.ws.close()
+
+    async def rerun(self, trigger=None) -> tuple:
+        """Send ``rerun_script``; ``(seconds, bytes)`` until ``script_finished``."""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        states = msg.rerun_script.widget_states.widgets
+        states.extend(self.values.values())
+        if trigger is not None:
+            states.append(trigger)
+        t0 = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        received, seen = 0, {}
+        while True:
+            raw = await asyncio.wait_for(self.ws.recv(), self.args.timeout)
+            received += len(raw)
+            fwd = ForwardMsg()
+            fwd.ParseFromString(raw)
+            kind = fwd.WhichOneof("type")
+            if kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                el = fwd.delta.new_element
+                etype = el.WhichOneof("type")
+                if etype == "exception":
+                    self.errors += 1
+                elif etype in ("button", "text_input", "radio"):
+                    proto = getattr(el, etype)
+                    # Widget ids are "$$ID-<hash>-<key>", key "None" when unset.
+                    key = proto.id.split("-", 2)[-1]
+                    seen[etype if key == "None" else key] = (etype, proto)
+            elif kind == "script_finished":
+                if fwd.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    self.errors += 1
+                break
+        self.widgets = seen
+        return time.perf_counter() - t0, received
+
+    def _search_term(self) -> str:
+        if self.rng.random() < self.args.typo_rate:
+            return f"zz{self.rng.randrange(10_000)}"
+        return f"Stubville {self.rng.randrange(self.args.city_pool)}"
+
+    def _state(self, widget_id: str):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        return WidgetState(id=widget_id)
+
+    async def step(self) -> None:
+        action = self.rng.choices(self.actions, self.weights)[0]
+        trigger = None
+        try:
+            if action == "chip":
+                _, button = self.widgets[f"chip_{self.rng.choice(self.chips)}"]
+                trigger = self._state(button.id)
+                trigger.trigger_value = True
+            elif action == "search":
+                _, box = self.widgets["text_input"]
+                state = self.values[box.id] = self._state(box.id)
+                state.string_value = self._search_term()
+            else:
+                _, radio = self.widgets["units"]
+                # The browser sends the selected option's label, not its index.
+                current = self.values.get(radio.id)
+                label = current.string_value if current is not None else radio.options[radio.default]
+                state = self.values[radio.id] = self._state(radio.id)
+                state.string_value = next(o for o in radio.options if o != label)
+            seconds, received = await self.rerun(trigger)
+            self.samples.append((action, seconds, received))
+        except (KeyError, asyncio.TimeoutError):
+            # No such widget on a broken page, or no answer: start the tab over.
+            self.errors += 1
+            self.values.clear()
+            await self.rerun()
+
+    async def run(self, start: asyncio.Event) -> None:
+        await start.wait()
+        for _ in range(self.args.actions):
+            await self.step()
+            if self.args.think_ms:
+                await asyncio.sleep(self.rng.uniform(0, self.args.think_ms) / 1000)
+
+
+async def _drive(server: Server, args: argparse.Namespace, mix: dict) -> dict:
+    # A throwaway session pays for the server's deferred imports and warm
+    # start outside the measurement.
+    warm = Session(-1, args, mix)
+    await warm.connect(server.url)
+    await warm.close()
+    rss0 = server.rss_bytes()
+    sessions = [Session(i, args, mix) for i in range(args.sessions)]
+    await asyncio.gather(*(s.connect(server.url) for s in sessions))
+    rss_sessions = server.rss_bytes()
+
+    start = asyncio.Event()
+    tasks = [asyncio.create_task(s.run(start)) for s in sessions]
+    cpu0, wall0 = server.cpu_s(), time.perf_counter()
+    start.set()
+    await asyncio.gather(*tasks)
+    wall, cpu = time.perf_counter() - wall0, server.cpu_s() - cpu0
+    rss_end = server.rss_bytes()
+    await asyncio.gather(*(s.close() for s in sessions))
+    return {
+        "sessions": sessions, "wall": wall, "cpu": cpu,
+        "rss0": rss0, "rss_sessions": rss_sessions, "rss_end": rss_end,
+    }
+
+
+def run(args: argparse.Namespace, log_path: Path) -> dict:
+    mix = _parse_mix(args.mix)
+    sys.path.insert(0, str(ROOT))
+    import streamlit
+
+    stub = serve(latency=args.stub_latency_ms / 1000,
+                 tail=args.stub_tail_ms / 1000, tail_rate=args.stub_tail_rate)
+    server = Server(args, stub.url, log_path)
+    try:
+        server.wait_ready()
+        calls0 = Counter(stub.calls)
+        m = asyncio.run(_drive(server, args, mix))
+        # One more monitor sample covers the end of the run.
+        time.sleep(MEMORY_INTERVAL_S + 0.5)
+    finally:
+        server.stop()
+        stub.shutdown()
+    log = _read_log(log_path)
+
+    sessions = m["sessions"]
+    samples = [x for s in sessions for x in s.samples]
+    n_actions, wall, cpu = len(samples), m["wall"], m["cpu"]
+    by_endpoint = dict(Counter(stub.calls) - calls0)
+    upstream = sum(by_endpoint.values())
+    latency = {}
+    for endpoint, vals in sorted(log["upstream"].items()):
+        # A hedge is a second stub call for one logged upstream call.
+        latency[endpoint] = {
+            **_summary(vals), "hedges": max(0, stub.calls[endpoint] - len(vals)),
+        }
+    violations = [k for k in log["problems"] if k.startswith("WARNING Memory bound")]
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "label": args.label,
+            "git_rev": _git_rev(),
+            "python": platform.python_version(),
+            "streamlit": streamlit.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "params": {k: v for k, v in vars(args).items() if k not in ("out", "baseline")},
+        },
+        "results": {
+            "actions": n_actions,
+            "errors": sum(s.errors for s in sessions),
+            "wall_s": round(wall, 3),
+            "throughput_rps": round(n_actions / wall, 2) if wall else 0.0,
+            "rerun_ms": _summary([d for _, d, _ in samples], 1000),
+            "rerun_ms_by_action": {
+                a: _summary([d for name, d, _ in samples if name == a], 1000) for a in mix
+            },
+            "rerun_bytes": _summary([b for _, _, b in samples], digits=0),
+            "cpu_s": round(cpu, 3),
+            "cpu_utilization": round(cpu / wall, 3) if wall else 0.0,
+            "rss_mb_baseline": round(m["rss0"] / 2**20, 1),
+            "rss_mb_end": round(m["rss_end"] / 2**20, 1),
+            "rss_kb_per_session": round((m["rss_sessions"] - m["rss0"]) / 1024 / len(sessions), 1),
+            "upstream_calls": upstream,
+            "upstream_calls_per_action": round(upstream / n_actions, 3) if n_actions else 0.0,
+            "upstream_calls_by_endpoint": by_endpoint,
+            "upstream_latency": latency,
+            "memory": {"last_sample": log["memory"], "violations": violations},
+            "server_log": dict(log["problems"].most_common()),
+        },
+    }
+
+
+def _print(report: dict, baseline: dict = None) -> None:
+    r = report["results"]
+    rows = [
+        ("actions", r["actions"]), ("errors", r["errors"]),
+        ("throughput rps", r["throughput_rps"]),
+        *((f"rerun {k}", r["rerun_ms"][k]) for k in ("p50", "p90", "p95", "p99", "max")),
+        ("server cpu utilization", r["cpu_utilization"]),
+        ("rss kb/session", r["rss_kb_per_session"]),
+        ("upstream calls/action", r["upstream_calls_per_action"]),
+        ("rerun p95 bytes", r.get("rerun_bytes", {}).get("p95", 0)),
+        ("upstream hedges", sum(e["hedges"] for e in r.get("upstream_latency", {}).values())),
+        ("bound violations", len(r.get("memory", {}).get("violations", []))),
+    ]
+    base = (baseline or {}).get("results", {})
+    for name, val in rows:
+        line = f"  {name:<24}{val:>12}"
+        key = name.split(" ", 1)[1] if name.startswith("rerun p") or name == "rerun max" else None
+        prev = base.get("rerun_ms", {}).get(key) if key else None
+        if prev:
+            line += f"   ({(val - prev) / prev * 100:+.1f}% vs baseline)"
+        print(line)
+    if r.get("memory", {}).get("last_sample"):
+        print(f"  server {r['memory']['last_sample']}")
+    for problem, n in r.get("server_log", {}).items():
+        print(f"  log  {n:>5} × {problem}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    ap.add_argument("--sessions", type=int, default=10)
+    ap.add_argument("--actions", type=int, default=20, help="actions per session")
+    ap.add_argument("--mix", default=DEFAULT_MIX, help="weighted action mix")
+    ap.add_argument("--city-pool", type=int, default=200, help="distinct search cities")
+    ap.add_argument("--typo-rate", type=float, default=0.05)
+    ap.add_argument("--think-ms", type=float, default=0.0)
+    ap.add_argument("--stub-latency-ms", type=float, default=150.0)
+    ap.add_argument("--stub-tail-ms", type=float, default=0.0)
+    ap.add_argument("--stub-tail-rate", type=float, default=0.0)
+    ap.add_argument("--timeout", type=float, default=60.0, help="per-rerun timeout (s)")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--payload-strict", action="store_true",
+                    help="count reruns over a payload budget as errors")
+    ap.add_argument("--label", default="", help="free-form tag saved with the run")
+    ap.add_argument("--out", default=str(ROOT / "loadtest_results"))
+    ap.add_argument("--baseline", help="previous result file to compare against")
+    args = ap.parse_args()
+
+    out = Path(args.out)
+    out.mkdir(parents=True, exist_ok=True)
+    log_path = out / "server.log"
+    report = run(args, log_path)
+    stamp = report["meta"]["timestamp"].replace(":", "").replace("-", "")
+    path = out / f"{stamp}_{report['meta']['git_rev']}_{args.sessions}s.json"
+    path.write_text(json.dumps(report, indent=2))
+    log_path.rename(path.with_suffix(".log"))
+    baseline = json.loads(Path(args.baseline).read_text()) if args.baseline else None
+    print(f"{args.sessions} sessions x {args.actions} actions -> {path}")
+    _print(report, baseline)
+
+
+if __name__ == "__main__":
+    main()
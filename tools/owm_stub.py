@@ -0,0 +1,249 @@
+"""
+OWM Stub — local stand-in for the OpenWeatherMap endpoints.
+
+Serves deterministic synthetic payloads shaped like the real API so the app,
+load tests and benchmarks run offline. Point the app at it with
+``STORM_OWM_HOST=http://127.0.0.1:<port>``.
+
+    python -m tools.owm_stub --port 8765 --latency-ms 200
+    python -m tools.owm_stub --latency-ms 150 --tail-ms 3000 --tail-rate 0.02
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+_CONDITIONS = [
+    ("Clear", "clear sky", "01"), ("Clouds", "broken clouds", "04"),
+    ("Rain", "light rain", "10"), ("Drizzle", "drizzle", "09"),
+    ("Thunderstorm", "thunderstorm", "11"), ("Snow", "light snow", "13"),
+    ("Mist", "mist", "50"),
+]
+
+
+def _seed(name: str) -> int:
+    return zlib.crc32(name.strip().lower().encode())
+
+
+def known_city(name: str) -> bool:
+    """Names starting with ``zz`` are treated as misspellings and 404."""
+    return bool(name.strip()) and not name.strip().lower().startswith("zz")
+
+
+def current_payload(name: str, now: int) -> dict:
+    s = _seed(name)
+    cond, desc, icon = _CONDITIONS[s % len(_CONDITIONS)]
+    lat, lon = (s % 1400) / 10 - 70, (s % 3600) / 10 - 180
+    tz = (round(lon / 15)) * 3600
+    temp = (s % 450) / 10 - 5
+    return {
+        "id": s % 10_000_000,
+        "name": name.strip().title(),
+        "coord": {"lat": lat, "lon": lon},
+        "weather": [{"main": cond, "description": desc, "icon": icon + "d"}],
+        "main": {
+            "temp": temp, "feels_like": temp - 1.3,
+            "temp_min": temp - 2.1, "temp_max": temp + 2.4,
+            "pressure": 1000 + s % 30, "humidity": 30 + s % 70,
+        },
+        "visibility": 10000 - (s % 9) * 1000,
+        "wind": {"speed": (s % 200) / 10, "deg": s % 360},
+        "clouds": {"all": s % 101},
+        "dt": now - now % 600,
+        "sys": {"country": "XX", "sunrise": now - now % 86400 + 21600 - tz,
+                "sunset": now - now % 86400 + 64800 - tz},
+        "timezone": tz,
+    }
+
+
+def forecast_payload(name: str, now: int) -> dict:
+    s = _seed(name)
+    base = now - now % 10800
+    items = []
+    for i in range(40):
+        cond, desc, icon = _CONDITIONS[(s + i // 8) % len(_CONDITIONS)]
+        t = (s % 450) / 10 - 5 + (i % 8 - 4) * 0.8
+        items.append({
+            "dt": base + i * 10800,
+            "main": {"temp": t, "feels_like": t - 1, "temp_min": t - 0.5,
+                     "temp_max": t + 0.5, "pressure": 1010, "humidity": 40 + (s + i) % 50},
+            "weather": [{"main": cond, "description": desc, "icon": icon + "d"}],
+            "clouds": {"all": (s + i) % 101},
+            "wind": {"speed": ((s + i) % 150) / 10, "deg": (s + i * 7) % 360},
+            "dt_txt": time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(base + i * 10800)),
+        })
+    cur = current_payload(name, now)
+    return {
+        "cod": "200", "cnt": len(items), "list": items,
+        "city": {"id": cur["id"], "name": cur["name"], "coord": cur["coord"],
+                 "country": "XX", "timezone": cur["timezone"]},
+    }
+
+
+def onecall_payload(name: str, now: int) -> dict:
+    cur = current_payload(name, now)
+    fc = forecast_payload(name, now)["list"]
+    daily = []
+    for i in range(8):
+        chunk = fc[i * 5:(i + 1) * 5] or fc[-5:]
+        temps = [x["main"]["temp"] for x in chunk]
+        daily.append({
+            "dt": now - now % 86400 + 43200 + i * 86400 - cur["timezone"],
+            "sunrise": cur["sys"]["sunrise"] + i * 86400,
+            "sunset": cur["sys"]["sunset"] + i * 86400,
+            "temp": {"min": min(temps), "max": max(temps), "day": temps[0]},
+            "humidity": chunk[0]["main"]["humidity"],
+            "wind_speed": chunk[0]["wind"]["speed"],
+            "weather": chunk[0]["weather"],
+            "uvi": (zlib.crc32(name.encode()) + i) % 11,
+        })
+    return {
+        "lat": cur["coord"]["lat"], "lon": cur["coord"]["lon"],
+        "timezone": "Etc/Stub", "timezone_offset": cur["timezone"],
+        "current": {
+            "dt": cur["dt"], "sunrise": cur["sys"]["sunrise"], "sunset": cur["sys"]["sunset"],
+            "temp": cur["main"]["temp"], "feels_like": cur["main"]["feels_like"],
+            "pressure": cur["main"]["pressure"], "humidity": cur["main"]["humidity"],
+            "clouds": cur["clouds"]["all"], "visibility": cur["visibility"],
+            "wind_speed": cur["wind"]["speed"], "wind_deg": cur["wind"]["deg"],
+            "uvi": daily[0]["uvi"], "weather": cur["weather"],
+        },
+        "daily": daily,
+    }
+
+
+def air_payload(name: str, now: int) -> dict:
+    s = _seed(name)
+    cur = current_payload(name, now)
+    return {
+        "coord": {"lon": cur["coord"]["lon"], "lat": cur["coord"]["lat"]},
+        "list": [{
+            "dt": now,
+            "main": {"aqi": s % 5 + 1},
+            "components": {
+                "co": 200 + s % 300, "no": s % 5, "no2": 5 + s % 40, "o3": 20 + s % 90,
+                "so2": s % 10, "pm2_5": 2 + s % 60, "pm10": 5 + s % 80, "nh3": s % 7,
+            },
+        }],
+    }
+
+
+class StubServer(ThreadingHTTPServer):
+    """Threaded stub that counts calls per endpoint.
+
+    ``tail`` seconds are added to a ``tail_rate`` fraction of requests to
+    model a slow upstream connection.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, addr: tuple, latency: float = 0.0, onecall: bool = True,
+                 tail: float = 0.0, tail_rate: float = 0.0) -> None:
+        super().__init__(addr, _Handler)
+        self.latency = latency
+        self.onecall = onecall
+        self.tail = tail
+        self.tail_rate = tail_rate
+        self.calls: Counter = Counter()
+        self.places: dict = {}    # (lat, lon) -> name, filled by geocoding
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, endpoint: str) -> None:
+        with self._lock:
+            self.calls[endpoint] += 1
+
+    def total_calls(self) -> int:
+        with self._lock:
+            return sum(self.calls.values())
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: StubServer
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        q = {k: v[0] for k, v in parse_qs(url.query).items()}
+        endpoint = url.path.rsplit("/", 1)[-1]
+        self.server.count(endpoint)
+        delay = self.server.latency
+        if self.server.tail_rate and random.random() < self.server.tail_rate:
+            delay += self.server.tail
+        if delay:
+            time.sleep(delay)
+        name = q.get("q", "")
+        if "lat" in q:
+            name = self.server.places.get((float(q["lat"]), float(q["lon"])), "")
+        now = int(time.time())
+        if endpoint == "direct":
+            if not known_city(name):
+                return self._send(200, [])
+            cur = current_payload(name, now)
+            lat, lon = cur["coord"]["lat"], cur["coord"]["lon"]
+            self.server.places[(lat, lon)] = name
+            return self._send(200, [{"name": cur["name"], "lat": lat, "lon": lon,
+                                     "country": cur["sys"]["country"]}])
+        if endpoint == "onecall":
+            if not self.server.onecall:
+                return self._send(401, {"cod": 401, "message": "One Call 3.0 requires a subscription"})
+            body = onecall_payload(name, now) if known_city(name) else None
+        elif endpoint == "weather":
+            body = current_payload(name, now) if known_city(name) else None
+        elif endpoint == "forecast":
+            body = forecast_payload(name, now) if known_city(name) else None
+        elif endpoint == "air_pollution":
+            body = air_payload(name, now) if known_city(name) else None
+        else:
+            return self._send(404, {"cod": 404, "message": "unknown endpoint"})
+        if body is None:
+            return self._send(404, {"cod": "404", "message": "city not found"})
+        self._send(200, body)
+
+    def _send(self, status: int, body) -> None:
+        raw = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def serve(port: int = 0, latency: float = 0.0, onecall: bool = True,
+          tail: float = 0.0, tail_rate: float = 0.0) -> StubServer:
+    """Start the stub on a background thread and return the server."""
+    server = StubServer(("127.0.0.1", port), latency, onecall, tail, tail_rate)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency-ms", type=float, default=0.0)
+    ap.add_argument("--no-onecall", action="store_true", help="answer One Call with 401")
+    ap.add_argument("--tail-ms", type=float, default=0.0, help="extra delay for slow requests")
+    ap.add_argument("--tail-rate", type=float, default=0.0, help="fraction of slow requests")
+    args = ap.parse_args()
+    server = StubServer(("127.0.0.1", args.port), args.latency_ms / 1000, not args.no_onecall,
+                        args.tail_ms / 1000, args.tail_rate)
+    print(f"OWM stub on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()